@@ -1,12 +1,15 @@
+import functools
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, messagebox, filedialog
 import cv2
 import numpy as np
-from PIL import Image, ImageTk
-from base_frame import BaseFrame
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 
 
 class ArithmeticApp(BaseFrame):
+    cache_attrs = ("sub_engine", "sub_res", "current_sub_view", "avg_res", "stack_views", "current_avg_view")
+
     def __init__(self, parent):
         super().__init__(parent)
         content = self.create_header("Arithmetic Operations (PDF Page 7-10)",
@@ -18,27 +21,31 @@ class ArithmeticApp(BaseFrame):
         # --- Variables to store results for switching ---
         self.logic_imgs = {"A": None, "B": None}
 
-        # Subtraction Results Storage (a, b, c, d)
+        # Subtraction Results Storage (a, b, c, d, e = bit planes)
         self.sub_res = {}
+        self.sub_engine = None  # ops.BitPlaneEngine citra yang sedang dibuka
+        self.sub_masks = []
+        self.sub_mask = None  # Mask aktif (untuk menghitung ulang sub_res yang sudah dilepas)
+        self.sub_plane_vars = []
+        self.sub_view = 'd'
+        self.current_sub_view = None
 
         # Averaging Results Storage (a, b, c, d, e, f)
         self.avg_res = {}
         self.avg_src_img = None  # Simpan source asli
+        self.stack_views = {}  # Nama view -> citra hasil averaging stack frame nyata
+        self.current_avg_view = None
 
         # --- TAB 1: LOGIC (Page 7) ---
-        self.tab_logic = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_logic, text="Pg 7: Logic")
-        self.setup_logic_tab()
+        self.tab_logic = self.add_lazy_tab(self.notebook, "Pg 7: Logic", self.setup_logic_tab, padding=10)
 
         # --- TAB 2: SUBTRACTION (Page 8) ---
-        self.tab_sub = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_sub, text="Pg 8: Subtraction")
-        self.setup_subtraction_tab()
+        self.tab_sub = self.add_lazy_tab(self.notebook, "Pg 8: Subtraction", self.setup_subtraction_tab, padding=10)
 
         # --- TAB 3: AVERAGING (Page 9) ---
-        self.tab_avg = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_avg, text="Pg 9: Averaging")
-        self.setup_averaging_tab()
+        self.tab_avg = self.add_lazy_tab(self.notebook, "Pg 9: Averaging", self.setup_averaging_tab, padding=10)
+
+        self.build_selected_tab(self.notebook)
 
     # =========================================================================
     # TAB 1: LOGIC OPERATIONS (Tetap Layout Standar karena butuh 2 Input)
@@ -57,10 +64,14 @@ class ArithmeticApp(BaseFrame):
 
         ttk.Label(ctrl, text="Op:", style="Sub.TLabel").pack(side="left", padx=(15, 5))
         self.logic_op = tk.StringVar(value="AND")
-        ttk.Combobox(ctrl, textvariable=self.logic_op, values=["AND", "OR", "XOR"], width=6, state="readonly").pack(
-            side="left")
+        ttk.Combobox(ctrl, textvariable=self.logic_op, values=list(ops.LOGIC_OPS), width=6,
+                     state="readonly").pack(side="left")
         ttk.Button(ctrl, text="▶ Run", command=self.run_logic, style="Primary.TButton").pack(side="left", padx=10)
 
+        # Statistik luas (popcount) bila kedua input mask biner
+        self.lbl_logic_stats = tk.Label(self.tab_logic, text="", fg="#666", anchor="w")
+        self.lbl_logic_stats.pack(fill="x")
+
         grid = ttk.Frame(self.tab_logic)
         grid.pack(fill="both", expand=True)
         self.lbl_log_a = self.create_img_frame(grid, 0, 0, "Image A")
@@ -72,39 +83,42 @@ class ArithmeticApp(BaseFrame):
         cv2.rectangle(img_a, (50, 50), (250, 250), 255, -1)
         img_b = np.zeros((300, 300), dtype=np.uint8)
         cv2.circle(img_b, (150, 150), 120, 255, -1)
-        self.logic_imgs["A"] = img_a
-        self.logic_imgs["B"] = img_b
-        self.display_image(img_a, self.lbl_log_a)
-        self.display_image(img_b, self.lbl_log_b)
+        # Shape biner disimpan bit-packed; uint8 hanya dibuat saat ditampilkan
+        self.logic_imgs["A"] = ops.BitMask.from_array(img_a)
+        self.logic_imgs["B"] = ops.BitMask.from_array(img_b)
+        self.display_image(self.logic_imgs["A"], self.lbl_log_a)
+        self.display_image(self.logic_imgs["B"], self.lbl_log_b)
         self.run_logic()
 
     def load_logic(self, target):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
-            self.logic_imgs[target] = img
+            # Mask biner (hanya 0/255) disimpan bit-packed, citra biasa tetap uint8
+            mask = ops.as_mask(img)
+            self.logic_imgs[target] = mask if mask is not None else img
             lbl = self.lbl_log_a if target == "A" else self.lbl_log_b
-            self.display_image(img, lbl)
+            self.display_image(self.logic_imgs[target], lbl)
 
     def run_logic(self):
-        if self.logic_imgs["A"] is None or self.logic_imgs["B"] is None: return
-        h, w = self.logic_imgs["A"].shape[:2]
-        img_b = cv2.resize(self.logic_imgs["B"], (w, h))
-        img_a = self.logic_imgs["A"]
-
-        # Color match
-        if len(img_a.shape) == 3 and len(img_b.shape) == 2:
-            img_b = cv2.cvtColor(img_b, cv2.COLOR_GRAY2BGR)
-        elif len(img_a.shape) == 2 and len(img_b.shape) == 3:
-            img_a = cv2.cvtColor(img_a, cv2.COLOR_GRAY2BGR)
-
         op = self.logic_op.get()
-        if op == "AND":
-            res = cv2.bitwise_and(img_a, img_b)
-        elif op == "OR":
-            res = cv2.bitwise_or(img_a, img_b)
-        else:
-            res = cv2.bitwise_xor(img_a, img_b)
+        img_a, img_b = self.logic_imgs["A"], self.logic_imgs["B"]
+        if img_a is None or (img_b is None and op != "NOT"): return
+        res = ops.logic_op(img_a, img_b, op)
         self.display_image(res, self.lbl_log_res)
+        self.show_logic_stats(res)
+
+    def show_logic_stats(self, res):
+        img_a, img_b = self.logic_imgs["A"], self.logic_imgs["B"]
+        if not isinstance(res, ops.BitMask):
+            self.lbl_logic_stats.config(text="")
+            return
+        total = res.shape[0] * res.shape[1]
+        text = f"Result: {res.count():,} px ({res.area_fraction():.1%})"
+        if isinstance(img_a, ops.BitMask) and isinstance(img_b, ops.BitMask) and img_a.shape == img_b.shape:
+            st = ops.mask_stats(img_a, img_b)
+            text = (f"A: {st['A']:,} px  |  B: {st['B']:,} px  |  " + text +
+                    f"  |  IoU {st['IoU']:.3f}, Dice {st['Dice']:.3f}  |  {total:,} px total")
+        self.lbl_logic_stats.config(text=text)
 
     # =========================================================================
     # TAB 2: SUBTRACTION (Single View + 4 Tombol)
@@ -118,6 +132,15 @@ class ArithmeticApp(BaseFrame):
         self.lbl_sub_status = tk.Label(top_bar, text="Silakan load gambar...", fg="#666")
         self.lbl_sub_status.pack(side="left", padx=10)
 
+        # Pilihan mask: preset "n bit teratas" atau centang plane mana saja (index 0 = LSB)
+        self.sub_mask_var = tk.StringVar()
+        self.sub_mask_cb = ttk.Combobox(top_bar, textvariable=self.sub_mask_var, state="disabled", width=22)
+        self.sub_mask_cb.pack(side="right")
+        self.sub_mask_cb.bind("<<ComboboxSelected>>", self.on_sub_mask_preset)
+        ttk.Label(top_bar, text="Mask:", style="Sub.TLabel").pack(side="right", padx=5)
+        self.sub_planes_bar = ttk.Frame(self.tab_sub)
+        self.sub_planes_bar.pack(fill="x")
+
         # 2. Main Single Image Display
         self.sub_display_frame = ttk.Frame(self.tab_sub, style="Card.TFrame")
         self.sub_display_frame.pack(fill="both", expand=True, padx=50, pady=10)
@@ -145,50 +168,90 @@ class ArithmeticApp(BaseFrame):
                                     state="disabled")
         self.btn_sub_d.pack(side="left", expand=True, fill="x", padx=2)
 
+        self.btn_sub_e = ttk.Button(btn_bar, text="(e) Bit Planes", command=lambda: self.show_sub('e'),
+                                    state="disabled")
+        self.btn_sub_e.pack(side="left", expand=True, fill="x", padx=2)
+
         # Save Button di pojok kanan bawah
         ttk.Button(btn_bar, text="💾 Save View", command=lambda: self.save_current_sub_view(),
                    style="Soft.TButton").pack(side="right", padx=10)
 
     def load_sub_src(self):
-        img = self._load_img()
-        if img is not None:
-            if len(img.shape) == 3: img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            self.process_subtraction_all(img)
+        entry = self.ask_image_entry()
+        if entry is None: return
+        try:
+            img = entry.gray_native()  # PNG/TIFF 16-bit tetap 16-bit
+        except IOError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.process_subtraction_all(img)
 
     def process_subtraction_all(self, img_a):
-        # Hitung SEMUA 4 tahap sekaligus dan simpan di memory
-        # (a) Original
-        self.sub_res['a'] = img_a
+        # Engine bit-plane: hasil tiap mask di-cache, jadi pindah mask langsung tampil.
+        # Mask default = 4 bit teratas (0xF0 untuk 8-bit, sesuai PDF)
+        self.sub_engine = ops.BitPlaneEngine(img_a)
+        depth = self.sub_engine.depth
+        self.sub_masks = ops.top_masks(depth)
+        digits = depth // 4
+        self.sub_mask_cb.config(state="readonly", values=[
+            f"0x{m:0{digits}X} ({n} high bits)" for n, m in enumerate(self.sub_masks, 1)])
+
+        # Checkbox plane (MSB di kiri)
+        for child in self.sub_planes_bar.winfo_children():
+            child.destroy()
+        ttk.Label(self.sub_planes_bar, text="Planes:", style="Sub.TLabel").pack(side="left", padx=(0, 5))
+        self.sub_plane_vars = [tk.BooleanVar(value=False) for _ in range(depth)]
+        for b in range(depth - 1, -1, -1):
+            ttk.Checkbutton(self.sub_planes_bar, text=str(b), variable=self.sub_plane_vars[b],
+                            command=self.on_sub_planes_toggle).pack(side="left")
+
+        for btn in [self.btn_sub_a, self.btn_sub_b, self.btn_sub_c, self.btn_sub_d, self.btn_sub_e]:
+            btn.config(state="normal")
 
-        # (b) Masking (Lower 4 bits zeroed)
-        mask = 0xF0
-        img_b = (img_a & mask).astype(np.uint8)
-        self.sub_res['b'] = img_b
+        self.sub_mask_cb.current(3)
+        self.set_sub_mask(self.sub_masks[3])
+        # Default tampilkan hasil akhir (d)
+        self.show_sub('d')
 
-        # (c) Difference
-        diff = cv2.absdiff(img_a, img_b)
-        self.sub_res['c'] = diff
+        # Semua mask preset dihitung sekaligus (broadcast) di background
+        self.lbl_sub_status.config(text=f"{depth}-bit. Menghitung semua mask...")
+        self.jobs.submit("sub_sweep", self.sub_engine.sweep, on_done=lambda _: self.lbl_sub_status.config(
+            text=f"{depth}-bit. Semua mask siap; pilih mask atau centang plane."))
 
-        # (d) Equalized
-        diff_eq = cv2.equalizeHist(diff)
-        self.sub_res['d'] = diff_eq
+    def on_sub_mask_preset(self, event=None):
+        self.set_sub_mask(self.sub_masks[self.sub_mask_cb.current()])
+        self.show_sub(self.sub_view)
 
-        # Aktifkan tombol
-        for btn in [self.btn_sub_a, self.btn_sub_b, self.btn_sub_c, self.btn_sub_d]:
-            btn.config(state="normal")
+    def on_sub_planes_toggle(self):
+        bits = [b for b, var in enumerate(self.sub_plane_vars) if var.get()]
+        mask = ops.planes_mask(bits)
+        self.sub_mask_cb.set(f"0x{mask:0{self.sub_engine.depth // 4}X} (custom)")
+        self.set_sub_mask(mask)
+        self.show_sub(self.sub_view)
 
-        # Default tampilkan hasil akhir (d)
-        self.show_sub('d')
-        self.lbl_sub_status.config(text="Proses Selesai. Gunakan tombol di bawah untuk melihat tahapan.")
+    def set_sub_mask(self, mask):
+        for b, var in enumerate(self.sub_plane_vars):
+            var.set(bool(mask >> b & 1))
+        self.sub_mask = mask
+        self.sub_res = self.sub_engine.get(mask)
 
     def show_sub(self, key):
+        if not self.sub_res and self.sub_engine is not None and self.sub_mask is not None:
+            self.sub_res = self.sub_engine.get(self.sub_mask)  # Dilepas oleh release_memory: hitung ulang
+        if key == 'e' and self.sub_engine is not None:
+            self.sub_res['e'] = self.sub_engine.planes_sheet()  # Di-cache engine
         if key in self.sub_res:
-            self.display_image_large(self.sub_res[key], self.lbl_sub_main)
-            self.current_sub_view = self.sub_res[key]  # untuk save
+            self.sub_view = key
+            img = self.sub_res[key]
+            # Citra 16-bit ditampilkan lewat 8 bit teratasnya; Save tetap menyimpan 16-bit
+            shown = (img >> 8).astype(np.uint8) if img.dtype == np.uint16 else img
+            self.display_image_large(shown, self.lbl_sub_main)
+            self.current_sub_view = img  # untuk save
 
     def save_current_sub_view(self):
-        if hasattr(self, 'current_sub_view') and self.current_sub_view is not None:
-            self.save_image_cv(self.current_sub_view, "subtraction_view")
+        if self.current_sub_view is None and self.sub_engine is not None:
+            self.show_sub(self.sub_view)
+        self.save_image_cv(self.current_sub_view, "subtraction_view")
 
     # =========================================================================
     # TAB 3: AVERAGING (Single View + Tombol)
@@ -204,6 +267,37 @@ class ArithmeticApp(BaseFrame):
         self.lbl_avg_status = tk.Label(top_bar, text="Load gambar lalu klik Run", fg="#666")
         self.lbl_avg_status.pack(side="left")
 
+        # Early stop: berhenti saat PSNR naik < threshold dB per frame tambahan
+        self.avg_gain_var = tk.StringVar(value="0.05")
+        ttk.Entry(top_bar, textvariable=self.avg_gain_var, width=6).pack(side="right")
+        self.avg_early_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_bar, text="Early stop, min dB/frame:", variable=self.avg_early_var).pack(side="right",
+                                                                                                   padx=5)
+
+        # Stack frame nyata (folder / TIFF multi-page / video), dibaca streaming
+        stack_bar = ttk.LabelFrame(self.tab_avg, text="Real Frame Stack", padding=5)
+        stack_bar.pack(fill="x")
+        ttk.Button(stack_bar, text="📁 Folder", command=lambda: self.run_stack_average(folder=True),
+                   style="Soft.TButton").pack(side="left")
+        ttk.Button(stack_bar, text="🎞 Video / TIFF", command=lambda: self.run_stack_average(folder=False),
+                   style="Soft.TButton").pack(side="left", padx=5)
+        ttk.Label(stack_bar, text="K:", style="Sub.TLabel").pack(side="left", padx=(10, 2))
+        self.stack_ks_var = tk.StringVar(value="8,16,64,128")
+        ttk.Entry(stack_bar, textvariable=self.stack_ks_var, width=14).pack(side="left")
+        self.stack_std_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(stack_bar, text="Std map", variable=self.stack_std_var).pack(side="left", padx=5)
+        self.stack_save_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(stack_bar, text="Save PNG", variable=self.stack_save_var).pack(side="left", padx=5)
+        self.stack_view_var = tk.StringVar()
+        self.stack_view_cb = ttk.Combobox(stack_bar, textvariable=self.stack_view_var, state="disabled", width=16)
+        self.stack_view_cb.pack(side="right")
+        self.stack_view_cb.bind("<<ComboboxSelected>>", lambda e: self.show_stack_view())
+        ttk.Label(stack_bar, text="View:", style="Sub.TLabel").pack(side="right", padx=2)
+
+        # Kurva konvergensi PSNR / SSIM vs K
+        self.cv_avg_curve = tk.Canvas(self.tab_avg, bg="white", height=110, bd=1, relief="solid")
+        self.cv_avg_curve.pack(fill="x", pady=(5, 0))
+
         # 2. Main Single Image Display
         self.avg_display_frame = ttk.Frame(self.tab_avg, style="Card.TFrame")
         self.avg_display_frame.pack(fill="both", expand=True, padx=50, pady=10)
@@ -230,10 +324,10 @@ class ArithmeticApp(BaseFrame):
                    style="Soft.TButton").pack(side="right", padx=10)
 
     def load_avg_src(self):
-        img = self._load_img()
+        img = self.ask_image(gray=True)
         if img is not None:
-            if len(img.shape) == 3: img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
             self.avg_src_img = img
+            self.jobs.cancel("averaging")
             self.display_image_large(img, self.lbl_avg_main)
             self.lbl_avg_status.config(text="Gambar siap. Klik 'Run Simulation'.")
 
@@ -242,52 +336,156 @@ class ArithmeticApp(BaseFrame):
             messagebox.showwarning("Warning", "Load Image First")
             return
 
-        self.lbl_avg_status.config(text="Processing simulation... (Might take a sec)")
-        self.update()  # Force UI refresh
+        # Simulasi jalan di background (noise dibagi ke beberapa thread); UI tetap responsif
+        self.lbl_avg_status.config(text="Processing simulation...")
+        simulate = functools.partial(ops.noise_averaging, sigma=64, min_gain=self._min_gain())
+        self.jobs.submit("averaging", simulate, self.avg_src_img, ops.AVERAGING_KS, on_done=self._show_averaging)
 
-        img_clean = self.avg_src_img.astype(np.float32)
-        h, w = img_clean.shape
+    def _min_gain(self):
+        if not self.avg_early_var.get():
+            return None
+        try:
+            return float(self.avg_gain_var.get())
+        except ValueError:
+            return None
 
-        # (a) Original
+    def _show_averaging(self, sim):
+        # (a) Original, (b) Noisy sample, (c)-(f) K=8, 16, 64, 128
         self.avg_res['a'] = self.avg_src_img
+        self.avg_res['b'] = sim["noisy"]
+        best = 'b'
+        for k, key in zip(ops.AVERAGING_KS, ['c', 'd', 'e', 'f']):
+            # K yang tidak tercapai karena early stop tetap nonaktif
+            self.avg_res.pop(key, None)
+            if k in sim:
+                self.avg_res[key] = sim[k]
+                best = key
 
-        # (b) Noisy Sample (Just 1 noise instance)
-        sample_noise = np.random.normal(0, 64, (h, w)).astype(np.float32)
-        noisy_sample = np.clip(img_clean + sample_noise, 0, 255).astype(np.uint8)
-        self.avg_res['b'] = noisy_sample
-
-        # Simulasi Averaging K=8, 16, 64, 128
-        accumulator = np.zeros_like(img_clean)
-        ks = [8, 16, 64, 128]
-        keys = ['c', 'd', 'e', 'f']
-
-        # Kita butuh max K=128
-        for i in range(1, 129):
-            noise = np.random.normal(0, 64, (h, w)).astype(np.float32)
-            accumulator += (img_clean + noise)
-
-            if i in ks:
-                idx = ks.index(i)
-                key = keys[idx]
-                avg_img = np.clip(accumulator / i, 0, 255).astype(np.uint8)
-                self.avg_res[key] = avg_img
-
-        # Aktifkan semua tombol
         for key in self.avg_btns:
-            self.avg_btns[key].config(state="normal")
+            self.avg_btns[key].config(state="normal" if key in self.avg_res else "disabled")
+
+        # Tampilkan hasil terbaik (K terbesar yang tercapai)
+        self.show_avg(best)
+        self.plot_convergence(sim["curve"], sim["stopped_at"])
+        k, p, s = sim["curve"][-1]
+        text = f"K={k}: PSNR {p:.2f} dB, SSIM {s:.3f}."
+        if sim["stopped_at"] is not None:
+            text += " Berhenti otomatis (gain < threshold)."
+        self.lbl_avg_status.config(text=text)
+
+    def plot_convergence(self, curve, stopped_at=None):
+        """PSNR (garis biru, dB) dan SSIM (garis hijau, 0-1) terhadap K."""
+        cv = self.cv_avg_curve
+        cv.delete("all")
+        if not curve:
+            return
+        w, h, pad = cv.winfo_width(), cv.winfo_height(), 18
+        if w < 50: w = 600
+        if h < 50: h = 110
+
+        k_max = curve[-1][0]
+        psnrs = [p for _, p, _ in curve]
+        p_lo, p_hi = min(psnrs), max(psnrs)
+        p_span = (p_hi - p_lo) or 1.0
+
+        def x_of(k):
+            return pad + (w - 2 * pad) * k / k_max
+
+        def y_of(frac):
+            return h - pad - (h - 2 * pad) * frac
+
+        pts = []
+        for k, p, _ in curve:
+            pts.extend([x_of(k), y_of((p - p_lo) / p_span)])
+        if len(pts) >= 4:
+            cv.create_line(pts, fill="#2563EB", width=2)
+        ssim_pts = []
+        for k, _, s in curve:
+            if s is not None:
+                ssim_pts.extend([x_of(k), y_of(s)])
+        if len(ssim_pts) >= 4:
+            cv.create_line(ssim_pts, fill="#16A34A", dash=(3, 2))
+
+        cv.create_text(pad, 4, anchor="nw", fill="#2563EB", font=("Segoe UI", 8),
+                       text=f"PSNR {p_lo:.1f} - {p_hi:.1f} dB")
+        if ssim_pts:
+            cv.create_text(pad + 150, 4, anchor="nw", fill="#16A34A", font=("Segoe UI", 8), text="SSIM")
+        cv.create_text(w - pad, h - 4, anchor="se", fill="#666", font=("Segoe UI", 8), text=f"K = {k_max}")
+        if stopped_at is not None:
+            cv.create_line(x_of(stopped_at), pad, x_of(stopped_at), h - pad, fill="#DC2626", dash=(4, 2))
+
+    def run_stack_average(self, folder):
+        try:
+            ks = [int(k) for k in self.stack_ks_var.get().replace(" ", "").split(",") if k]
+        except ValueError:
+            ks = []
+        if not ks or min(ks) < 1:
+            messagebox.showwarning("Warning", "K harus berupa daftar angka > 0, mis. 8,16,64,128")
+            return
 
-        # Tampilkan hasil terbaik (K=128)
-        self.show_avg('f')
-        self.lbl_avg_status.config(text="Selesai. Klik tombol (a)-(f) untuk membandingkan.")
+        if folder:
+            source = filedialog.askdirectory(title="Folder frame")
+        else:
+            source = filedialog.askopenfilename(filetypes=[("Video / TIFF", "*.mp4;*.avi;*.mov;*.mkv;*.tif;*.tiff"),
+                                                           ("All Files", "*.*")])
+        if not source:
+            return
+        out_dir = None
+        if self.stack_save_var.get():
+            out_dir = filedialog.askdirectory(title="Folder untuk snapshot")
+            if not out_dir:
+                return
+
+        # Frame dibaca streaming di background; memori tetap seukuran satu frame
+        self.lbl_avg_status.config(text="Streaming frames...")
+        self.jobs.submit("stack", self._run_stack, source, ks, self.stack_std_var.get(), out_dir, self._min_gain(),
+                         on_done=self._show_stack, on_error=self._stack_failed)
+
+    @staticmethod
+    def _run_stack(source, ks, variance, out_dir, min_gain):
+        return ops.stack_average(source, ks, gray=True, variance=variance, out_dir=out_dir, min_gain=min_gain)
+
+    def _stack_failed(self, exc):
+        self.lbl_avg_status.config(text="Gagal membaca frame.")
+        messagebox.showerror("Error", str(exc))
+
+    def _show_stack(self, res):
+        self.stack_views = {"First frame": res["first"]}
+        for k in sorted(k for k in res if isinstance(k, int)):
+            self.stack_views[f"Mean K={k}"] = res[k]
+        for k, std in sorted(res.get("std", {}).items()):
+            self.stack_views[f"Std K={k}"] = ops.normalize_u8(std)
+
+        names = list(self.stack_views)
+        self.stack_view_cb.config(values=names, state="readonly")
+        self.stack_view_var.set([n for n in names if n.startswith("Mean")][-1])
+        self.show_stack_view()
+        self.plot_convergence(res["curve"], res["stopped_at"])
+        k, p, _ = res["curve"][-1]
+        text = f"Stack selesai: {res['count']} frame, estimasi PSNR {p:.2f} dB."
+        if res["stopped_at"] is not None:
+            text += " Berhenti otomatis (gain < threshold)."
+        self.lbl_avg_status.config(text=text)
+
+    def show_stack_view(self):
+        img = self.stack_views.get(self.stack_view_var.get())
+        if img is None and not self.stack_views and self.stack_view_var.get():
+            self.lbl_avg_status.config(text=self.RELEASED_TEXT)
+        if img is not None:
+            # Stack 16-bit ditampilkan lewat normalisasi 8-bit; Save tetap menyimpan kedalaman asli
+            shown = img if img.dtype == np.uint8 else ops.normalize_u8(img)
+            self.display_image_large(shown, self.lbl_avg_main)
+            self.current_avg_view = img
 
     def show_avg(self, key):
+        if not self.avg_res and self.avg_src_img is not None:
+            self.lbl_avg_status.config(text=self.RELEASED_TEXT)
         if key in self.avg_res:
             self.display_image_large(self.avg_res[key], self.lbl_avg_main)
             self.current_avg_view = self.avg_res[key]
 
     def save_current_avg_view(self):
-        if hasattr(self, 'current_avg_view') and self.current_avg_view is not None:
-            self.save_image_cv(self.current_avg_view, "averaging_view")
+        self.save_image_cv(self.current_avg_view, "averaging_view")
 
     # =========================================================================
     # HELPERS
@@ -301,31 +499,15 @@ class ArithmeticApp(BaseFrame):
         lbl.pack(fill="both", expand=True)
         return lbl
 
-    def _load_img(self):
-        path = filedialog.askopenfilename(filetypes=[("Image Files", "*.png;*.jpg;*.jpeg;*.bmp;*.tif;*.tiff")])
-        if not path: return None
-        return cv2.imread(path)
-
     # [PERBAIKAN] Menambahkan kembali display_image untuk Tab Logic (gambar kecil)
     def display_image(self, cv_img, label_widget):
         if cv_img is None: return
         try:
-            h, w = cv_img.shape[:2]
-            target_size = 250  # Ukuran untuk grid kecil logic
-            scale = target_size / max(h, w)
-            new_w, new_h = int(w * scale), int(h * scale)
-
-            if len(cv_img.shape) == 2:
-                img_rgb = cv2.cvtColor(cv_img, cv2.COLOR_GRAY2RGB)
-            else:
-                img_rgb = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-
-            pil_img = Image.fromarray(img_rgb)
-            pil_img = pil_img.resize((new_w, new_h), Image.LANCZOS)
-            tk_img = ImageTk.PhotoImage(pil_img)
-
-            label_widget.config(image=tk_img)
-            label_widget.image = tk_img
+            # Ukuran untuk grid kecil logic (sisi terpanjang 250)
+            size = fit_size(cv_img.shape, 250, 250)
+            if isinstance(cv_img, ops.BitMask):
+                cv_img = cv_img.to_u8(size)  # Dibuka ke uint8 langsung di ukuran tampilan
+            ImageSurface.of(label_widget).show(cv_img, size)
         except Exception as e:
             print(f"Error display: {e}")
 
@@ -333,22 +515,7 @@ class ArithmeticApp(BaseFrame):
     def display_image_large(self, cv_img, label_widget):
         if cv_img is None: return
         try:
-            h, w = cv_img.shape[:2]
-            # Tampilan besar (max height 500)
-            target_h = 500
-            scale = target_h / h
-            new_w, new_h = int(w * scale), int(h * scale)
-
-            if len(cv_img.shape) == 2:
-                img_rgb = cv2.cvtColor(cv_img, cv2.COLOR_GRAY2RGB)
-            else:
-                img_rgb = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-
-            pil_img = Image.fromarray(img_rgb)
-            pil_img = pil_img.resize((new_w, new_h), Image.LANCZOS)
-            tk_img = ImageTk.PhotoImage(pil_img)
-
-            label_widget.config(image=tk_img)
-            label_widget.image = tk_img
+            # Tampilan besar (max height 500); PhotoImage label dipakai ulang antar update
+            ImageSurface.of(label_widget).show(cv_img, fit_size(cv_img.shape, max_h=500))
         except Exception as e:
             print(f"Error display: {e}")
\ No newline at end of file
@@ -1,13 +1,130 @@
+import os
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import cv2
+import numpy as np
+from PIL import Image, ImageTk
+from ops.common import display_buffer
+from ops.image_store import image_store
 from styles import COLORS, FONTS
+from jobs import JobRunner
+
+
+def fit_size(shape, max_w=None, max_h=None, enlarge=True):
+    """
+    Ukuran tampilan (w, h) dengan aspect ratio tetap, dibatasi max_w dan/atau max_h.
+    enlarge=False: seperti PIL thumbnail(), citra kecil tidak diperbesar.
+    """
+    h, w = shape[:2]
+    scale = min(max_w / w if max_w else float("inf"), max_h / h if max_h else float("inf"))
+    if not enlarge:
+        scale = min(scale, 1.0)
+    return max(1, int(w * scale)), max(1, int(h * scale))
+
+
+def array_bytes(obj, _seen=None):
+    """
+    Total byte array NumPy milik obj: array langsung, isi dict/list/tuple, dan
+    atribut objek dari paket ops (mis. LazyDftViews). Array read-only dipegang
+    store bersama (image_store, spectrum_store, TransferFunctionCache) dan tidak
+    ikut lepas bersama layar, jadi tidak dihitung. Objek ops yang mencatat
+    ukurannya sendiri (atribut nbytes, mis. TilePyramid, BitPlaneEngine) dihitung
+    dari angka itu.
+    """
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, np.ndarray):
+        base = obj if obj.base is None else obj.base
+        if base is not obj and id(base) in seen:
+            return 0
+        seen.add(id(base))
+        if not isinstance(base, np.ndarray):
+            base = obj
+        return base.nbytes if base.flags.writeable else 0
+    if isinstance(obj, dict):
+        return sum(array_bytes(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(array_bytes(v, seen) for v in obj)
+    if type(obj).__module__.startswith("ops.") and hasattr(obj, "__dict__"):
+        nbytes = vars(obj).get("nbytes")
+        return nbytes if isinstance(nbytes, int) else array_bytes(vars(obj), seen)
+    return 0
+
+
+class ImageSurface:
+    """
+    Permukaan tampilan untuk satu Label: satu PhotoImage yang di-update in-place
+    dengan paste(). PhotoImage baru hanya dibuat bila ukuran/mode tampilan berubah,
+    dan render dilewati bila array + ukuran sama dengan tampilan terakhir
+    (array yang sudah ditampilkan dianggap tidak diubah in-place).
+    """
+
+    def __init__(self, label, interp=None):
+        self.label = label
+        self.interp = interp
+        self.photo = None
+        self._fmt = None  # (size, mode) dari self.photo
+        self._src = None
+        self._key = None
+        self._buffer = None  # PIL image hasil resize terakhir
+
+    @classmethod
+    def of(cls, label, interp=None):
+        """Surface milik label (dibuat sekali, lalu dipakai ulang)."""
+        surface = getattr(label, "surface", None)
+        if surface is None:
+            surface = label.surface = cls(label, interp)
+        return surface
+
+    def show(self, cv_img, size, interp=None, gray=False):
+        """
+        Tampilkan cv_img (gray atau BGR) di ukuran size=(w, h).
+        interp: flag cv2 (None = INTER_AREA saat mengecil); gray=True tampilkan BGR sebagai gray.
+        """
+        if cv_img is None:
+            return
+        interp = self.interp if interp is None else interp
+        key = (size, interp, gray)
+        if cv_img is self._src and key == self._key:
+            return
+
+        # Resize dulu, konversi warna hanya di buffer kecil (ops.display_buffer)
+        self._buffer = Image.fromarray(display_buffer(cv_img, size, interp, gray))
+        self._src, self._key = cv_img, key
+
+        fmt = (self._buffer.size, self._buffer.mode)
+        if self.photo is not None and fmt == self._fmt:
+            self.photo.paste(self._buffer)
+        else:
+            self.photo = ImageTk.PhotoImage(self._buffer)
+            self._fmt = fmt
+            self.label.config(image=self.photo)
+            self.label.image = self.photo
+
+    def clear(self, **label_kw):
+        """Kosongkan label (opsi Label lain, mis. text, boleh ikut diset)."""
+        self.photo = self._fmt = None
+        self._src = self._key = self._buffer = None
+        self.label.config(image="", **label_kw)
+        self.label.image = None
+
 
 class BaseFrame(ttk.Frame):
+    # Atribut yang dilepas release_memory() saat memori semua layar melewati budget:
+    # dict / objek ops dengan clear() dikosongkan, array (sumber atau hasil) diset None.
+    # Handler layar memperlakukan None sebagai "perlu dihitung / di-load ulang".
+    cache_attrs = ()
+    RELEASED_TEXT = "Hasil dilepas untuk menghemat memori; jalankan prosesnya lagi."
+
     def __init__(self, parent):
         super().__init__(parent, style="Main.TFrame")
         self.grid(row=0, column=0, sticky="nsew")
 
+        # Komputasi berat (slider) dijalankan di background, hasil terbaru saja yang dipakai
+        self.jobs = JobRunner(self)
+
         self.columnconfigure(0, weight=1)
         self.rowconfigure(0, weight=1)
 
@@ -42,6 +159,39 @@ class BaseFrame(ttk.Frame):
         self.card.columnconfigure(0, weight=1)
         self.card.rowconfigure(1, weight=1)
 
+    def destroy(self):
+        self.jobs.close()
+        super().destroy()
+
+    # --- Cache frame (MainApp menyembunyikan frame, bukan destroy) ---
+    def on_show(self):
+        """Dipanggil saat frame (yang di-cache) ditampilkan lagi."""
+        self.grid()
+        # bind_all global: arahkan scroll roda mouse ke frame yang sedang tampil
+        self.bind_all("<MouseWheel>", self._on_mousewheel)
+
+    def on_hide(self):
+        self.grid_remove()
+
+    def memory_bytes(self):
+        """Perkiraan memori array (citra, hasil, cache) yang dipegang layar ini."""
+        return array_bytes({k: v for k, v in vars(self).items() if not k.startswith("_")})
+
+    def release_memory(self):
+        """Lepas cache_attrs (lihat di atas), lalu on_release() merapikan tampilan."""
+        for name in self.cache_attrs:
+            value = getattr(self, name, None)
+            if value is None:
+                continue
+            if isinstance(value, np.ndarray) or not hasattr(value, "clear"):
+                setattr(self, name, None)
+            else:
+                value.clear()
+        self.on_release()
+
+    def on_release(self):
+        """Dipanggil setelah release_memory(); override untuk mengosongkan label yang datanya dilepas."""
+
     def _on_frame_configure(self, event=None):
         self.main_scroll_canvas.configure(scrollregion=self.main_scroll_canvas.bbox("all"))
 
@@ -73,6 +223,65 @@ class BaseFrame(ttk.Frame):
         content_frame.grid(row=1, column=0, sticky="nsew", padx=20, pady=(5, 20))
         return content_frame
 
+    # --- Tab notebook lazy ---
+    def add_lazy_tab(self, notebook, text, builder, **frame_kw):
+        """
+        Tambah tab kosong; isi tab dibangun saat tab pertama kali dipilih: builder()
+        (yang mengisi widget tab) baru dipanggil saat itu. Panggil build_selected_tab()
+        setelah semua tab ditambah, agar pembangunan dimulai dari tab yang aktif.
+        """
+        tab = ttk.Frame(notebook, **frame_kw)
+        notebook.add(tab, text=text)
+        if not hasattr(notebook, "lazy_builders"):
+            notebook.lazy_builders = {}
+            notebook.bind("<<NotebookTabChanged>>", lambda e: self.build_selected_tab(notebook), add="+")
+        notebook.lazy_builders[str(tab)] = builder
+        return tab
+
+    def build_selected_tab(self, notebook):
+        builder = notebook.lazy_builders.pop(notebook.select(), None)
+        if builder is not None:
+            builder()
+
+    # --- Load gambar lewat ops.image_store (decode sekali per file untuk semua layar) ---
+    IMAGE_FILETYPES = [("Image Files", "*.png;*.jpg;*.jpeg;*.bmp;*.tif;*.tiff"), ("All Files", "*.*")]
+
+    def ask_image_entry(self):
+        """
+        Pilih gambar. Bila ada gambar yang terakhir dibuka di layar mana pun, user bisa
+        langsung memakainya (tanpa dialog & tanpa decode ulang) atau memilih file lain
+        lewat dialog. Return ImageEntry / None.
+        """
+        current = image_store.current
+        kw = {}
+        if current is not None:
+            choice = messagebox.askyesnocancel(
+                "Buka Gambar", f"Pakai gambar saat ini?\n{os.path.basename(current.path)}\n\n"
+                               "Yes = pakai gambar ini, No = pilih file lain")
+            if choice is None:
+                return None
+            if choice:
+                return current
+            kw = {"initialdir": os.path.dirname(current.path)}
+        path = filedialog.askopenfilename(filetypes=self.IMAGE_FILETYPES, **kw)
+        if not path:
+            return None
+        entry = image_store.load(path)
+        if entry is None:
+            messagebox.showerror("Error", f"Gagal membuka gambar:\n{path}")
+        return entry
+
+    def ask_image(self, gray=False):
+        """Seperti ask_image_entry tapi langsung return array (BGR atau gray, read-only)."""
+        entry = self.ask_image_entry()
+        if entry is None:
+            return None
+        try:
+            return entry.get(gray)
+        except IOError as e:  # Decode penuh ditunda, jadi file rusak baru ketahuan di sini
+            messagebox.showerror("Error", str(e))
+            return None
+
     # --- [BARU] FUNGSI GLOBAL UNTUK SAVE GAMBAR ---
     def save_image_cv(self, img_cv, filename_prefix="result"):
         if img_cv is None:
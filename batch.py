@@ -0,0 +1,200 @@
+"""
+Batch runner: jalankan satu operasi ops ke banyak file sekaligus.
+
+Contoh:
+    python -m batch "scans/*.png" frequency_filter out/ -p shape=Gaussian -p d0=30 -w 8
+    python -m batch "data/**/*.jpg" equalize out/ --force
+"""
+import argparse
+import ast
+import glob
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+import ops
+
+
+def dft_view(img, mode, remove_dc=False):
+    """Satu view DFT saja; view lain (termasuk inverse DFT) tidak dihitung."""
+    spec, fft_shape = ops.half_spectrum(img)
+    return ops.LazyDftViews(spec, fft_shape, img.shape, remove_dc).get(mode)
+
+
+# Nama operasi -> (fungsi(img, **params) -> array, butuh input grayscale?)
+OPERATIONS = {
+    # Frequency domain (frequency_filters.py, dft_explorer.py)
+    "frequency_filter": (ops.frequency_filter, True),
+    "filter_bank": (lambda img, n=2, tile=200: ops.filter_bank_sheet(*ops.filter_bank(img, n=n), tile=tile), True),
+    "dft_magnitude": (lambda img, remove_dc=False: dft_view(img, "Magnitude", remove_dc), True),
+    "dft_phase": (lambda img, remove_dc=False: dft_view(img, "Phase", remove_dc), True),
+
+    # Spatial filters (spatial_segmentation.py)
+    "smooth": (lambda img, size=15: ops.box_smoothing(img, (size,))[size], False),
+    "hubble": (lambda img, thresh=65: ops.hubble_threshold(img, thresh)[1], False),
+    "median": (lambda img, ksize=3: ops.mean_vs_median(img, ksize)[1], False),
+    "sharpen": (lambda img, mode=ops.SHARPEN_MODES[0]: ops.sharpen(img, mode)[0], False),
+    "gradient": (lambda img, view="mag": ops.sobel_gradient(img)[view], False),
+
+    # Resolution & histogram (resolution_histogram.py)
+    "degrade_resolution": (lambda img, res=64: ops.degrade_resolution(img, res), False),
+    "quantize": (lambda img, levels=8: ops.quantize(img, levels), False),
+    "equalize": (ops.equalize, True),
+    "clahe": (ops.clahe, True),
+
+    # Intensity & segmentation (program3_single_pixel.py, image_segmentation.py)
+    "negative": (ops.negative, True),
+    "power_law": (ops.power_law, True),
+    "slicing": (ops.intensity_slicing, True),
+    "point_detection": (lambda img, T=200: ops.point_detection(img, T)[1], False),
+    "line_detection": (lambda img, mask_name="Horizontal", T=100: ops.line_detection(img, mask_name, T)[1], False),
+}
+
+
+def parse_params(pairs):
+    """["d0=30", "shape=Gaussian"] -> {"d0": 30, "shape": "Gaussian"}."""
+    params = {}
+    for pair in pairs:
+        key, sep, raw = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Parameter harus berbentuk key=value: {pair!r}")
+        try:
+            params[key] = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            params[key] = raw
+    return params
+
+
+def input_root(pattern):
+    """Folder terdalam dari pattern yang belum mengandung wildcard, mis. "data/**/*.jpg" -> "data"."""
+    parts = []
+    for part in os.path.normpath(pattern).split(os.sep)[:-1]:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    if parts == [""]:
+        return os.sep
+    return os.sep.join(parts) or "."
+
+
+def params_tag(op_name, params):
+    """Hash pendek operasi + parameter; output dengan parameter lain punya nama lain."""
+    key = repr((op_name, sorted(params.items())))
+    return hashlib.blake2b(key.encode(), digest_size=4).hexdigest()
+
+
+def output_path(src, out_dir, op_name, ext, root=".", tag=""):
+    """Path relatif src terhadap root disusun ulang di bawah out_dir (file senama di folder lain tidak bentrok)."""
+    stem = os.path.splitext(os.path.relpath(src, root))[0]
+    suffix = f"_{tag}" if tag else ""
+    return os.path.join(out_dir, f"{stem}_{op_name}{suffix}{ext}")
+
+
+def is_up_to_date(src, dst):
+    return os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src)
+
+
+def process_file(src, dst, op_name, params):
+    """Worker: baca, proses, tulis. Return jumlah byte input yang diproses."""
+    func, needs_gray = OPERATIONS[op_name]
+    img = cv2.imread(src, cv2.IMREAD_GRAYSCALE if needs_gray else cv2.IMREAD_COLOR)
+    if img is None:
+        raise IOError(f"Gagal membaca {src}")
+    res = func(img, **params)
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    if not cv2.imwrite(dst, res):
+        raise IOError(f"Gagal menulis {dst}")
+    return os.path.getsize(src)
+
+
+def init_worker(fft_backend, fft_workers):
+    """Initializer proses worker: samakan setting FFT dengan proses utama."""
+    if fft_backend:
+        ops.set_backend(fft_backend)
+    ops.set_workers(fft_workers)
+
+
+def run_batch(pattern, op_name, out_dir, params=None, workers=None, force=False, ext=".png",
+              fft_backend=None, fft_workers=1):
+    """
+    Jalankan op_name ke semua file yang cocok dengan pattern. Return dict statistik.
+    fft_workers default 1 karena paralelisme sudah datang dari process pool.
+    """
+    if op_name not in OPERATIONS:
+        raise KeyError(f"Operasi tidak dikenal: {op_name}")
+    params = params or {}
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Nama output memuat hash op + parameter, jadi "up to date" hanya berlaku untuk setting yang sama
+    root, tag = input_root(pattern), params_tag(op_name, params)
+    jobs, skipped = [], 0
+    for src in sorted(glob.glob(pattern, recursive=True)):
+        if not os.path.isfile(src):
+            continue
+        dst = output_path(src, out_dir, op_name, ext, root, tag)
+        if not force and is_up_to_date(src, dst):
+            skipped += 1
+            continue
+        jobs.append((src, dst))
+
+    done, failed, total_bytes = 0, [], 0
+    t0 = time.perf_counter()
+    if jobs:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(fft_backend, fft_workers)) as pool:
+            futures = {pool.submit(process_file, src, dst, op_name, params): src for src, dst in jobs}
+            for fut, src in futures.items():
+                try:
+                    total_bytes += fut.result()
+                    done += 1
+                except Exception as e:
+                    failed.append((src, e))
+    elapsed = time.perf_counter() - t0
+
+    return {
+        "done": done,
+        "skipped": skipped,
+        "failed": failed,
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "images_per_s": done / elapsed if elapsed > 0 else 0.0,
+        "mb_per_s": total_bytes / 1e6 / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m batch",
+                                     description="Jalankan operasi pengolahan citra ke banyak file.")
+    parser.add_argument("input", help='Glob input, mis. "scans/*.png" atau "data/**/*.tif"')
+    parser.add_argument("op", choices=sorted(OPERATIONS), help="Nama operasi")
+    parser.add_argument("out_dir", help="Folder output")
+    parser.add_argument("-p", "--param", action="append", default=[], metavar="KEY=VALUE",
+                        help="Parameter operasi (boleh berulang)")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Jumlah proses worker (default: jumlah CPU)")
+    parser.add_argument("--fft-backend", choices=ops.available_backends(), default=None,
+                        help="Backend FFT (default: scipy bila terpasang, selain itu numpy)")
+    parser.add_argument("--fft-workers", type=int, default=1,
+                        help="Thread FFT per proses worker (default 1)")
+    parser.add_argument("--ext", default=".png", help="Ekstensi file output (default .png)")
+    parser.add_argument("--force", action="store_true", help="Proses ulang walau output sudah up to date")
+    args = parser.parse_args(argv)
+
+    stats = run_batch(args.input, args.op, args.out_dir, parse_params(args.param),
+                      workers=args.workers, force=args.force, ext=args.ext,
+                      fft_backend=args.fft_backend, fft_workers=args.fft_workers)
+
+    for src, err in stats["failed"]:
+        print(f"[GAGAL] {src}: {err}", file=sys.stderr)
+    print(f"Selesai: {stats['done']} diproses, {stats['skipped']} dilewati (up to date), "
+          f"{len(stats['failed'])} gagal dalam {stats['seconds']:.2f} s")
+    print(f"Throughput: {stats['images_per_s']:.2f} images/s, {stats['mb_per_s']:.2f} MB/s")
+    return 1 if stats["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
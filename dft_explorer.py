@@ -1,24 +1,27 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import numpy as np
-from PIL import Image, ImageTk
+from tkinter import ttk, messagebox
 import cv2
-from base_frame import BaseFrame
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 from styles import COLORS
 
-IMG_H, IMG_W = 500, 500
+PREVIEW_SIZE = 512  # Sisi terpanjang preview (input selama decode penuh, dan rotasi saat slider digeser)
 
 
 class DftApp(BaseFrame):
+    cache_attrs = ("preview_cache", "views")
+
     def __init__(self, parent):
         super().__init__(parent)
 
         self.custom_img = None
-        self.last_spectrum_display = None
-        self.last_phase_display = None
-        self.last_spatial_display = None
+        self.views = None  # ops.LazyDftViews: tiap view dihitung saat pertama ditampilkan
         self.current_img_data = None
 
+        # Preview rotasi saat slider di-drag: versi kecil dari hasil eksak terakhir
+        self.exact_angle = 0.0
+        self.preview_cache = {}
+
         content = self.create_header("DFT Spectrum & Reconstruction (Pg 13-14)",
                                      "Analyze Spectrum, Rotation, and Simulate DC Removal (F(0,0)=0).")
 
@@ -56,8 +59,11 @@ class DftApp(BaseFrame):
                                   font=("Segoe UI", 9, "bold"))
         self.angle_lbl.pack(anchor="e")
 
-        ttk.Scale(mid_frame, from_=-90, to=90, variable=self.angle_var,
-                  command=self._update_angle).pack(fill="x", pady=(0, 15))
+        scale_angle = ttk.Scale(mid_frame, from_=-90, to=90, variable=self.angle_var,
+                                command=self._on_angle_drag)
+        scale_angle.pack(fill="x", pady=(0, 15))
+        # Selama drag hanya preview (rotasi spektrum yang sudah ada); FFT eksak saat dilepas
+        scale_angle.bind("<ButtonRelease-1>", lambda e: self.apply_transform())
 
         # 3. Manipulation
         ttk.Label(mid_frame, text="3. Spectrum Manipulation:", style="Sub.TLabel").pack(anchor="w", pady=(0, 5))
@@ -110,15 +116,52 @@ class DftApp(BaseFrame):
     def _update_angle(self, val):
         self.angle_lbl.config(text=f"{float(val):.1f}°")
 
+    def _on_angle_drag(self, val):
+        self._update_angle(val)
+        self.preview_rotation(float(val))
+
+    def preview_rotation(self, angle):
+        """
+        Citra yang dirotasi punya spektrum yang ikut berotasi, jadi selama drag cukup
+        memutar view hasil perhitungan eksak terakhir (versi kecil) sebesar selisih sudut.
+        """
+        if self.custom_img is None or self.views is None:
+            return
+        mode = self.view_type.get()
+        if "input" not in self.preview_cache:
+            self.preview_cache["input"] = ops.proxy_image(self.custom_img, PREVIEW_SIZE)
+        if mode not in self.preview_cache:
+            self.preview_cache[mode] = ops.proxy_image(self._view_target(mode), PREVIEW_SIZE)
+
+        self.show_img(self.left_panel, ops.rotate_image(self.preview_cache["input"], angle))
+        rotated = ops.rotate_image(self.preview_cache[mode], angle - self.exact_angle, border_value=0)
+        self.show_img(self.right_panel, rotated, interp=cv2.INTER_NEAREST)
+        self.lbl_right_title.config(text=f"{self._view_title(mode)} (preview)")
+
     def open_image(self):
-        path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg;*.jpeg;*.png;*.bmp;*.tiff;*.tif")])
-        if not path: return
-        img_bgr = cv2.imread(path)
-        if img_bgr is None: return
-
-        # Resize standard agar kalkulasi FFT tidak terlalu berat
-        img_bgr = cv2.resize(img_bgr, (IMG_W, IMG_H))
-        img_gray = cv2.cvtColor(img_bgr, cv2.COLOR_BGR2GRAY)
+        entry = self.ask_image_entry()
+        if entry is None: return
+
+        # Input langsung tampil dari decode resolusi rendah (JPEG: IMREAD_REDUCED_*);
+        # decode penuh + FFT menunggu di background
+        try:
+            preview = entry.resized(PREVIEW_SIZE, gray=True)
+        except IOError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.show_img(self.left_panel, preview)
+        ImageSurface.of(self.right_panel).clear(text="Loading...", fg="white")
+        self.jobs.submit("source", entry.gray, on_done=self._set_source, on_error=self._source_failed)
+
+    def _source_failed(self, exc):
+        self.jobs.cancel("transform")
+        self.custom_img = self.views = self.current_img_data = None
+        ImageSurface.of(self.left_panel).clear(text="Please load an image", fg="white")
+        ImageSurface.of(self.right_panel).clear(text="No Output", fg="white")
+        messagebox.showerror("Error", f"Gagal membuka gambar:\n{exc}")
+
+    def _set_source(self, img_gray):
+        # Resolusi asli; FFT dipad ke ukuran DFT optimal (lihat ops.pad_to_optimal)
         self.custom_img = img_gray
         self.apply_transform()
 
@@ -129,110 +172,84 @@ class DftApp(BaseFrame):
         self.remove_dc_var.set(False)
         self.view_type.set("Magnitude")
         self.custom_img = None
+        self.jobs.cancel("source")
+        self.jobs.cancel("transform")
 
         # Kosongkan Tampilan
-        self.left_panel.config(image="", text="Please load an image", fg="white")
-        self.right_panel.config(image="", text="No Output", fg="white")
+        ImageSurface.of(self.left_panel).clear(text="Please load an image", fg="white")
+        ImageSurface.of(self.right_panel).clear(text="No Output", fg="white")
 
         # Reset memori gambar
-        self.last_spectrum_display = None
-        self.last_phase_display = None
-        self.last_spatial_display = None
+        self.views = None
         self.current_img_data = None
+        self.exact_angle = 0.0
+        self.preview_cache = {}
 
     def apply_transform(self):
         if self.custom_img is None:
             # Tidak ada gambar yang diproses
-            self.left_panel.config(image="", text="No Image Loaded", fg="white")
-            self.right_panel.config(image="", text="No Output", fg="white")
+            ImageSurface.of(self.left_panel).clear(text="No Image Loaded", fg="white")
+            ImageSurface.of(self.right_panel).clear(text="No Output", fg="white")
             return
 
-        # 1. Get Base Image
-        img_u8 = self.custom_img.copy()
-
-        # 2. APPLY ROTATION
-        angle = self.angle_var.get()
-        if abs(angle) > 0.1:
-            bg_val = int(np.mean(img_u8))
-            border_mode = cv2.BORDER_CONSTANT
-            M = cv2.getRotationMatrix2D((IMG_W // 2, IMG_H // 2), angle, 1.0)
-            img_u8 = cv2.warpAffine(img_u8, M, (IMG_W, IMG_H),
-                                    flags=cv2.INTER_LINEAR,
-                                    borderMode=border_mode,
-                                    borderValue=bg_val)
-
+        # Rotasi + FFT di background; saat Apply/slider ditekan berulang hanya request terakhir yang ditampilkan
+        self.jobs.submit("transform", self._compute_transform, self.custom_img, self.angle_var.get(),
+                         self.remove_dc_var.get(), self.view_type.get(), on_done=self._show_transform)
+
+    @staticmethod
+    def _compute_transform(img, angle, remove_dc, mode):
+        # 1. Rotasi (background = rata-rata intensitas)
+        img_u8 = ops.rotate_image(img, angle)
+
+        # 2. FFT (dari spectrum_store bila sudah pernah dihitung). Hanya view yang sedang dipilih
+        #    yang langsung dihitung; view lain saat dipilih (lihat refresh_display)
+        spec, fft_shape, content_shape = ops.spectrum_store.get(
+            img, prep=ops.rotation_prep(angle), prepare=lambda _: img_u8)
+        views = ops.LazyDftViews(spec, fft_shape, content_shape, remove_dc)
+        views.get(mode)
+        return angle, img_u8, views
+
+    def _show_transform(self, result):
+        angle, img_u8, views = result
         self.current_img_data = img_u8
         self.show_img(self.left_panel, img_u8)
-
-        # 3. FFT
-        f_img = img_u8.astype(np.float32)
-        f = np.fft.fft2(f_img)
-        fshift = np.fft.fftshift(f)
-
-        # 4. Manipulasi F(0,0) -> DC Component
-        if self.remove_dc_var.get():
-            rows, cols = img_u8.shape
-            crow, ccol = rows // 2, cols // 2
-            fshift[crow, ccol] = 0.0 + 0.0j
-
-        # 5. Prepare Magnitude Spectrum (Log Scale)
-        mag = np.abs(fshift)
-        mag_log = np.log(1 + mag)
-        self.last_spectrum_display = cv2.normalize(mag_log, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-
-        # 6. Prepare Phase Spectrum
-        phase = np.angle(fshift)
-        self.last_phase_display = cv2.normalize(phase, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-
-        # 7. Inverse FFT (Spatial Reconstruction)
-        f_ishift = np.fft.ifftshift(fshift)
-        img_back = np.fft.ifft2(f_ishift)
-
-        # Ambil bagian Real
-        img_back_real = np.real(img_back)
-
-        # LOGIKA VISUALISASI "SPATIAL RESULT"
-        if self.remove_dc_var.get():
-            # Teknik visualisasi khusus untuk Remove DC (Negatif kontras tinggi)
-            res = np.abs(img_back_real)
-            res = res * 4.0  # Boost contrast
-            res = np.clip(res, 0, 255).astype(np.uint8)
-            self.last_spatial_display = res
-        else:
-            # Normal reconstruction
-            res = np.clip(img_back_real, 0, 255).astype(np.uint8)
-            self.last_spatial_display = res
+        self.views = views
+        self.exact_angle = angle
+        self.preview_cache = {}
 
         self.refresh_display()
 
     def refresh_display(self):
         # Jika belum ada hasil hitungan, jangan lakukan apa-apa
-        if self.last_spectrum_display is None:
+        if self.views is None:
             return
 
         mode = self.view_type.get()
-        target = None
-        title = ""
+        target = self._view_target(mode)
+        self.lbl_right_title.config(text=self._view_title(mode))
 
+        if target is not None:
+            interp = None if mode == "Spatial" else cv2.INTER_NEAREST
+            self.show_img(self.right_panel, target, interp=interp)
+
+    def _view_target(self, mode):
+        if self.views is None:
+            return None
+        return self.views.get(mode)
+
+    def _view_title(self, mode):
         if mode == "Magnitude":
-            target = self.last_spectrum_display
-            title = "Magnitude Spectrum"
-        elif mode == "Phase":
-            target = self.last_phase_display
-            title = "Phase Spectrum"
-        elif mode == "Spatial":
-            target = self.last_spatial_display
+            return "Magnitude Spectrum"
+        if mode == "Phase":
+            return "Phase Spectrum"
+        if mode == "Spatial":
             title = "Reconstructed Spatial Image"
             if self.remove_dc_var.get():
                 title += " (DC Removed)"
+            return title
+        return ""
 
-        self.lbl_right_title.config(text=title)
-
-        if target is not None:
-            interp = Image.LANCZOS if mode == "Spatial" else Image.NEAREST
-            self.show_img(self.right_panel, target, interp=interp)
-
-    def show_img(self, panel, img_u8, interp=Image.LANCZOS):
+    def show_img(self, panel, img_u8, interp=None):
         # [FIX] Anti-Zoom Out Logic
         total_w = self.winfo_width()
         total_h = self.winfo_height()
@@ -246,28 +263,12 @@ class DftApp(BaseFrame):
         if vw < 100: vw = 300
         if vh < 100: vh = 300
 
-        h, w = img_u8.shape
-        scale = min(vw / w, vh / h) * 0.95
-
-        nw, nh = int(w * scale), int(h * scale)
-        if nw < 1: nw = 1
-        if nh < 1: nh = 1
-
-        pil = Image.fromarray(img_u8).resize((nw, nh), interp)
-        tk_img = ImageTk.PhotoImage(pil)
-
-        panel.config(image=tk_img)
-        panel.image = tk_img
+        # PhotoImage panel di-update in-place; render dilewati bila view & ukuran sama
+        ImageSurface.of(panel).show(img_u8, fit_size(img_u8.shape, vw * 0.95, vh * 0.95), interp)
 
     def save_current_view(self):
         mode = self.view_type.get()
-        target = None
-        if mode == "Magnitude":
-            target = self.last_spectrum_display
-        elif mode == "Phase":
-            target = self.last_phase_display
-        elif mode == "Spatial":
-            target = self.last_spatial_display
+        target = self._view_target(mode)
 
         if target is not None:
             self.save_image_cv(target, f"dft_{mode.lower()}")
\ No newline at end of file
@@ -1,20 +1,30 @@
 import tkinter as tk
-from tkinter import ttk, filedialog
-import cv2
+from tkinter import ttk, messagebox
 import numpy as np
-from PIL import Image, ImageTk
-from base_frame import BaseFrame
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 from styles import COLORS
 
 IMG_SIZE = 500  # Ukuran standar sesuai PDF biasanya
+PROXY_SIZE = 300  # Sisi terpanjang proxy saat slider digeser (= ukuran tampilan)
 
 
 class FrequencyFilterApp(BaseFrame):
+    # Preview (proxy) tetap; citra & spektrum penuh diambil ulang dari source_entry
+    cache_attrs = ("original_img", "spectrum", "processed_img")
+
     def __init__(self, parent):
         super().__init__(parent)
 
         self.original_img = None
         self.processed_img = None
+        self.spectrum = None  # Half-spectrum rfft2 dari original_img, dihitung sekali per gambar
+        self.fft_shape = None  # Ukuran padded (optimal DFT size) dari spectrum
+        self.proxy_img = None  # Salinan kecil original_img untuk preview selama slider digeser
+        self.proxy_spectrum = None
+        self.proxy_fft_shape = None
+        self.processed_is_proxy = False  # processed_img masih hasil proxy (belum full-res)
+        self.source_entry = None  # ops.ImageEntry gambar yang di-load (decode penuh bisa masih berjalan)
 
         # --- Header ---
         content = self.create_header(
@@ -101,11 +111,13 @@ class FrequencyFilterApp(BaseFrame):
 
         scale_d0 = ttk.Scale(ctrl_frame, from_=5, to=230, variable=self.d0_var, command=self.update_d0_label)
         scale_d0.pack(fill="x", pady=(0, 5))
+        # Selama digeser hanya proxy yang difilter; full-res dihitung saat dilepas
+        scale_d0.bind("<ButtonRelease-1>", self.apply_filter)
 
         # Preset Buttons untuk Radius sesuai PDF
         btn_radii = tk.Frame(ctrl_frame, bg=COLORS["bg_main"])
         btn_radii.pack(fill="x", pady=5)
-        for r in [5, 15, 30, 80, 230]:
+        for r in ops.FILTER_BANK_RADII:
             tk.Button(
                 btn_radii,
                 text=str(r),
@@ -117,7 +129,10 @@ class FrequencyFilterApp(BaseFrame):
         # Butterworth Order (n)
         tk.Label(ctrl_frame, text="Butterworth Order (n):", bg=COLORS["bg_main"]).pack(anchor="w", pady=(10, 0))
         self.n_var = tk.IntVar(value=2)
-        ttk.Scale(ctrl_frame, from_=1, to=10, variable=self.n_var, command=lambda v: self.apply_filter()).pack(fill="x")
+        scale_n = ttk.Scale(ctrl_frame, from_=1, to=10, variable=self.n_var,
+                            command=lambda v: self.apply_filter(proxy=True))
+        scale_n.pack(fill="x")
+        scale_n.bind("<ButtonRelease-1>", self.apply_filter)
 
         ttk.Separator(ctrl_frame, orient="horizontal").pack(fill="x", pady=15)
 
@@ -126,6 +141,10 @@ class FrequencyFilterApp(BaseFrame):
             fill="x", pady=5
         )
 
+        # Filter bank: semua shape x mode x radius PDF dalam satu batch
+        ttk.Button(ctrl_frame, text="⊞ Filter Bank (All Radii)", command=self.run_filter_bank,
+                   style="Soft.TButton").pack(fill="x", pady=5)
+
         # Tombol RESET
         ttk.Button(ctrl_frame, text="↺ Reset", command=self.reset_app, style="Danger.TButton").pack(fill="x", pady=5)
 
@@ -159,89 +178,155 @@ class FrequencyFilterApp(BaseFrame):
         Default pattern: HITAM POLOS (tanpa kotak putih / tanpa huruf).
         """
         img = np.zeros((IMG_SIZE, IMG_SIZE), dtype=np.uint8)  # BLACK BG
-        self.original_img = img
-        self.display_image(self.original_img, self.lbl_input)
-        self.apply_filter()
+        self.source_entry = None
+        self.set_source(img)
 
     def load_image(self):
-        path = filedialog.askopenfilename()
-        if not path:
+        entry = self.ask_image_entry()
+        if entry is None:
             return
-        img = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
-        if img is None:
+        # Preview dulu dari decode resolusi rendah (JPEG: IMREAD_REDUCED_*), seukuran
+        # tampilan. Decode penuh + FFT jalan di background lalu menggantikan preview.
+        # Resolusi asli; FFT dipad ke ukuran optimal lalu hasilnya di-crop kembali.
+        # D0 dihitung dalam siklus per citra, jadi preset PDF (5-230) tetap setara.
+        try:
+            proxy = entry.resized(PROXY_SIZE, gray=True)
+        except IOError as e:
+            messagebox.showerror("Error", str(e))
             return
-        self.original_img = cv2.resize(img, (IMG_SIZE, IMG_SIZE))
+        self.source_entry = entry
+        self.original_img = self.spectrum = self.fft_shape = None
+        self._set_proxy(proxy)
+        self.display_image(self.proxy_img, self.lbl_input)
+        self.apply_filter(proxy=True)
+        self.jobs.submit("source", self._decode_source, entry, on_done=self.set_source,
+                         on_error=self._source_failed)
+
+    def _source_failed(self, exc):
+        # Decode penuh gagal: buang preview agar tidak ada hasil setengah jadi yang bisa disimpan
+        self.jobs.cancel("filter")
+        self.source_entry = self.proxy_img = self.processed_img = None
+        ImageSurface.of(self.lbl_input).clear()
+        ImageSurface.of(self.lbl_output).clear()
+        messagebox.showerror("Error", str(exc))
+
+    @staticmethod
+    def _decode_source(entry):
+        img = entry.gray()
+        ops.spectrum_store.get(img)  # FFT sekalian di worker; set_source tinggal ambil dari store
+        return img
+
+    def set_source(self, img):
+        # Forward FFT hanya dihitung di sini (atau diambil dari spectrum_store bila
+        # layar lain sudah menghitungnya); slider/combobox cukup ganti mask H
+        self.jobs.cancel("source")
+        self.original_img = img
+        self.spectrum, self.fft_shape, _ = ops.spectrum_store.get(img)
+        self._set_proxy(ops.proxy_image(img, PROXY_SIZE))
         self.display_image(self.original_img, self.lbl_input)
         self.apply_filter()
 
+    def _set_proxy(self, proxy):
+        self.proxy_img = proxy
+        self.proxy_spectrum, self.proxy_fft_shape, _ = ops.spectrum_store.get(proxy)
+
     def set_radius(self, val):
         self.d0_var.set(val)
-        self.update_d0_label(val)
+        self.lbl_d0.config(text=f"{float(val):.0f}")
+        self.apply_filter()
 
     def update_d0_label(self, val):
         self.lbl_d0.config(text=f"{float(val):.0f}")
-        self.apply_filter()
+        self.apply_filter(proxy=True)
 
-    def apply_filter(self, event=None):
-        if self.original_img is None:
+    def apply_filter(self, event=None, proxy=False):
+        if self.proxy_img is None:
             return
-
-        img = self.original_img.astype(np.float32)
-        rows, cols = img.shape
-
-        # 1. FFT
-        dft = np.fft.fft2(img)
-        dft_shift = np.fft.fftshift(dft)
-
-        # 2. Buat Mask Filter H(u,v)
-        shape = self.filter_shape.get()
-        mode = self.filter_mode.get()
-        D0 = self.d0_var.get()
-        n = self.n_var.get()
-
-        crow, ccol = rows // 2, cols // 2
-
-        u, v = np.meshgrid(np.arange(cols), np.arange(rows))
-        D = np.sqrt((u - ccol) ** 2 + (v - crow) ** 2)
-        D = np.maximum(D, 1e-5)
-
-        if shape == "Ideal":
-            H = np.zeros((rows, cols), dtype=np.float32)
-            if mode == "Lowpass":
-                H[D <= D0] = 1
-            else:
-                H[D > D0] = 1
-
-        elif shape == "Butterworth":
-            H_lp = 1 / (1 + (D / D0) ** (2 * n))
-            H = H_lp if mode == "Lowpass" else (1 - H_lp)
-
-        elif shape == "Gaussian":
-            H_lp = np.exp(-(D ** 2) / (2 * (D0 ** 2)))
-            H = H_lp if mode == "Lowpass" else (1 - H_lp)
-
+        if self.original_img is None:
+            if not proxy and self._reload_source():
+                return  # set_source sudah menjalankan filter full-res
+            proxy = True  # Decode penuh belum selesai: sementara pakai preview
+
+        # proxy=True: filter salinan kecil (biaya tidak tumbuh dengan megapiksel).
+        # D0 dalam siklus per citra, jadi hasil proxy = versi kecil hasil full-res.
+        if proxy:
+            spectrum, fft_shape, content_shape = self.proxy_spectrum, self.proxy_fft_shape, self.proxy_img.shape
         else:
-            H = np.ones((rows, cols), dtype=np.float32)
+            spectrum, fft_shape, content_shape = self.spectrum, self.fft_shape, self.original_img.shape
 
-        # 3. Filtering
-        fshift_filtered = dft_shift * H
+        # Mask + inverse FFT di background (latest wins selama slider D0 digeser)
+        self.jobs.submit("filter", self._compute_filter, spectrum, fft_shape, content_shape,
+                         self.filter_shape.get(), self.filter_mode.get(), self.d0_var.get(),
+                         self.n_var.get(), on_done=lambda res: self._show_filter_result(res, proxy))
 
-        # 4. Inverse FFT
-        f_ishift = np.fft.ifftshift(fshift_filtered)
-        img_back = np.fft.ifft2(f_ishift)
-        img_back = np.abs(img_back)
-
-        res = cv2.normalize(img_back, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    @staticmethod
+    def _compute_filter(spectrum, fft_shape, content_shape, shape, mode, d0, n):
+        H = ops.cached_transfer_function(*fft_shape, shape=shape, mode=mode, d0=d0, n=n,
+                                         half=True, content_shape=content_shape)
+        return ops.filter_spectrum(spectrum, H, fft_shape, crop=content_shape)
 
+    def _show_filter_result(self, res, proxy=False):
         self.processed_img = res
+        self.processed_is_proxy = proxy
         self.display_image(res, self.lbl_output)
 
+    def _reload_source(self):
+        """
+        Citra penuh sudah dilepas (release_memory) atau belum selesai di-decode.
+        Pattern langsung dibuat ulang (return True); file di-decode ulang di worker.
+        """
+        if self.source_entry is None:
+            self.generate_pattern_black()
+            return True
+        if not self.jobs.is_busy("source"):
+            self.jobs.submit("source", self._decode_source, self.source_entry, on_done=self.set_source,
+                             on_error=self._source_failed)
+        return False
+
+    def _ensure_source(self):
+        """Citra & spektrum penuh tersedia (sinkron); False bila decode gagal."""
+        if self.original_img is not None:
+            return True
+        if self.source_entry is None:
+            self.generate_pattern_black()
+            return True
+        try:
+            self.set_source(self.source_entry.gray())
+        except IOError as e:
+            self._source_failed(e)
+            return False
+        return True
+
+    def _full_result(self):
+        """Hasil full-res untuk save/export; dihitung sinkron bila yang tampil masih proxy (atau sudah dilepas)."""
+        if self.proxy_img is None or not self._ensure_source():
+            return None
+        if self.processed_is_proxy or self.processed_img is None:
+            self.jobs.cancel("filter")
+            res = self._compute_filter(self.spectrum, self.fft_shape, self.original_img.shape,
+                                       self.filter_shape.get(), self.filter_mode.get(),
+                                       self.d0_var.get(), self.n_var.get())
+            self._show_filter_result(res)
+        return self.processed_img
+
+    def run_filter_bank(self):
+        # 30 mask (Ideal/Butterworth/Gaussian x LP/HP x 5 radius) dari spektrum yang sama
+        if self.proxy_img is None or not self._ensure_source():
+            return
+        combos = ops.filter_bank_combos()
+
+        def compute(spectrum, fft_shape, content_shape, n):
+            stack = ops.filter_bank_spectrum(spectrum, fft_shape, content_shape, combos, n=n)
+            return ops.filter_bank_sheet(stack, combos)
+
+        # Key sama dengan apply_filter: hasil yang tampil selalu request terakhir
+        self.jobs.submit("filter", compute, self.spectrum, self.fft_shape, self.original_img.shape,
+                         self.n_var.get(), on_done=self._show_filter_result)
+
     def display_image(self, cv_img, label):
-        img_pil = Image.fromarray(cv_img).resize((300, 300), Image.LANCZOS)
-        tk_img = ImageTk.PhotoImage(img_pil)
-        label.config(image=tk_img)
-        label.image = tk_img
+        ImageSurface.of(label).show(cv_img, fit_size(cv_img.shape, 300, 300, enlarge=False))
 
     def save_result(self):
-        if self.processed_img is not None:
-            self.save_image_cv(self.processed_img, "freq_filter_result")
+        res = self._full_result()
+        if res is not None:
+            self.save_image_cv(res, "freq_filter_result")
@@ -1,13 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import cv2
-import numpy as np
-from PIL import Image, ImageTk
-from base_frame import BaseFrame
+from tkinter import ttk, messagebox
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 from styles import COLORS
 
 
 class ImageSegmentationApp(BaseFrame):
+    cache_attrs = ("point_src", "line_src")
+
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -23,14 +23,12 @@ class ImageSegmentationApp(BaseFrame):
         self.line_src = None
 
         # --- TAB 1: POINT DETECTION ---
-        self.tab_point = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_point, text="Point Detection")
-        self.setup_point_tab()
+        self.tab_point = self.add_lazy_tab(self.notebook, "Point Detection", self.setup_point_tab, padding=10)
 
         # --- TAB 2: LINE DETECTION ---
-        self.tab_line = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_line, text="Line Detection")
-        self.setup_line_tab()
+        self.tab_line = self.add_lazy_tab(self.notebook, "Line Detection", self.setup_line_tab, padding=10)
+
+        self.build_selected_tab(self.notebook)
 
     # =========================================================================
     # TAB 1: POINT DETECTION (Porosity Detection)
@@ -80,7 +78,7 @@ class ImageSegmentationApp(BaseFrame):
         return lbl
 
     def load_point_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.point_src = img
             self.display_image(img, self.lbl_point_in)
@@ -93,33 +91,15 @@ class ImageSegmentationApp(BaseFrame):
     def run_point_detection(self):
         if self.point_src is None: return
 
-        # 1. Convert to Gray
-        if len(self.point_src.shape) == 3:
-            gray = cv2.cvtColor(self.point_src, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = self.point_src.copy()
-
-        # 2. Laplacian Filter (Mask sesuai PDF Halaman 17: [-1 -1 -1; -1 8 -1; -1 -1 -1])
-        kernel = np.array([[-1, -1, -1],
-                           [-1, 8, -1],
-                           [-1, -1, -1]], dtype=np.float32)
-
-        laplacian = cv2.filter2D(gray, cv2.CV_64F, kernel)
-
-        # Ambil nilai Absolute agar respon negatif (tepi) menjadi positif
-        laplacian_abs = np.abs(laplacian)
+        # Laplacian [-1 -1 -1; -1 8 -1; -1 -1 -1] -> |respon| -> threshold T
+        # (threshold pada versi ternormalisasi agar slider 0-255 relevan)
+        # Dihitung di background; saat slider digeser cepat hanya nilai terakhir yang dihitung
+        self.jobs.submit("point", ops.point_detection, self.point_src, self.point_thresh_val.get(),
+                         on_done=self._show_point_result)
 
-        # Konversi ke uint8 untuk visualisasi
-        laplacian_vis = cv2.normalize(laplacian_abs, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    def _show_point_result(self, result):
+        laplacian_vis, thresh_res = result
         self.display_image(laplacian_vis, self.lbl_point_lap)
-
-        # 3. Thresholding (Isolasi Titik Terang)
-        T = self.point_thresh_val.get()
-        # Kita threshold pada nilai absolut asli (sebelum normalisasi visual) atau visual?
-        # Biasanya threshold dilakukan pada nilai max respons.
-        # Mari gunakan versi yang sudah dinormalisasi agar slider 0-255 relevan.
-        _, thresh_res = cv2.threshold(laplacian_vis, T, 255, cv2.THRESH_BINARY)
-
         self.display_image(thresh_res, self.lbl_point_out)
 
     # =========================================================================
@@ -181,7 +161,7 @@ class ImageSegmentationApp(BaseFrame):
         self.lbl_matrix_preview.config(text=txt)
 
     def load_line_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.line_src = img
             self.display_image(img, self.lbl_line_in)
@@ -195,64 +175,28 @@ class ImageSegmentationApp(BaseFrame):
         self.update_matrix_preview()
         if self.line_src is None: return
 
-        if len(self.line_src.shape) == 3:
-            gray = cv2.cvtColor(self.line_src, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = self.line_src.copy()
-
-        m_name = self.line_mask_var.get()
-        # Kernel Definition (Sesuai PDF Page 17 Tabel Bawah)
-        if m_name == "Horizontal":
-            k = np.array([[-1, -1, -1],
-                          [2, 2, 2],
-                          [-1, -1, -1]], dtype=np.float32)
-        elif m_name == "+45 Degree":
-            k = np.array([[-1, -1, 2],
-                          [-1, 2, -1],
-                          [2, -1, -1]], dtype=np.float32)
-        elif m_name == "Vertical":
-            k = np.array([[-1, 2, -1],
-                          [-1, 2, -1],
-                          [-1, 2, -1]], dtype=np.float32)
-        else:  # -45 Degree
-            k = np.array([[2, -1, -1],
-                          [-1, 2, -1],
-                          [-1, -1, 2]], dtype=np.float32)
-
-        # Filter
-        resp = cv2.filter2D(gray, cv2.CV_64F, k)
+        self.jobs.submit("line", ops.line_detection, self.line_src, self.line_mask_var.get(),
+                         self.line_thresh_val.get(), on_done=self._show_line_result)
 
-        # Absolute & Normalize
-        resp_abs = np.abs(resp)
-        resp_vis = cv2.normalize(resp_abs, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+    def _show_line_result(self, result):
+        resp_vis, res_bin = result
         self.display_image(resp_vis, self.lbl_line_filt)
-
-        # Threshold
-        T = self.line_thresh_val.get()
-        _, res_bin = cv2.threshold(resp_vis, T, 255, cv2.THRESH_BINARY)
         self.display_image(res_bin, self.lbl_line_out)
 
-    # --- Helpers ---
-    def _load_img(self):
-        path = filedialog.askopenfilename(filetypes=[("Image Files", "*.png;*.jpg;*.jpeg;*.bmp;*.tif;*.tiff")])
-        if not path: return None
-        return cv2.imread(path)
+    def on_release(self):
+        # Sumber dilepas: kosongkan kartu tab yang sudah dibangun, gambar perlu di-load ulang
+        for names in (("lbl_point_in", "lbl_point_lap", "lbl_point_out"),
+                      ("lbl_line_in", "lbl_line_filt", "lbl_line_out")):
+            if not hasattr(self, names[0]):
+                continue
+            ImageSurface.of(getattr(self, names[0])).clear(text=self.RELEASED_TEXT)
+            for name in names[1:]:
+                ImageSurface.of(getattr(self, name)).clear()
 
+    # --- Helpers ---
     def display_image(self, cv_img, label):
         try:
-            h, w = cv_img.shape[:2]
-            scale = 300 / h
-            nw, nh = int(w * scale), int(h * scale)
-
-            if len(cv_img.shape) == 2:
-                img = cv2.cvtColor(cv_img, cv2.COLOR_GRAY2RGB)
-            else:
-                img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-
-            pil = Image.fromarray(img).resize((nw, nh), Image.LANCZOS)
-            tk_img = ImageTk.PhotoImage(pil)
-            label.config(image=tk_img)
-            label.image = tk_img
+            ImageSurface.of(label).show(cv_img, fit_size(cv_img.shape, max_h=300))
         except Exception as e:
             print(e)
 
@@ -1,12 +1,24 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
-from PIL import Image, ImageTk
-import cv2
-from base_frame import BaseFrame
+from tkinter import messagebox, ttk
+import numpy as np
+from base_frame import BaseFrame, ImageSurface
+import ops
 from styles import COLORS
 
+ZOOM_STEP = 1.25
+MAX_ZOOM = 16.0
+OVERVIEW_SIDE = 2048  # Sisi terpanjang overview (level kasar piramida) yang dibaca saat open
+
+
+def _hex_to_bgr(color):
+    color = color.lstrip("#")
+    r, g, b = (int(color[i:i + 2], 16) for i in (0, 2, 4))
+    return b, g, r
+
 
 class ImageViewerApp(BaseFrame):
+    cache_attrs = ("pyramid",)
+
     def __init__(self, parent):
         super().__init__(parent)
 
@@ -23,6 +35,17 @@ class ImageViewerApp(BaseFrame):
                                                                                                       padx=5)
         ttk.Button(toolbar, text="Color Mode", command=self.show_color, style="Soft.TButton").pack(side="left", padx=5)
 
+        # Zoom (roda mouse juga bisa, drag untuk geser)
+        self.lbl_zoom = tk.Label(toolbar, text="", bg="white", fg=COLORS["primary"], font=("Segoe UI", 9, "bold"))
+        self.lbl_zoom.pack(side="right", padx=5)
+        ttk.Button(toolbar, text="Fit", command=self.zoom_fit, style="Soft.TButton").pack(side="right", padx=2)
+        ttk.Button(toolbar, text="1:1", command=lambda: self.set_zoom(1.0), style="Soft.TButton").pack(side="right",
+                                                                                                       padx=2)
+        ttk.Button(toolbar, text="−", width=3, command=lambda: self.zoom_by(1 / ZOOM_STEP),
+                   style="Soft.TButton").pack(side="right", padx=2)
+        ttk.Button(toolbar, text="+", width=3, command=lambda: self.zoom_by(ZOOM_STEP),
+                   style="Soft.TButton").pack(side="right", padx=2)
+
         # Area Canvas (Dengan Border Hijau Tipis)
         canvas_frame = tk.Frame(content, bg=COLORS["bg_main"], bd=2, relief="flat")
         canvas_frame.pack(fill="both", expand=True)
@@ -31,36 +54,79 @@ class ImageViewerApp(BaseFrame):
                                fg="#6B7280", font=("Segoe UI", 12))
         self.canvas.pack(fill="both", expand=True, padx=2, pady=2)
 
-        self.img_rgb = None
-        self.img_gray = None
-        self.tk_img = None
+        self.canvas.bind("<ButtonPress-1>", self._on_drag_start)
+        self.canvas.bind("<B1-Motion>", self._on_drag)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", self._on_wheel)  # Linux
+        self.canvas.bind("<Button-5>", self._on_wheel)
 
-    def open_image(self):
-        path = filedialog.askopenfilename(filetypes=[("Image files", "*.jpg;*.jpeg;*.png;*.bmp;*.tiff;*.tif")])
-        if not path: return
+        # Citra asli hanya dipegang sekali (BGR) di dalam piramida tile;
+        # konversi RGB/gray hanya dilakukan di buffer viewport
+        self.pyramid = None
+        self.is_gray = False
+        self.zoom = 1.0  # Piksel layar per piksel citra
+        self.center = (0.0, 0.0)  # Pusat viewport dalam koordinat citra
+        self._drag_from = None
 
-        img = cv2.imread(path)
-        if img is None:
-            messagebox.showerror("Error", "Failed to open image.")
-            return
-
-        self.img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        self.img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        self.show_on_canvas(self.img_rgb)
+    def open_image(self):
+        entry = self.ask_image_entry()
+        if entry is None: return
+
+        # Overview (reduced decode / memmap) dibaca di worker; resolusi penuh baru
+        # di-decode saat zoom butuh detail di bawah overview
+        self.jobs.cancel("detail")
+        self.canvas.config(text="Loading...")
+        self.jobs.submit("open", self._build_pyramid, entry, on_done=self._set_pyramid,
+                         on_error=self._open_failed)
+
+    @staticmethod
+    def _build_pyramid(entry):
+        mapped = None if entry.decoded else ops.map_raw(entry.path)
+        if mapped is not None:
+            # File tanpa kompresi: level 0 dibaca langsung dari disk per tile
+            img, rgb = mapped
+            h, w = img.shape[:2]
+            scale = min(1.0, OVERVIEW_SIDE / max(h, w))
+            overview = ops.area_resize(img, (max(1, round(w * scale)), max(1, round(h * scale))))
+            if rgb and overview.ndim == 3:
+                overview = np.ascontiguousarray(overview[..., ::-1])
+            return ops.TilePyramid(img, overview=overview, rgb=rgb)
+        w, h = entry.size
+        return ops.TilePyramid(lambda: entry.original, shape=(h, w), overview=entry.resized(OVERVIEW_SIDE))
+
+    def _set_pyramid(self, pyramid):
+        self.pyramid = pyramid
+        self.is_gray = False
+        self.canvas.config(text="")
+        self.zoom_fit()
+
+    def _open_failed(self, exc):
+        if self.pyramid is None:
+            self.canvas.config(text="No image selected")
+        messagebox.showerror("Error", f"Gagal membuka gambar:\n{exc}")
+
+    def _detail_failed(self, exc):
+        # Mis. citra melebihi batas piksel cv2: tetap bisa dilihat sampai resolusi overview
+        if self.pyramid is None: return
+        self.pyramid.limit_to_overview()
+        messagebox.showwarning("Info", f"Resolusi penuh tidak bisa dibaca, zoom dibatasi ke overview.\n{exc}")
+        self.show_on_canvas()
 
     def show_gray(self):
-        if self.img_gray is None:
+        if self.pyramid is None:
             messagebox.showwarning("Info", "Please open an image first.")
             return
-        self.show_on_canvas(self.img_gray, is_gray=True)
+        self.is_gray = True
+        self.show_on_canvas()
 
     def show_color(self):
-        if self.img_rgb is None:
+        if self.pyramid is None:
             messagebox.showwarning("Info", "Please open an image first.")
             return
-        self.show_on_canvas(self.img_rgb)
+        self.is_gray = False
+        self.show_on_canvas()
 
-    def show_on_canvas(self, img, is_gray=False):
+    def _viewport_size(self):
         # [FIX PERMANEN]
         # Jangan ambil ukuran dari self.canvas atau self.canvas.master karena mereka bisa mengecil (shrink).
         # Ambil ukuran dari 'self' (ImageViewerApp) yaitu frame utama panel kanan yang ukurannya stabil.
@@ -81,15 +147,74 @@ class ImageViewerApp(BaseFrame):
         # Pastikan tidak minus
         if vw < 100: vw = 400
         if vh < 100: vh = 400
-
-        h, w = img.shape[:2]
-
-        # Hitung skala agar muat di area viewport yang sudah kita hitung statis tadi
-        scale = min(vw / w, vh / h)
-
-        # Resize
-        new_w, new_h = int(w * scale), int(h * scale)
-        pil_img = Image.fromarray(img).resize((new_w, new_h), Image.LANCZOS)
-
-        self.tk_img = ImageTk.PhotoImage(pil_img)
-        self.canvas.config(image=self.tk_img, text="")
\ No newline at end of file
+        return vw, vh
+
+    # --- Zoom & Pan ---
+    def _fit_zoom(self):
+        vw, vh = self._viewport_size()
+        h, w = self.pyramid.shapes[0]
+        return min(vw / w, vh / h)
+
+    def zoom_fit(self):
+        if self.pyramid is None: return
+        h, w = self.pyramid.shapes[0]
+        self.center = (w / 2, h / 2)
+        self.set_zoom(self._fit_zoom())
+
+    def set_zoom(self, zoom, anchor=None):
+        """Ganti zoom; anchor=(x, y) di layar tetap menunjuk titik citra yang sama."""
+        if self.pyramid is None: return
+        zoom = min(max(zoom, min(self._fit_zoom(), 1.0) / 4), MAX_ZOOM)
+        if anchor is not None:
+            vw, vh = self._viewport_size()
+            ax, ay = anchor[0] - vw / 2, anchor[1] - vh / 2
+            cx, cy = self.center
+            k = 1 / self.zoom - 1 / zoom
+            self.center = (cx + ax * k, cy + ay * k)
+        self.zoom = zoom
+        self.show_on_canvas()
+
+    def zoom_by(self, factor, anchor=None):
+        self.set_zoom(self.zoom * factor, anchor)
+
+    def _on_wheel(self, event):
+        if self.pyramid is None: return
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self.zoom_by(ZOOM_STEP if up else 1 / ZOOM_STEP, anchor=self._event_pos(event))
+        return "break"  # Jangan ikut men-scroll halaman
+
+    def _event_pos(self, event):
+        # Posisi mouse relatif terhadap viewport (gambar di tengah label)
+        vw, vh = self._viewport_size()
+        return (event.x - (self.canvas.winfo_width() - vw) / 2,
+                event.y - (self.canvas.winfo_height() - vh) / 2)
+
+    def _on_drag_start(self, event):
+        self._drag_from = (event.x, event.y)
+
+    def _on_drag(self, event):
+        if self.pyramid is None or self._drag_from is None: return
+        dx, dy = event.x - self._drag_from[0], event.y - self._drag_from[1]
+        self._drag_from = (event.x, event.y)
+        cx, cy = self.center
+        self.center = (cx - dx / self.zoom, cy - dy / self.zoom)
+        self.show_on_canvas()
+
+    def show_on_canvas(self):
+        # Hanya tile yang terlihat, dari level piramida terdekat dengan zoom, yang dirender.
+        # Thread UI hanya memakai level overview ke atas; tile detail dibangun di worker.
+        size = self._viewport_size()
+        bg = _hex_to_bgr(COLORS["bg_main"])
+        pyramid = self.pyramid
+        view = pyramid.render(self.center, self.zoom, size, bg=bg, min_level=pyramid.overview_level)
+        self._show_view(view, size)
+        if pyramid.needs_detail(self.zoom):
+            self.jobs.submit("detail", pyramid.render, self.center, self.zoom, size, bg,
+                             on_done=lambda v: self._show_view(v, size) if pyramid is self.pyramid else None,
+                             on_error=self._detail_failed)
+        else:
+            self.jobs.cancel("detail")
+        self.lbl_zoom.config(text=f"{self.zoom * 100:.0f}%")
+
+    def _show_view(self, view, size):
+        ImageSurface.of(self.canvas).show(view, size, gray=self.is_gray)
@@ -0,0 +1,124 @@
+"""
+Eksekusi komputasi di background untuk layar yang digerakkan slider.
+
+Semua frame berbagi satu ThreadPoolExecutor (NumPy/OpenCV melepas GIL saat
+menghitung, jadi thread sudah cukup paralel). Tiap frame punya JobRunner:
+per `key` hanya satu job yang berjalan; request baru saat job masih jalan
+menggantikan request yang menunggu (latest wins), jadi nilai slider yang
+sudah usang tidak pernah dihitung. Hasil dikirim balik ke thread Tk lewat
+antrian yang di-poll dengan after(), karena Tk tidak thread-safe.
+"""
+import os
+import queue
+import traceback
+import tkinter as tk
+from tkinter import messagebox
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = ThreadPoolExecutor(max_workers=max(2, os.cpu_count() or 1), thread_name_prefix="img-job")
+
+POLL_MS = 15
+
+
+class JobRunner:
+    def __init__(self, widget):
+        self.widget = widget
+        self._results = queue.Queue()
+        self._running = {}   # key -> generation yang sedang dihitung
+        self._pending = {}   # key -> (generation, func, args, on_done, on_error) terbaru yang menunggu
+        self._generation = {}
+        self._polling = False
+        self._closed = False
+
+    def submit(self, key, func, *args, on_done=None, on_error=None):
+        """
+        Jalankan func(*args) di worker. on_done(result) dipanggil di thread Tk,
+        hanya bila job ini masih request terbaru untuk key tersebut. Bila func
+        gagal (atau on_done sendiri melempar exception), on_error(exc) yang
+        dipanggil (default: dialog error).
+        """
+        if self._closed:
+            return
+        gen = self._generation.get(key, 0) + 1
+        self._generation[key] = gen
+        if key in self._running:
+            # Job lama masih jalan: simpan hanya request terbaru
+            self._pending[key] = (gen, func, args, on_done, on_error)
+        else:
+            self._start(key, gen, func, args, on_done, on_error)
+        self._ensure_polling()
+
+    def is_busy(self, key=None):
+        if key is None:
+            return bool(self._running)
+        return key in self._running
+
+    def cancel(self, key=None):
+        """Abaikan hasil job yang sedang jalan dan buang request yang menunggu."""
+        keys = list(self._generation) if key is None else [key]
+        for k in keys:
+            self._generation[k] = self._generation.get(k, 0) + 1
+            self._pending.pop(k, None)
+
+    def close(self):
+        self.cancel()
+        self._closed = True
+
+    def _start(self, key, gen, func, args, on_done, on_error):
+        self._running[key] = gen
+        fut = _executor.submit(func, *args)
+        fut.add_done_callback(lambda f: self._results.put((key, gen, f, on_done, on_error)))
+
+    @staticmethod
+    def _default_error(key, exc):
+        messagebox.showerror("Error", f"Proses '{key}' gagal:\n{exc}")
+
+    def _report(self, key, exc, on_error):
+        """on_error(exc) bila ada; bila tidak ada atau ikut gagal, dialog error default."""
+        if on_error is not None:
+            try:
+                on_error(exc)
+                return
+            except Exception:
+                traceback.print_exc()
+        try:
+            self._default_error(key, exc)
+        except tk.TclError:
+            traceback.print_exc()  # Widget/root sudah di-destroy
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.widget.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        try:
+            while True:
+                key, gen, fut, on_done, on_error = self._results.get_nowait()
+                self._running.pop(key, None)
+
+                if gen == self._generation.get(key) and not self._closed:
+                    exc = fut.exception()
+                    if exc is None and on_done is not None:
+                        try:
+                            on_done(fut.result())
+                        except Exception as e:
+                            # Callback (di thread Tk) gagal: laporkan seperti job yang gagal
+                            traceback.print_exc()
+                            exc = e
+                    if exc is not None:
+                        self._report(key, exc, on_error)
+
+                nxt = self._pending.pop(key, None)
+                if nxt is not None and not self._closed:
+                    self._start(key, *nxt)
+        except queue.Empty:
+            pass
+
+        if self._running and not self._closed:
+            try:
+                self.widget.after(POLL_MS, self._poll)
+                return
+            except tk.TclError:
+                pass  # Widget sudah di-destroy
+        self._polling = False
@@ -1,24 +1,26 @@
+import time
+
+_T_START = time.perf_counter()  # Awal cold start (sebelum import Tk)
+
+import importlib
+import sys
 import tkinter as tk
+from collections import OrderedDict
 from tkinter import ttk, messagebox
 from styles import apply_theme, COLORS, FONTS
 
-# Import semua modul
-from image_view import ImageViewerApp
-from mach_and_band_effect import MachBandApp
-# from resolution_histogram import ResHistApp
-from resolution_histogram import ResolutionApp, HistogramApp  # Ganti import lama (ResHistApp)
-from program3_single_pixel import SinglePixelApp
-from arithmetic_operations import ArithmeticApp
-from spatial_segmentation import SpatialSegmentationApp
-from dft_explorer import DftApp
-from frequency_filters import FrequencyFilterApp
-# [BARU] Import modul Segmentation
-from image_segmentation import ImageSegmentationApp
+# Modul layar (beserta cv2/NumPy/PIL) baru di-import saat menunya pertama kali diklik
+
+
+# Total memori array milik semua layar yang di-cache; bila lewat, cache hasil & preview
+# layar yang paling lama tidak dibuka dilepas (release_memory, dihitung ulang saat dibutuhkan)
+FRAME_MEMORY_BUDGET = 1024 * 1024 * 1024
 
 
 class MainApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, memory_budget=FRAME_MEMORY_BUDGET):
         super().__init__()
+        self.memory_budget = memory_budget
 
         self.title("TUGAS PENGOLAHAN CITRA DIGITAL - UTS")
         self.geometry("1300x850")
@@ -50,29 +52,26 @@ class MainApp(tk.Tk):
         self.menu_container = tk.Frame(self.sidebar, bg=COLORS["sidebar_bg"])
         self.menu_container.pack(fill="both", expand=True, padx=0)
 
-        # [UPDATE] Daftar Menu
-        # Import class baru (pastikan import ini ada di atas file main.py)
-        # from resolution_histogram import ResolutionApp, HistogramApp
-
         # [REVISI URUTAN MENU SESUAI PDF]
+        # (kode, nama menu, modul, class) - modul di-import lazy oleh load_frame_class
         self.menus = [
-            ("01", "Image Viewer", ImageViewerApp),
-            ("02", "Visual Perception (Pg 1)", MachBandApp),
-            ("03", "Spatial Res & Quant (Pg 1-2)", ResolutionApp),  # Class baru 1
-            ("04", "Intensity Trans. (Pg 3-4)", SinglePixelApp),  # Sesuai PDF halaman 3-4
-            ("05", "Histogram Proc. (Pg 5-7)", HistogramApp),  # Class baru 2
-            ("06", "Arithmetic/Logic (Pg 7-10)", ArithmeticApp),
-            ("07", "Spatial Filters (Pg 10-12)", SpatialSegmentationApp),
-            ("08", "DFT Spectrum (Pg 13)", DftApp),
-            ("09", "Freq Filtering (Pg 14-16)", FrequencyFilterApp),
-            ("10", "Image Segmentation (Pg 17)", ImageSegmentationApp)
+            ("01", "Image Viewer", "image_view", "ImageViewerApp"),
+            ("02", "Visual Perception (Pg 1)", "mach_and_band_effect", "MachBandApp"),
+            ("03", "Spatial Res & Quant (Pg 1-2)", "resolution_histogram", "ResolutionApp"),
+            ("04", "Intensity Trans. (Pg 3-4)", "program3_single_pixel", "SinglePixelApp"),  # Sesuai PDF halaman 3-4
+            ("05", "Histogram Proc. (Pg 5-7)", "resolution_histogram", "HistogramApp"),
+            ("06", "Arithmetic/Logic (Pg 7-10)", "arithmetic_operations", "ArithmeticApp"),
+            ("07", "Spatial Filters (Pg 10-12)", "spatial_segmentation", "SpatialSegmentationApp"),
+            ("08", "DFT Spectrum (Pg 13)", "dft_explorer", "DftApp"),
+            ("09", "Freq Filtering (Pg 14-16)", "frequency_filters", "FrequencyFilterApp"),
+            ("10", "Image Segmentation (Pg 17)", "image_segmentation", "ImageSegmentationApp")
         ]
         self.btn_refs = []
         self.menu_map = {}
 
-        for code, name, frame_class in self.menus:
-            btn = self.create_menu_btn(code, name, frame_class)
-            self.menu_map[frame_class] = btn
+        for code, name, module, class_name in self.menus:
+            btn = self.create_menu_btn(code, name, (module, class_name))
+            self.menu_map[class_name] = btn
 
         # Footer Identitas
         footer = tk.Frame(self.sidebar, bg="#2C3E32", height=120)
@@ -94,11 +93,28 @@ class MainApp(tk.Tk):
         self.content_area.grid_rowconfigure(0, weight=1)
 
         self.current_frame = None
+        self.frames = OrderedDict()  # (modul, class) -> instance, urutan LRU (terakhir = terbaru)
 
+        # Waktu cold start: jendela + sidebar siap, lalu layar pertama (dibangun setelah
+        # jendela tampil, jadi import modulnya tidak menunda frame pertama)
+        self.startup_times = {"ui_ready": time.perf_counter() - _T_START}
         if self.btn_refs:
-            self.switch_frame(ImageViewerApp, self.btn_refs[0])
-
-    def create_menu_btn(self, code, name, frame_class):
+            self.after_idle(self._open_first_screen)
+
+    def _open_first_screen(self):
+        self.switch_frame(self.menus[0][2:], self.btn_refs[0])
+        self.update_idletasks()
+        self.startup_times["first_screen"] = time.perf_counter() - _T_START
+        print(f"Cold start: UI siap {self.startup_times['ui_ready'] * 1000:.0f} ms, "
+              f"layar pertama ({self.menus[0][1]}) {self.startup_times['first_screen'] * 1000:.0f} ms")
+
+    @staticmethod
+    def load_frame_class(frame_spec):
+        """(modul, class) -> class layar; modul di-import saat pertama dibutuhkan."""
+        module, class_name = frame_spec
+        return getattr(importlib.import_module(module), class_name)
+
+    def create_menu_btn(self, code, name, frame_spec):
         btn_frame = tk.Frame(self.menu_container, bg=COLORS["sidebar_bg"], cursor="hand2", height=55)
         btn_frame.pack(fill="x", pady=1)
         btn_frame.pack_propagate(False)
@@ -118,7 +134,7 @@ class MainApp(tk.Tk):
         lbl_name.pack(side="top", fill="x")
 
         for w in (btn_frame, indicator, text_frame, lbl_name, lbl_code):
-            w.bind("<Button-1>", lambda e: self.switch_frame(frame_class, btn_frame))
+            w.bind("<Button-1>", lambda e: self.switch_frame(frame_spec, btn_frame))
 
         btn_frame.indicator = indicator
         btn_frame.lbl_name = lbl_name
@@ -128,9 +144,10 @@ class MainApp(tk.Tk):
         self.btn_refs.append(btn_frame)
         return btn_frame
 
-    def switch_frame(self, frame_class, active_btn):
+    def switch_frame(self, frame_spec, active_btn):
         if self.current_frame:
-            self.current_frame.destroy()
+            # Disembunyikan, bukan destroy: citra & hasil tetap ada saat kembali
+            self.current_frame.on_hide()
 
         for btn in self.btn_refs:
             is_active = (btn == active_btn)
@@ -146,9 +163,33 @@ class MainApp(tk.Tk):
             btn.lbl_name.config(bg=bg, fg=fg_name, font=("Segoe UI", 10, font_weight))
             btn.lbl_code.config(bg=bg, fg=fg_code)
 
-        self.current_frame = frame_class(self.content_area)
+        frame = self.frames.get(frame_spec)
+        if frame is None:
+            frame = self.load_frame_class(frame_spec)(self.content_area)
+        else:
+            frame.on_show()
+        self.frames[frame_spec] = frame
+        self.frames.move_to_end(frame_spec)
+        self.current_frame = frame
+        self.enforce_memory_budget()
+
+    def enforce_memory_budget(self):
+        """Lepas cache layar LRU (selain yang sedang tampil) sampai total memori <= budget."""
+        usage = {spec: f.memory_bytes() for spec, f in self.frames.items()}
+        total = sum(usage.values())
+        for spec in list(self.frames):
+            if total <= self.memory_budget:
+                break
+            if self.frames[spec] is self.current_frame:
+                continue
+            frame = self.frames[spec]
+            frame.release_memory()
+            total -= usage[spec] - frame.memory_bytes()
 
 
 if __name__ == "__main__":
     app = MainApp()
+    if "--measure-startup" in sys.argv:
+        # Hanya ukur cold start lalu keluar (untuk tracking waktu startup)
+        app.after_idle(lambda: app.after_idle(app.destroy))
     app.mainloop()
\ No newline at end of file
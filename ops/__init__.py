@@ -0,0 +1,32 @@
+"""
+Engine pengolahan citra tanpa Tkinter.
+
+Semua fungsi menerima array NumPy + parameter biasa dan mengembalikan array,
+sehingga bisa dipakai dari GUI, batch, maupun server tanpa display.
+"""
+from ops.common import to_gray, normalize_u8, proxy_image, display_buffer, contact_sheet
+from ops.fft import (FFTBackend, NumpyFFTBackend, ScipyFFTBackend, available_backends, get_backend,
+                     set_backend, set_workers, benchmark_backends, rfft2, irfft2, optimal_shape,
+                     pad_to_optimal, half_width, centered_freqs, expand_half)
+from ops.frequency import (FILTER_SHAPES, FILTER_MODES, FILTER_BANK_RADII, real_spectrum, distance_grid,
+                           transfer_function, TransferFunctionCache, transfer_cache,
+                           cached_transfer_function, filter_spectrum, frequency_filter,
+                           filter_bank_combos, filter_bank_spectrum, filter_bank, filter_bank_sheet)
+from ops.dft import (rotation_prep, rotate_image, remove_dc_component, half_spectrum, magnitude_view,
+                     phase_view, spatial_view, dft_views_from_spectrum, LazyDftViews, dft_views)
+from ops.arithmetic import LOGIC_OPS, AVERAGING_KS, logic_op, mask_subtraction, noise_averaging
+from ops.spatial import (SMOOTHING_SIZES, SHARPEN_MODES, box_smoothing, hubble_threshold,
+                         add_salt_pepper, mean_vs_median, sharpen, sobel_gradient)
+from ops.histogram import (COMPARISON_RESOLUTIONS, degrade_resolution, quantize,
+                           resolution_comparison, equalize, clahe, match_histogram)
+from ops.intensity import negative, power_law_lut, power_law, intensity_slicing
+from ops.segmentation import (POINT_KERNEL, LINE_KERNELS, mask_response, point_detection,
+                              line_detection)
+from ops.spectrum_store import content_hash, SpectrumStore, spectrum_store
+from ops.pyramid import TILE_SIZE, map_raw, area_resize, TilePyramid
+from ops.image_store import ImageEntry, ImageStore, image_store
+from ops.frame_stack import FRAME_EXTS, iter_frames, prefetch, RunningStack, stack_average
+from ops.bitmask import is_binary, as_mask, BitMask, mask_stats
+from ops.quality import psnr, SsimReference, ssim, noise_sigma, ConvergenceTracker, checkpoints
+from ops.bitplane import (bit_depth, bit_planes, planes_mask, top_masks, equalize_stack, mask_sweep,
+                         BitPlaneEngine)
@@ -0,0 +1,125 @@
+import itertools
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from ops.bitmask import BitMask
+from ops.quality import ConvergenceTracker, checkpoints
+
+LOGIC_OPS = ("AND", "OR", "XOR", "NOT")
+AVERAGING_KS = (8, 16, 64, 128)
+
+
+def logic_op(img_a, img_b, op="AND"):
+    """
+    AND / OR / XOR dua citra, atau NOT A (img_b diabaikan). B disamakan ke ukuran A.
+    Bila keduanya BitMask, operasi berjalan pada bit packed dan hasilnya BitMask;
+    campuran BitMask + citra biasa dibuka dulu ke uint8.
+    """
+    if isinstance(img_a, BitMask) and (op == "NOT" or isinstance(img_b, BitMask)):
+        if op == "NOT":
+            return ~img_a
+        if img_b.shape != img_a.shape:
+            img_b = BitMask.from_array(img_b.to_u8(), shape=img_a.shape)
+        if op == "AND":
+            return img_a & img_b
+        if op == "OR":
+            return img_a | img_b
+        return img_a ^ img_b
+
+    if isinstance(img_a, BitMask):
+        img_a = img_a.to_u8()
+    if op == "NOT":
+        return cv2.bitwise_not(img_a)
+    if isinstance(img_b, BitMask):
+        img_b = img_b.to_u8()
+
+    h, w = img_a.shape[:2]
+    img_b = cv2.resize(img_b, (w, h))
+
+    if img_a.ndim == 3 and img_b.ndim == 2:
+        img_b = cv2.cvtColor(img_b, cv2.COLOR_GRAY2BGR)
+    elif img_a.ndim == 2 and img_b.ndim == 3:
+        img_a = cv2.cvtColor(img_a, cv2.COLOR_GRAY2BGR)
+
+    if op == "AND":
+        return cv2.bitwise_and(img_a, img_b)
+    if op == "OR":
+        return cv2.bitwise_or(img_a, img_b)
+    return cv2.bitwise_xor(img_a, img_b)
+
+
+def mask_subtraction(img_a, mask=0xF0):
+    """Tahapan Pg 8: (a) original, (b) masked, (c) difference, (d) equalized."""
+    img_b = (img_a & mask).astype(np.uint8)
+    diff = cv2.absdiff(img_a, img_b)
+    return {"a": img_a, "b": img_b, "c": diff, "d": cv2.equalizeHist(diff)}
+
+
+def _noise_sum(seed, n, shape):
+    # Jumlah n field N(0, 1) float32: tiap draw langsung ditulis ke buffer yang sama
+    rng = np.random.Generator(np.random.PCG64(seed))
+    buf = np.empty(shape, dtype=np.float32)
+    acc = np.zeros(shape, dtype=np.float32)
+    for _ in range(n):
+        rng.standard_normal(dtype=np.float32, out=buf)
+        acc += buf
+    return acc
+
+
+def noise_averaging(img, ks=AVERAGING_KS, sigma=64, seed=None, workers=None, chunk=8, min_gain=None):
+    """
+    Simulasi Pg 9: rata-rata K citra ber-noise Gaussian.
+    Return dict {"noisy": sample, K: rata-rata K frame} untuk tiap K di ks, plus
+    "seed" (entropy SeedSequence) agar hasil yang sama bisa diulang, "curve"
+    [(K, PSNR, SSIM)] terhadap citra bersih dan "stopped_at".
+
+    Frame dibagi per blok di antara titik evaluasi (ops.quality.checkpoints);
+    tiap blok punya stream noise sendiri dari SeedSequence.spawn dan dihitung
+    paralel di thread (Generator melepas GIL saat mengisi buffer). Blok dijumlah
+    berurutan, jadi hasil tidak bergantung pada jumlah worker. Bila min_gain
+    (dB per frame) diisi, simulasi berhenti begitu PSNR tidak lagi naik cukup;
+    K yang belum tercapai tidak ada di hasil.
+    """
+    img_clean = img.astype(np.float32)
+    shape = img_clean.shape
+    ss = np.random.SeedSequence(seed)
+    points = checkpoints(ks, chunk)
+    chunks = list(zip([0] + points[:-1], points))
+    sample_seed, *chunk_seeds = ss.spawn(len(chunks) + 1)
+
+    sample_noise = np.random.Generator(np.random.PCG64(sample_seed)).standard_normal(shape, dtype=np.float32)
+    out = {"noisy": np.clip(img_clean + sigma * sample_noise, 0, 255).astype(np.uint8), "seed": ss.entropy}
+
+    # Rata-rata K frame (img + noise_i) = img + sigma * (jumlah noise) / K
+    tracker = ConvergenceTracker(img_clean, min_gain)
+    total = np.zeros(shape, dtype=np.float32)
+    n_workers = workers or os.cpu_count() or 1
+    todo = iter(zip(chunk_seeds, chunks))
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=n_workers) as pool:
+        def fill():
+            # Hanya beberapa blok di depan yang dijadwalkan, supaya early stop tidak membuang banyak
+            for child, (start, end) in itertools.islice(todo, n_workers + 1 - len(pending)):
+                pending.append((end, pool.submit(_noise_sum, child, end - start, shape)))
+
+        fill()
+        while pending:
+            end, fut = pending.popleft()
+            total += fut.result()
+            fill()
+            avg = img_clean + total * (sigma / end)
+            np.clip(avg, 0, 255, out=avg)
+            if end in ks:
+                out[end] = avg.astype(np.uint8)
+            if not tracker.update(end, avg):
+                break
+        for _, fut in pending:
+            fut.cancel()
+
+    out["curve"] = tracker.curve
+    out["stopped_at"] = tracker.stopped_at
+    return out
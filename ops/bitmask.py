@@ -0,0 +1,155 @@
+"""
+Mask biner bit-packed (np.packbits): 1 bit per piksel, 8x lebih hemat dari uint8.
+
+Tiap baris dipack sendiri dan dipad ke kelipatan 8 byte, jadi buffer bisa
+dilihat sebagai kata uint64: AND/OR/XOR/NOT dan popcount berjalan langsung
+pada kata-kata itu tanpa pernah membuka ke uint8. Konversi ke uint8 hanya
+untuk tampilan/simpan (to_u8), dan bisa per strip baris + resize sehingga
+mask sangat besar pun tidak pernah dibuka penuh.
+"""
+import cv2
+import numpy as np
+
+ROW_ALIGN = 8  # Byte per baris dibulatkan ke kelipatan ini (satu kata uint64)
+STRIP_ROWS = 1024  # Baris per strip saat pack/unpack bertahap
+
+if hasattr(np, "bitwise_count"):
+    def _popcount(words):
+        return int(np.bitwise_count(words).sum(dtype=np.int64))
+else:
+    _POPCOUNT_LUT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def _popcount(words):
+        return int(_POPCOUNT_LUT[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+def _row_bytes(width):
+    n = -(-width // 8)
+    return -(-n // ROW_ALIGN) * ROW_ALIGN
+
+
+def is_binary(img):
+    """True bila citra hanya berisi 0 dan 255 (mask biner uint8)."""
+    return img.dtype == np.uint8 and not np.any((img != 0) & (img != 255))
+
+
+def as_mask(img):
+    """BitMask bila img adalah mask biner (gray, atau BGR dengan 3 channel identik); selain itu None."""
+    if img.ndim == 3:
+        if not (np.array_equal(img[..., 0], img[..., 1]) and np.array_equal(img[..., 0], img[..., 2])):
+            return None
+        img = img[..., 0]
+    return BitMask.from_array(img) if is_binary(img) else None
+
+
+class BitMask:
+    def __init__(self, bits, shape):
+        """bits: uint8 (h, row_bytes) hasil packbits per baris; shape: (h, w) piksel."""
+        self.bits = bits
+        self.shape = tuple(shape)
+
+    @classmethod
+    def zeros(cls, shape):
+        h, w = shape
+        return cls(np.zeros((h, _row_bytes(w)), dtype=np.uint8), shape)
+
+    @classmethod
+    def from_array(cls, img, threshold=127, shape=None):
+        """
+        Mask dari citra (piksel > threshold = 1). Citra berwarna diubah ke gray,
+        shape=(h, w) opsional untuk resize (nearest) dulu. Dipack per strip baris,
+        jadi array bool sementara hanya seukuran satu strip.
+        """
+        if img.ndim == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        if shape is not None and img.shape != tuple(shape):
+            img = cv2.resize(img, (shape[1], shape[0]), interpolation=cv2.INTER_NEAREST)
+        mask = cls.zeros(img.shape)
+        w = img.shape[1]
+        n = -(-w // 8)
+        for y in range(0, img.shape[0], STRIP_ROWS):
+            strip = img[y:y + STRIP_ROWS] > threshold
+            mask.bits[y:y + STRIP_ROWS, :n] = np.packbits(strip, axis=1)
+        return mask
+
+    @property
+    def words(self):
+        return self.bits.view(np.uint64)
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes
+
+    def _pad_mask(self):
+        # Bit padding di ujung baris harus tetap 0 (penting untuk NOT dan popcount)
+        row = np.zeros(self.bits.shape[1], dtype=np.uint8)
+        w = self.shape[1]
+        row[:w // 8] = 0xFF
+        if w % 8:
+            row[w // 8] = (0xFF << (8 - w % 8)) & 0xFF
+        return row.view(np.uint64)
+
+    def _check(self, other):
+        if self.shape != other.shape:
+            raise ValueError(f"Ukuran mask berbeda: {self.shape} vs {other.shape}")
+
+    def __and__(self, other):
+        self._check(other)
+        return BitMask(np.bitwise_and(self.words, other.words).view(np.uint8), self.shape)
+
+    def __or__(self, other):
+        self._check(other)
+        return BitMask(np.bitwise_or(self.words, other.words).view(np.uint8), self.shape)
+
+    def __xor__(self, other):
+        self._check(other)
+        return BitMask(np.bitwise_xor(self.words, other.words).view(np.uint8), self.shape)
+
+    def __invert__(self):
+        out = np.invert(self.words)
+        out &= self._pad_mask()
+        return BitMask(out.view(np.uint8), self.shape)
+
+    def count(self):
+        """Jumlah piksel bernilai 1 (popcount pada kata uint64)."""
+        return _popcount(self.words)
+
+    def area_fraction(self):
+        h, w = self.shape
+        return self.count() / float(h * w) if h * w else 0.0
+
+    def to_u8(self, size=None):
+        """
+        Mask uint8 0/255. size=(w, h) opsional: tiap strip baris dibuka lalu
+        diperkecil (INTER_AREA) sebelum strip berikutnya, jadi mask penuh tidak
+        pernah ada sebagai uint8.
+        """
+        h, w = self.shape
+        if size is None or tuple(size) == (w, h):
+            return np.unpackbits(self.bits, axis=1, count=w) * np.uint8(255)
+
+        out_w, out_h = size
+        out = np.empty((out_h, out_w), dtype=np.uint8)
+        rows = max(STRIP_ROWS, -(-h // out_h))
+        y_out = 0
+        for y in range(0, h, rows):
+            strip = np.unpackbits(self.bits[y:y + rows], axis=1, count=w) * np.uint8(255)
+            # Baris output yang menjadi bagian strip ini
+            y_end = round((y + strip.shape[0]) * out_h / h)
+            if y_end > y_out:
+                out[y_out:y_end] = cv2.resize(strip, (out_w, y_end - y_out), interpolation=cv2.INTER_AREA)
+            y_out = y_end
+        return out
+
+
+def mask_stats(a, b, result=None):
+    """Statistik area (popcount) dua mask: luas A, B, irisan, gabungan, IoU, Dice."""
+    inter = (a & b).count()
+    union = (a | b).count()
+    n_a, n_b = a.count(), b.count()
+    stats = {"A": n_a, "B": n_b, "AND": inter, "OR": union,
+             "IoU": inter / union if union else 0.0,
+             "Dice": 2 * inter / (n_a + n_b) if n_a + n_b else 0.0}
+    if result is not None:
+        stats["result"] = result.count()
+    return stats
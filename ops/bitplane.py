@@ -0,0 +1,183 @@
+"""
+Dekomposisi bit-plane untuk Subtraction (Pg 8), citra uint8 maupun uint16.
+
+Semua plane diambil sekaligus dengan np.unpackbits di axis baru (byte
+big-endian, jadi urutannya MSB dulu). Untuk banyak mask sekaligus, masked /
+difference / equalized dihitung dengan broadcasting (mask, h, w) dan
+equalization histogram per mask memakai satu bincount. Hasil per mask
+disimpan di cache LRU sehingga pindah mask tidak menghitung ulang.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ops.common import contact_sheet
+
+SWEEP_CHUNK_BYTES = 64 * 1024 * 1024  # Batas array sementara per batch mask saat sweep
+
+
+def bit_depth(img):
+    if img.dtype == np.uint8:
+        return 8
+    if img.dtype == np.uint16:
+        return 16
+    raise ValueError(f"Bit-plane hanya untuk uint8/uint16, bukan {img.dtype}")
+
+
+def bit_planes(img):
+    """Semua plane sekaligus: array (depth, h, w) berisi 0/1, index 0 = LSB."""
+    depth = bit_depth(img)
+    be = img.astype(">u2", copy=False) if depth == 16 else img
+    raw = np.ascontiguousarray(be).view(np.uint8).reshape(img.shape + (depth // 8,))
+    planes = np.unpackbits(raw, axis=-1)  # (h, w, depth), MSB dulu
+    return np.moveaxis(planes[..., ::-1], -1, 0)
+
+
+def planes_mask(bits):
+    """Mask integer dari kumpulan index plane, mis. (4, 5, 6, 7) -> 0xF0."""
+    mask = 0
+    for b in bits:
+        mask |= 1 << int(b)
+    return mask
+
+
+def top_masks(depth=8):
+    """Mask 'n bit teratas' untuk n = 1 .. depth-1: 0x80, 0xC0, ..., 0xFE (uint8)."""
+    full = (1 << depth) - 1
+    return [full ^ ((1 << (depth - n)) - 1) for n in range(1, depth)]
+
+
+def equalize_stack(stack):
+    """
+    Histogram equalization tiap slice stack (m, h, w) uint8/uint16 sekaligus:
+    satu bincount untuk semua histogram, LUT per slice, lalu take_along_axis.
+    LUT dihitung seperti cv2.equalizeHist (skala float32, pembulatan ke genap),
+    jadi untuk uint8 hasilnya sama dengan cv2.equalizeHist per slice.
+    """
+    m = stack.shape[0]
+    levels = 1 << bit_depth(stack)
+    flat = stack.reshape(m, -1)
+    n = flat.shape[1]
+    offsets = (np.arange(m, dtype=np.int64) * levels)[:, None]
+    hist = np.bincount((flat + offsets).ravel(), minlength=m * levels).reshape(m, levels)
+
+    cdf = np.cumsum(hist, axis=1)
+    cdf_min = hist[np.arange(m), np.argmax(hist > 0, axis=1)][:, None]
+    denom = np.maximum(n - cdf_min, 1).astype(np.float32)
+    scale = np.float32(levels - 1) / denom
+    lut = np.rint((cdf - cdf_min).astype(np.float32) * scale)
+    lut = np.clip(lut, 0, levels - 1).astype(stack.dtype)
+    # Slice konstan: equalizeHist mengembalikan citra asli
+    flat_slices = (n - cdf_min[:, 0]) == 0
+    lut[flat_slices] = np.arange(levels, dtype=stack.dtype)
+    return np.take_along_axis(lut, flat, axis=1).reshape(stack.shape)
+
+
+def mask_sweep(img, masks):
+    """
+    Masked (img & mask), difference (img - masked) dan equalized difference
+    untuk semua mask sekaligus. Return tiga array (len(masks), h, w).
+    """
+    masks = np.asarray(masks, dtype=img.dtype).reshape(-1, 1, 1)
+    masked = img[None] & masks
+    diff = img[None] - masked  # masked <= img per bit, jadi tidak underflow
+    return masked, diff, equalize_stack(diff)
+
+
+class BitPlaneEngine:
+    """
+    Engine Subtraction untuk satu citra: plane (lazy) dan hasil {"a", "b", "c", "d"}
+    per mask dari cache LRU. nbytes mencakup plane, contact sheet dan cache mask;
+    bila melewati max_bytes, mask yang paling lama tidak dipakai dibuang.
+    """
+
+    def __init__(self, img, max_bytes=256 * 1024 * 1024):
+        if img.ndim != 2:
+            raise ValueError("Bit-plane butuh citra grayscale")
+        self.img = img
+        self.depth = bit_depth(img)
+        self.full_mask = (1 << self.depth) - 1
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._planes = None
+        self._sheet = None
+        self._cache = OrderedDict()  # mask -> {"b", "c", "d"}
+        self._lock = threading.Lock()  # sweep() bisa jalan di worker background
+
+    @property
+    def planes(self):
+        with self._lock:
+            if self._planes is None:
+                self._planes = bit_planes(self.img)
+                self.nbytes += self._planes.nbytes
+                self._trim()
+            return self._planes
+
+    def planes_sheet(self, tile=160):
+        """Contact sheet semua plane (MSB dulu) untuk ditampilkan; dibuat sekali."""
+        if self._sheet is not None:
+            return self._sheet
+        planes = self.planes
+        views = [planes[b] * np.uint8(255) for b in range(self.depth - 1, -1, -1)]
+        labels = [f"bit {b}" for b in range(self.depth - 1, -1, -1)]
+        sheet = contact_sheet(views, labels, ncols=self.depth // 2 if self.depth > 8 else 4, tile=tile)
+        with self._lock:
+            self._sheet = sheet
+            self.nbytes += sheet.nbytes
+            self._trim()
+        return sheet
+
+    def sweep(self, masks=None):
+        """Hitung (dan cache) hasil untuk semua mask yang belum ada; default top_masks."""
+        masks = top_masks(self.depth) if masks is None else masks
+        with self._lock:
+            todo = [int(m) & self.full_mask for m in masks if int(m) & self.full_mask not in self._cache]
+        if not todo:
+            return
+        # Batch mask dibatasi ukuran array sementara (masked + diff + eq + index int64)
+        per_mask = self.img.size * (3 * self.img.itemsize + 8)
+        step = max(1, SWEEP_CHUNK_BYTES // per_mask)
+        for i in range(0, len(todo), step):
+            batch = todo[i:i + step]
+            masked, diff, eq = mask_sweep(self.img, batch)
+            with self._lock:
+                for j, m in enumerate(batch):
+                    # Copy per mask: view ke array batch akan menahan seluruh batch tetap hidup
+                    res = {"b": masked[j].copy(), "c": diff[j].copy(), "d": eq[j].copy()}
+                    for arr in res.values():
+                        arr.setflags(write=False)
+                    self._insert(m, res)
+
+    def _insert(self, mask, res):
+        if mask in self._cache:
+            return
+        self._cache[mask] = res
+        self.nbytes += sum(a.nbytes for a in res.values())
+        self._trim()
+
+    def _trim(self):
+        # Mask terbaru selalu disisakan agar get() tetap punya hasil
+        while self.nbytes > self.max_bytes and len(self._cache) > 1:
+            _, old = self._cache.popitem(last=False)
+            self.nbytes -= sum(a.nbytes for a in old.values())
+
+    def clear(self):
+        """Buang plane, contact sheet dan cache mask; dihitung ulang saat dibutuhkan."""
+        with self._lock:
+            self._planes = self._sheet = None
+            self._cache.clear()
+            self.nbytes = 0
+
+    def get(self, mask):
+        """{"a": original, "b": masked, "c": difference, "d": equalized} untuk mask."""
+        mask = int(mask) & self.full_mask
+        with self._lock:
+            res = self._cache.get(mask)
+            if res is not None:
+                self._cache.move_to_end(mask)
+        if res is None:
+            self.sweep([mask])
+            with self._lock:
+                res = self._cache.get(mask)
+        return dict(res, a=self.img)
@@ -0,0 +1,66 @@
+import cv2
+import numpy as np
+
+
+def to_gray(img):
+    """Kembalikan versi grayscale (uint8) dari citra BGR atau gray."""
+    if img.ndim == 3:
+        return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    return img
+
+
+def normalize_u8(arr):
+    """Min-max normalisasi ke 0-255 lalu cast ke uint8."""
+    return cv2.normalize(arr, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+
+
+def proxy_image(img, max_side):
+    """
+    Salinan kecil (INTER_AREA) dengan sisi terpanjang <= max_side, untuk preview
+    interaktif. Citra yang sudah cukup kecil dikembalikan apa adanya.
+    """
+    h, w = img.shape[:2]
+    scale = max_side / max(h, w)
+    if scale >= 1:
+        return img
+    return cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+
+
+def display_buffer(img, size, interpolation=None, gray=False):
+    """
+    Pipeline tampilan: resize dulu ke size=(w, h), baru konversi warna di hasil kecil
+    (BGR -> RGB, atau BGR -> gray bila gray=True). Citra gray tetap 1 channel.
+    interpolation None: INTER_AREA saat mengecil, INTER_LANCZOS4 saat membesar.
+    """
+    h, w = img.shape[:2]
+    if (w, h) != tuple(size):
+        if interpolation is None:
+            interpolation = cv2.INTER_AREA if size[0] <= w and size[1] <= h else cv2.INTER_LANCZOS4
+        img = cv2.resize(img, tuple(size), interpolation=interpolation)
+    if img.ndim == 3:
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY if gray else cv2.COLOR_BGR2RGB)
+    return img
+
+
+def contact_sheet(images, labels=None, ncols=5, tile=200, pad=4):
+    """
+    Susun banyak citra uint8 (gray/BGR) jadi satu grid berlabel.
+    Tiap tile di-resize (INTER_AREA) ke tile x tile dengan aspect ratio dipertahankan.
+    """
+    n = len(images)
+    nrows = (n + ncols - 1) // ncols
+    label_h = 22 if labels else 0
+    cell_w, cell_h = tile + pad, tile + label_h + pad
+    sheet = np.full((nrows * cell_h + pad, ncols * cell_w + pad), 255, dtype=np.uint8)
+
+    for i, img in enumerate(images):
+        img = to_gray(img)
+        h, w = img.shape
+        scale = tile / max(h, w)
+        small = cv2.resize(img, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+        r, c = divmod(i, ncols)
+        y, x = r * cell_h + pad + label_h, c * cell_w + pad
+        sheet[y:y + small.shape[0], x:x + small.shape[1]] = small
+        if labels:
+            cv2.putText(sheet, str(labels[i]), (x, y - 6), cv2.FONT_HERSHEY_SIMPLEX, 0.45, 0, 1, cv2.LINE_AA)
+    return sheet
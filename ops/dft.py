@@ -0,0 +1,126 @@
+import cv2
+import numpy as np
+
+from ops.common import normalize_u8
+from ops.fft import rfft2, irfft2, expand_half, pad_to_optimal
+
+
+def rotation_prep(angle):
+    """Deskripsi preprocessing rotasi untuk key SpectrumStore (kosong bila tidak dirotasi)."""
+    if abs(angle) <= 0.1:
+        return ()
+    return (("rotate", round(float(angle), 2)),)
+
+
+def rotate_image(img_u8, angle, border_value=None):
+    """
+    Rotasi citra terhadap pusat. border_value=None: background diisi rata-rata
+    intensitas (mengurangi garis tepi palsu di spektrum).
+    """
+    if abs(angle) <= 0.1:
+        return img_u8
+    h, w = img_u8.shape[:2]
+    if border_value is None:
+        border_value = int(np.mean(img_u8))
+    M = cv2.getRotationMatrix2D((w // 2, h // 2), angle, 1.0)
+    return cv2.warpAffine(img_u8, M, (w, h),
+                          flags=cv2.INTER_LINEAR,
+                          borderMode=cv2.BORDER_CONSTANT,
+                          borderValue=border_value)
+
+
+def half_spectrum(img_u8, remove_dc=False, pad=True):
+    """
+    Half-spectrum rfft2 (complex64); opsional set F(0,0) = 0 (DC di [0, 0]).
+    pad=True: dipad ke ukuran DFT optimal dulu. Return (spec, fft_shape).
+    """
+    src = pad_to_optimal(img_u8) if pad else img_u8
+    spec = rfft2(src)
+    if remove_dc:
+        spec = remove_dc_component(spec)
+    return spec, src.shape
+
+
+def magnitude_view(spec, cols):
+    """Magnitude spectrum skala log, ter-shift, uint8."""
+    mag_log = np.log1p(np.abs(spec))
+    return normalize_u8(np.fft.fftshift(expand_half(mag_log, cols)))
+
+
+def phase_view(spec, cols):
+    """Phase spectrum ter-shift, uint8 (phase konjugat = -phase)."""
+    phase = np.angle(spec)
+    return normalize_u8(np.fft.fftshift(expand_half(phase, cols, negate=True)))
+
+
+def spatial_view(spec, fft_shape, remove_dc=False, crop=None):
+    """Rekonstruksi spasial (inverse DFT) untuk ditampilkan; crop buang area padding."""
+    img_back_real = irfft2(spec, fft_shape)
+    if crop is not None:
+        img_back_real = img_back_real[:crop[0], :crop[1]]
+    if remove_dc:
+        # Visualisasi khusus Remove DC (negatif kontras tinggi)
+        res = np.abs(img_back_real) * 4.0
+        return np.clip(np.rint(res), 0, 255).astype(np.uint8)
+    # rint: error float32 IFFT (mis. 99.9999) jangan terpotong jadi 99
+    return np.clip(np.rint(img_back_real), 0, 255).astype(np.uint8)
+
+
+def remove_dc_component(spec):
+    """Salinan spektrum dengan F(0,0) = 0 (spektrum asli tidak diubah, bisa read-only)."""
+    spec = spec.copy()
+    spec[0, 0] = 0.0 + 0.0j
+    return spec
+
+
+def dft_views_from_spectrum(spec, fft_shape, content_shape, remove_dc=False):
+    """
+    Ketiga view DFT (magnitude, phase, spatial) dari half-spectrum yang sudah ada,
+    mis. dari ops.spectrum_store. Spektrum masukan tidak diubah.
+    """
+    views = LazyDftViews(spec, fft_shape, content_shape, remove_dc)
+    return tuple(views.get(mode) for mode in LazyDftViews.MODES)
+
+
+class LazyDftViews:
+    """
+    View DFT (Magnitude / Phase / Spatial) yang dihitung saat pertama diminta lalu
+    disimpan. Buat instance baru bila citra, rotasi, atau flag Remove DC berubah.
+    """
+    MODES = ("Magnitude", "Phase", "Spatial")
+
+    def __init__(self, spec, fft_shape, content_shape, remove_dc=False):
+        self.spec = remove_dc_component(spec) if remove_dc else spec
+        self.fft_shape = fft_shape
+        self.content_shape = content_shape
+        self.remove_dc = remove_dc
+        self._views = {}
+
+    def get(self, mode):
+        if mode not in self._views:
+            cols = self.fft_shape[1]
+            if mode == "Magnitude":
+                self._views[mode] = magnitude_view(self.spec, cols)
+            elif mode == "Phase":
+                self._views[mode] = phase_view(self.spec, cols)
+            elif mode == "Spatial":
+                self._views[mode] = spatial_view(self.spec, self.fft_shape, self.remove_dc,
+                                                 crop=self.content_shape)
+            else:
+                return None
+        return self._views[mode]
+
+    def computed(self):
+        return tuple(self._views)
+
+    def clear(self):
+        self._views.clear()
+
+
+def dft_views(img_u8, remove_dc=False, pad=True):
+    """
+    Hitung ketiga view DFT sekaligus: (magnitude, phase, spatial).
+    Spektrum berukuran padded; rekonstruksi spasial di-crop ke ukuran asli.
+    """
+    spec, fft_shape = half_spectrum(img_u8, pad=pad)
+    return dft_views_from_spectrum(spec, fft_shape, img_u8.shape, remove_dc)
@@ -0,0 +1,208 @@
+"""
+FFT untuk citra real: real-to-complex (rfft2/irfft2) dalam single precision,
+lewat backend yang bisa diganti (numpy, atau scipy.fft multithread bila terpasang).
+
+Spektrum disimpan sebagai half-spectrum tanpa shift, shape (rows, cols // 2 + 1),
+DC di [0, 0]. Karena input real, setengah kolom sisanya adalah konjugat
+cerminannya, jadi cukup di-expand saat perlu ditampilkan.
+"""
+import importlib.util
+import os
+import time
+
+import cv2
+import numpy as np
+
+# scipy opsional; tanpa scipy pakai numpy. Hanya dicek keberadaannya di sini:
+# import scipy.fft (~0.3 s) ditunda sampai transform pertama (lihat _scipy_fft).
+HAS_SCIPY = importlib.util.find_spec("scipy") is not None
+
+
+# ==============================================================================
+# BACKEND FFT (numpy / scipy multithread)
+# ==============================================================================
+class FFTBackend:
+    """
+    Dasar backend FFT. Subclass cukup mengisi _rfft2 / _irfft2.
+    setup() menjalankan transform pertama untuk ukuran tertentu dan mencatat
+    biayanya (alokasi twiddle/plan internal) di setup_costs.
+    """
+    name = "base"
+
+    def __init__(self):
+        self.setup_costs = {}
+
+    def setup(self, shape):
+        shape = tuple(shape)
+        if shape not in self.setup_costs:
+            t0 = time.perf_counter()
+            spec = self._rfft2(np.zeros(shape, dtype=np.float32), (-2, -1))
+            self._irfft2(spec, shape[-2:], (-2, -1))
+            self.setup_costs[shape] = time.perf_counter() - t0
+        return self.setup_costs[shape]
+
+    def n_workers(self):
+        return 1
+
+    def rfft2(self, img, axes=(-2, -1)):
+        return self._rfft2(np.asarray(img, dtype=np.float32), axes).astype(np.complex64, copy=False)
+
+    def irfft2(self, spec, shape, axes=(-2, -1)):
+        return self._irfft2(spec, tuple(shape), axes).astype(np.float32, copy=False)
+
+
+class NumpyFFTBackend(FFTBackend):
+    """numpy.fft (pocketfft), single-thread."""
+    name = "numpy"
+
+    def _rfft2(self, img, axes):
+        return np.fft.rfft2(img, axes=axes)
+
+    def _irfft2(self, spec, shape, axes):
+        return np.fft.irfft2(spec, s=shape, axes=axes)
+
+
+def _scipy_fft():
+    import scipy.fft
+    return scipy.fft
+
+
+class ScipyFFTBackend(FFTBackend):
+    """scipy.fft dengan workers=N thread; workers=None ikut set_workers()."""
+    name = "scipy"
+
+    def __init__(self, workers=None):
+        super().__init__()
+        self.workers = workers
+
+    def n_workers(self):
+        return self.workers if self.workers is not None else fft_workers
+
+    def _rfft2(self, img, axes):
+        return _scipy_fft().rfft2(img, axes=axes, workers=self.n_workers())
+
+    def _irfft2(self, spec, shape, axes):
+        return _scipy_fft().irfft2(spec, s=shape, axes=axes, workers=self.n_workers())
+
+
+BACKENDS = {"numpy": NumpyFFTBackend}
+if HAS_SCIPY:
+    BACKENDS["scipy"] = ScipyFFTBackend
+
+# Setting global: jumlah thread FFT dan backend aktif (scipy bila tersedia)
+fft_workers = os.cpu_count() or 1
+_backend = BACKENDS["scipy" if "scipy" in BACKENDS else "numpy"]()
+
+
+def available_backends():
+    return list(BACKENDS)
+
+
+def get_backend():
+    return _backend
+
+
+def set_backend(name):
+    """Ganti backend aktif ("numpy" / "scipy"). Return instance backend."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Backend FFT '{name}' tidak tersedia (ada: {', '.join(BACKENDS)})")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def set_workers(n):
+    """Jumlah thread FFT global (dipakai backend yang mendukung multithread)."""
+    global fft_workers
+    fft_workers = max(1, int(n))
+
+
+def benchmark_backends(img, repeats=5):
+    """
+    Bandingkan semua backend pada citra yang sama.
+    Return list dict: name, workers, setup_s, forward_s, inverse_s (rata-rata per panggilan).
+    """
+    img = np.asarray(img, dtype=np.float32)
+    results = []
+    for name, cls in BACKENDS.items():
+        backend = cls()
+        setup_s = backend.setup(img.shape)
+
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            spec = backend.rfft2(img)
+        forward_s = (time.perf_counter() - t0) / repeats
+
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            backend.irfft2(spec, img.shape)
+        inverse_s = (time.perf_counter() - t0) / repeats
+
+        results.append({
+            "name": name,
+            "workers": backend.n_workers(),
+            "setup_s": setup_s,
+            "forward_s": forward_s,
+            "inverse_s": inverse_s,
+        })
+    return results
+
+
+# ==============================================================================
+# HELPER HALF-SPECTRUM
+# ==============================================================================
+def rfft2(img, axes=(-2, -1)):
+    """Forward FFT real-to-complex (complex64) lewat backend aktif."""
+    return _backend.rfft2(img, axes)
+
+
+def irfft2(spec, shape, axes=(-2, -1)):
+    """Inverse FFT complex-to-real kembali ke ukuran `shape` (float32)."""
+    return _backend.irfft2(spec, shape, axes)
+
+
+def optimal_shape(shape):
+    """Ukuran DFT cepat (faktor 2, 3, 5) >= shape, seperti cv2.getOptimalDFTSize."""
+    return tuple(cv2.getOptimalDFTSize(int(n)) for n in shape)
+
+
+def pad_to_optimal(img):
+    """
+    Pad kanan-bawah ke optimal_shape dengan border reflect agar tidak ada
+    lompatan tepi baru. Hasil transform cukup di-crop [:rows, :cols] kembali.
+    """
+    rows, cols = img.shape[:2]
+    prow, pcol = optimal_shape((rows, cols))
+    if (prow, pcol) == (rows, cols):
+        return img
+    border = cv2.BORDER_REFLECT_101 if min(rows, cols) > 1 else cv2.BORDER_REPLICATE
+    return cv2.copyMakeBorder(img, 0, prow - rows, 0, pcol - cols, border)
+
+
+def half_width(cols):
+    return cols // 2 + 1
+
+
+def centered_freqs(n, half=False):
+    """
+    Jarak bertanda tiap indeks frekuensi (layout tanpa shift) terhadap pusat
+    spektrum yang di-fftshift, yaitu posisi (k + n//2) % n dikurangi n//2.
+    """
+    k = np.arange(half_width(n) if half else n)
+    return (k + n // 2) % n - n // 2
+
+
+def expand_half(half, cols, negate=False, conjugate=False):
+    """
+    Lengkapi half-spectrum menjadi full (rows, cols) tanpa shift.
+    X[r, c] = conj(X[-r, -c]): magnitude dicermin, phase dicermin lalu dinegasi.
+    """
+    rows, nh = half.shape
+    full = np.empty((rows, cols), dtype=half.dtype)
+    full[:, :nh] = half
+    if cols > nh:
+        mirror = half[(-np.arange(rows)) % rows][:, cols - np.arange(nh, cols)]
+        if conjugate:
+            mirror = np.conj(mirror)
+        full[:, nh:] = -mirror if negate else mirror
+    return full
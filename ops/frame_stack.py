@@ -0,0 +1,238 @@
+"""
+Averaging stack frame nyata (Pg 9 dengan data asli): folder citra, TIFF
+multi-page, atau video (cv2.VideoCapture).
+
+Frame dibaca streaming oleh thread prefetch dan langsung masuk ke akumulator
+running float32 (opsional varians Welford), jadi memori tetap O(satu frame)
+berapa pun K-nya. Snapshot rata-rata diambil saat jumlah frame mencapai K
+yang diminta. Frame 16-bit (PNG/TIFF) dibaca dengan kedalaman aslinya;
+konversi ke 8-bit hanya untuk tampilan.
+"""
+import os
+import queue
+import threading
+
+import cv2
+import numpy as np
+from PIL import Image, ImageSequence
+
+from ops.common import normalize_u8, to_gray
+from ops.quality import ConvergenceTracker, checkpoints
+
+FRAME_EXTS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+TIFF_EXTS = (".tif", ".tiff")
+PREFETCH_DEPTH = 4
+
+
+def _dir_frames(path, gray):
+    names = sorted(n for n in os.listdir(path) if n.lower().endswith(FRAME_EXTS))
+    flag = cv2.IMREAD_ANYDEPTH | (cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_COLOR)
+    for name in names:
+        img = cv2.imread(os.path.join(path, name), flag)
+        if img is not None:
+            yield img
+
+
+def _tiff_frames(path, gray):
+    # PIL membuka page satu per satu (cv2.imreadmulti memuat semua page sekaligus).
+    # Page 16-bit (I;16*) tetap uint16; convert("L") akan memotongnya ke 255.
+    with Image.open(path) as im:
+        for page in ImageSequence.Iterator(im):
+            if page.mode.startswith("I;16"):
+                yield np.asarray(page).astype(np.uint16)
+            elif gray:
+                yield np.asarray(page.convert("L"))
+            else:
+                yield cv2.cvtColor(np.asarray(page.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def _video_frames(path, gray):
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Gagal membuka video {path}")
+    try:
+        while True:
+            ok, frame = cap.read()
+            if not ok:
+                break
+            yield to_gray(frame) if gray else frame
+    finally:
+        cap.release()
+
+
+def iter_frames(source, gray=True):
+    """
+    Generator frame uint8/uint16 dari folder citra (urut nama), TIFF multi-page, atau
+    file lain yang bisa dibuka cv2.VideoCapture (video / pola img_%03d.png).
+    """
+    if os.path.isdir(source):
+        return _dir_frames(source, gray)
+    if source.lower().endswith(TIFF_EXTS):
+        return _tiff_frames(source, gray)
+    return _video_frames(source, gray)
+
+
+def prefetch(frames, depth=PREFETCH_DEPTH):
+    """
+    Baca iterator `frames` di thread terpisah, maksimal `depth` frame di depan
+    konsumen. Error pembacaan diteruskan ke konsumen; berhenti iterasi lebih awal
+    juga menghentikan thread pembaca.
+    """
+    q = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def reader():
+        try:
+            for frame in frames:
+                if not put(frame):
+                    return
+            put(done)
+        except Exception as e:
+            put(e)
+        finally:
+            close = getattr(frames, "close", None)
+            if close is not None:
+                close()
+
+    thread = threading.Thread(target=reader, name="frame-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = q.get()
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Tunggu pembaca selesai agar decoder (mis. VideoCapture) dilepas dengan rapi
+        stop.set()
+        thread.join()
+
+
+class RunningStack:
+    """
+    Rata-rata (dan opsional varians, algoritma Welford) dari frame yang masuk
+    satu per satu. Hanya menyimpan akumulator float32 seukuran satu frame.
+    """
+
+    def __init__(self, variance=False):
+        self.variance = variance
+        self.count = 0
+        self._acc = None  # Jumlah frame (tanpa varians) atau rata-rata running (Welford)
+        self._m2 = None
+        self._delta = None
+
+    def add(self, frame):
+        frame = frame.astype(np.float32)
+        if self._acc is None:
+            self._acc = np.zeros_like(frame)
+            if self.variance:
+                self._m2 = np.zeros_like(frame)
+                self._delta = np.empty_like(frame)
+        elif frame.shape != self._acc.shape:
+            raise ValueError(f"Ukuran frame {frame.shape} berbeda dari frame pertama {self._acc.shape}")
+
+        self.count += 1
+        if not self.variance:
+            self._acc += frame
+            return
+
+        # Welford: mean += (x - mean) / n ; M2 += (x - mean_lama) * (x - mean_baru)
+        np.subtract(frame, self._acc, out=self._delta)
+        self._acc += self._delta / self.count
+        frame -= self._acc
+        self._delta *= frame
+        self._m2 += self._delta
+
+    def mean(self):
+        return self._acc.copy() if self.variance else self._acc / self.count
+
+    def mean_as(self, dtype=np.uint8):
+        """Rata-rata dibulatkan ke dtype integer (mis. dtype frame asli)."""
+        info = np.iinfo(dtype)
+        mean = np.rint(self.mean())
+        return np.clip(mean, info.min, info.max, out=mean).astype(dtype)
+
+    def std(self):
+        """Simpangan baku per piksel (sampel, n-1); None bila varians tidak dihitung."""
+        if not self.variance or self.count < 2:
+            return None
+        return np.sqrt(self._m2 / (self.count - 1))
+
+
+def stack_average(source, ks, gray=True, variance=False, out_dir=None, depth=PREFETCH_DEPTH, min_gain=None,
+                  every=8):
+    """
+    Stream frame dari `source` (lihat iter_frames) dan ambil snapshot rata-rata
+    saat jumlah frame = K untuk tiap K di ks. Berhenti di max(ks); bila frame
+    habis lebih dulu, snapshot terakhir diambil di jumlah frame yang tersedia.
+
+    Return dict {"count": n, "first": frame pertama, K: rata-rata (dtype frame), ...}
+    plus "std": {K: simpangan baku float32} bila variance=True. Bila out_dir
+    diberikan, snapshot juga disimpan sebagai avg_K{K}.png (dan std_K{K}.png).
+
+    Stack nyata tidak punya citra bersih, jadi kurva konvergensi ("curve") memakai
+    estimasi noise tanpa referensi (ops.quality.noise_sigma), dievaluasi di
+    ops.quality.checkpoints(ks, every). Bila min_gain (dB per frame) diisi,
+    streaming berhenti begitu gain turun di bawahnya ("stopped_at").
+    """
+    ks = sorted(set(int(k) for k in ks if int(k) > 0))
+    if not ks:
+        raise ValueError("Minimal satu nilai K > 0")
+
+    stack = RunningStack(variance)
+    tracker = None  # Dibuat saat frame pertama masuk (peak PSNR ikut kedalaman bit)
+    points = set(checkpoints(ks, every))
+    out = {"count": 0, "first": None}
+    if variance:
+        out["std"] = {}
+
+    def snapshot():
+        k = stack.count
+        out[k] = stack.mean_as(out["first"].dtype)
+        std = stack.std()
+        if variance and std is not None:
+            out["std"][k] = std
+        if out_dir is not None:
+            cv2.imwrite(os.path.join(out_dir, f"avg_K{k}.png"), out[k])
+            if variance and std is not None:
+                cv2.imwrite(os.path.join(out_dir, f"std_K{k}.png"), normalize_u8(std))
+
+    frames = prefetch(iter_frames(source, gray), depth)
+    try:
+        for frame in frames:
+            if out["first"] is None:
+                out["first"] = frame
+                tracker = ConvergenceTracker(min_gain=min_gain, peak=float(np.iinfo(frame.dtype).max))
+            stack.add(frame)
+            if stack.count in ks:
+                snapshot()
+                if stack.count == ks[-1]:
+                    break
+            if stack.count in points and not tracker.update(stack.count, stack.mean()):
+                break
+    finally:
+        frames.close()
+
+    if stack.count == 0:
+        raise IOError(f"Tidak ada frame yang bisa dibaca dari {source}")
+    if stack.count not in out:
+        snapshot()
+    if not tracker.curve or tracker.curve[-1][0] != stack.count:
+        # Titik akhir kurva saja; stream yang habis normal bukan early stop
+        tracker.update(stack.count, stack.mean(), check=False)
+    out["count"] = stack.count
+    out["curve"] = tracker.curve
+    out["stopped_at"] = tracker.stopped_at
+    return out
@@ -0,0 +1,211 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+import numpy as np
+
+from ops.common import normalize_u8, contact_sheet
+from ops.fft import rfft2, irfft2, centered_freqs, pad_to_optimal
+
+FILTER_SHAPES = ("Ideal", "Butterworth", "Gaussian")
+FILTER_MODES = ("Lowpass", "Highpass")
+FILTER_BANK_RADII = (5, 15, 30, 80, 230)  # Radius yang dipakai PDF Pg 14-16
+
+
+def real_spectrum(img, pad=True):
+    """
+    Half-spectrum real-to-complex (complex64) dari citra, lihat ops.fft.
+    pad=True: citra dipad dulu ke ukuran DFT optimal. Return (spec, fft_shape).
+    """
+    src = pad_to_optimal(img) if pad else img
+    return rfft2(src), src.shape[:2]
+
+
+@lru_cache(maxsize=8)
+def distance_grid(rows, cols, half=False, content_shape=None):
+    """
+    Matriks jarak D(u,v) dari pusat spektrum (float32, read-only).
+    Di-cache per ukuran citra sehingga dipakai bersama oleh semua mask.
+
+    half=False: layout ter-shift (DC di tengah), shape (rows, cols).
+    half=True : layout half-spectrum rfft2 tanpa shift, shape (rows, cols//2 + 1),
+                nilainya sama dengan grid ter-shift di posisi frekuensi yang sama.
+    content_shape: ukuran citra asli sebelum padding. Indeks DFT = siklus per ukuran
+                padded (rows, cols), jadi diskalakan content/padded agar D tetap
+                dalam siklus per citra asli. Dengan begitu D0 berarti sama di
+                resolusi berapa pun dan tidak bergeser karena padding.
+    """
+    if half:
+        dv = centered_freqs(rows)[:, None].astype(np.float32)
+        du = centered_freqs(cols, half=True)[None, :].astype(np.float32)
+    else:
+        crow, ccol = rows // 2, cols // 2
+        v, u = np.ogrid[:rows, :cols]
+        dv, du = (v - crow).astype(np.float32), (u - ccol).astype(np.float32)
+    if content_shape is not None:
+        dv = dv * np.float32(content_shape[0] / rows)
+        du = du * np.float32(content_shape[1] / cols)
+    D = np.hypot(du, dv)
+    D = np.maximum(D, np.float32(1e-5))
+    D.setflags(write=False)
+    return D
+
+
+def transfer_function(rows, cols, shape="Ideal", mode="Lowpass", d0=50, n=2, half=False, content_shape=None):
+    """Mask H(u,v) float32 untuk filter Ideal / Butterworth / Gaussian."""
+    D = distance_grid(rows, cols, half, content_shape)
+    d0 = np.float32(d0)
+
+    if shape == "Ideal":
+        if mode == "Lowpass":
+            H = (D <= d0).astype(np.float32)
+        else:
+            H = (D > d0).astype(np.float32)
+
+    elif shape == "Butterworth":
+        # (D/D0)^(2n) bisa overflow ke inf untuk D0 kecil; hasilnya tetap benar (H -> 0)
+        with np.errstate(over="ignore"):
+            H = 1 / (1 + (D / d0) ** (2 * n))
+        if mode != "Lowpass":
+            H = 1 - H
+
+    elif shape == "Gaussian":
+        H = np.exp(-(D ** 2) / (2 * d0 ** 2))
+        if mode != "Lowpass":
+            H = 1 - H
+
+    else:
+        H = np.ones(D.shape, dtype=np.float32)
+
+    return H
+
+
+class TransferFunctionCache:
+    """
+    LRU cache mask H(u,v) dengan batas total ukuran (byte).
+    Key: (rows, cols, shape, mode, D0, n, half, content_shape); n diabaikan selain Butterworth.
+    Thread-safe: dipakai juga dari worker background GUI.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(rows, cols, shape, mode, d0, n, half=False, content_shape=None):
+        if content_shape is not None:
+            content_shape = tuple(content_shape[:2])
+            if content_shape == (rows, cols):
+                content_shape = None
+        return (rows, cols, shape, mode, float(d0), int(n) if shape == "Butterworth" else None,
+                half, content_shape)
+
+    def get(self, rows, cols, shape="Ideal", mode="Lowpass", d0=50, n=2, half=False, content_shape=None):
+        key = self.make_key(rows, cols, shape, mode, d0, n, half, content_shape)
+        with self._lock:
+            H = self._items.get(key)
+            if H is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return H
+            self.misses += 1
+
+        H = transfer_function(rows, cols, shape, mode, d0, n, half, key[-1])
+        H.setflags(write=False)
+        with self._lock:
+            if H.nbytes <= self.max_bytes and key not in self._items:
+                self._items[key] = H
+                self.nbytes += H.nbytes
+                self._evict()
+        return H
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes and self._items:
+            _, old = self._items.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Cache global yang dipakai GUI dan batch
+transfer_cache = TransferFunctionCache()
+
+
+def cached_transfer_function(rows, cols, shape="Ideal", mode="Lowpass", d0=50, n=2, half=False, content_shape=None):
+    return transfer_cache.get(rows, cols, shape, mode, d0, n, half, content_shape)
+
+
+def filter_spectrum(spec, H, fft_shape, crop=None):
+    """
+    Kalikan half-spectrum dengan H (layout half) lalu kembali ke domain spasial (uint8).
+    Mask radial simetris sehingga half-mask setara dengan mask ter-shift penuh.
+    crop=(rows, cols) membuang area padding sebelum normalisasi.
+    """
+    img_back = np.abs(irfft2(spec * H, fft_shape))
+    if crop is not None:
+        img_back = img_back[:crop[0], :crop[1]]
+    return normalize_u8(img_back)
+
+
+def frequency_filter(img, shape="Ideal", mode="Lowpass", d0=50, n=2, pad=True):
+    """
+    Filter domain frekuensi lengkap: FFT -> H(u,v) -> IFFT, di resolusi asli.
+    D0 dalam siklus per citra, jadi hasilnya setara dengan memfilter versi resize.
+    """
+    spec, fft_shape = real_spectrum(img, pad)
+    H = cached_transfer_function(*fft_shape, shape, mode, d0, n, half=True, content_shape=img.shape)
+    return filter_spectrum(spec, H, fft_shape, crop=img.shape[:2])
+
+
+def filter_bank_combos(shapes=FILTER_SHAPES, modes=FILTER_MODES, radii=FILTER_BANK_RADII):
+    """Semua kombinasi (shape, mode, D0) dengan urutan baris shape/mode, kolom radius."""
+    return [(sh, m, r) for sh in shapes for m in modes for r in radii]
+
+
+def filter_bank_spectrum(spec, fft_shape, content_shape, combos, n=2, max_batch_bytes=256 * 1024 * 1024):
+    """
+    Terapkan banyak mask sekaligus ke satu half-spectrum.
+    Mask ditumpuk jadi array 3-D lalu di-inverse dengan satu irfft2 batch;
+    bila terlalu besar, diproses per potongan agar memori <= max_batch_bytes.
+    Return stack uint8 (K, rows, cols), tiap slice dinormalisasi min-max sendiri.
+    """
+    rows, cols = content_shape[:2]
+    per_mask = spec.nbytes * 2 + int(np.prod(fft_shape)) * 4
+    chunk = max(1, max_batch_bytes // per_mask)
+    out = np.empty((len(combos), rows, cols), dtype=np.uint8)
+
+    for start in range(0, len(combos), chunk):
+        part = combos[start:start + chunk]
+        H = np.stack([cached_transfer_function(*fft_shape, sh, m, r, n, half=True, content_shape=(rows, cols))
+                      for sh, m, r in part])
+        back = np.abs(irfft2(spec[None] * H, fft_shape))[:, :rows, :cols]
+
+        # Setara cv2.normalize(NORM_MINMAX) per slice
+        lo = back.min(axis=(1, 2), keepdims=True)
+        span = back.max(axis=(1, 2), keepdims=True) - lo
+        scale = np.where(span > 0, 255.0 / np.where(span > 0, span, 1), 0).astype(np.float32)
+        out[start:start + len(part)] = ((back - lo) * scale).astype(np.uint8)
+    return out
+
+
+def filter_bank(img, shapes=FILTER_SHAPES, modes=FILTER_MODES, radii=FILTER_BANK_RADII, n=2, pad=True):
+    """Filter bank dari citra: satu forward FFT, semua mask, satu batch inverse. Return (stack, combos)."""
+    spec, fft_shape = real_spectrum(img, pad)
+    combos = filter_bank_combos(shapes, modes, radii)
+    return filter_bank_spectrum(spec, fft_shape, img.shape, combos, n), combos
+
+
+def filter_bank_sheet(stack, combos, ncols=len(FILTER_BANK_RADII), tile=200):
+    """Contact sheet berlabel dari hasil filter_bank."""
+    labels = [f"{sh} {'LP' if m == 'Lowpass' else 'HP'} D0={r:g}" for sh, m, r in combos]
+    return contact_sheet(list(stack), labels, ncols=ncols, tile=tile)
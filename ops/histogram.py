@@ -0,0 +1,55 @@
+import cv2
+import numpy as np
+
+COMPARISON_RESOLUTIONS = (256, 128, 64, 32)
+
+
+def degrade_resolution(img, res):
+    """Turunkan resolusi ke res x res lalu perbesar kembali (nearest)."""
+    h, w = img.shape[:2]
+    tmp = cv2.resize(img, (res, res))
+    return cv2.resize(tmp, (w, h), interpolation=cv2.INTER_NEAREST)
+
+
+def quantize(img, levels):
+    """Kurangi jumlah level intensitas menjadi `levels`."""
+    if levels >= 256:
+        return img
+    div = 256 // levels
+    return ((img // div) * div).astype(np.uint8)
+
+
+def resolution_comparison(img, resolutions=COMPARISON_RESOLUTIONS):
+    """Grid 2x2 perbandingan resolusi (Fig 3.2) dengan label teks."""
+    processed = []
+    for r in resolutions:
+        res = degrade_resolution(img, r)
+        cv2.putText(res, f"{r}x{r}", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
+        processed.append(res)
+
+    top = np.hstack((processed[0], processed[1]))
+    bot = np.hstack((processed[2], processed[3]))
+    return np.vstack((top, bot))
+
+
+def equalize(gray):
+    return cv2.equalizeHist(gray)
+
+
+def clahe(gray, clip_limit=2.0, tile_grid=(8, 8)):
+    return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid).apply(gray)
+
+
+def match_histogram(src, ref):
+    """Histogram specification: petakan CDF src ke CDF ref lewat LUT."""
+    src_hist, _ = np.histogram(src.flatten(), 256, [0, 256])
+    ref_hist, _ = np.histogram(ref.flatten(), 256, [0, 256])
+
+    src_cdf = src_hist.cumsum()
+    src_cdf = src_cdf / src_cdf.max()
+    ref_cdf = ref_hist.cumsum()
+    ref_cdf = ref_cdf / ref_cdf.max()
+
+    # Untuk tiap level g cari level ref dengan CDF terdekat (256x256 sekaligus)
+    lut = np.abs(ref_cdf[None, :] - src_cdf[:, None]).argmin(axis=1).astype(np.uint8)
+    return cv2.LUT(src, lut)
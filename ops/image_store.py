@@ -0,0 +1,241 @@
+"""
+Store citra tingkat sesi: satu file di-decode sekali, dipakai semua layar.
+
+Key = (path absolut, mtime), jadi file yang diubah di disk otomatis di-decode
+ulang. Tiap entry memegang citra asli (BGR) dan varian turunan yang dihitung
+lazy saat pertama diminta: grayscale (8-bit / kedalaman asli), versi kecil (resize).
+Semua array read-only karena dibagi antar layar. Dibatasi ukuran total (LRU),
+dicek ulang tiap kali entry tumbuh (decode penuh / varian baru).
+
+Decode penuh juga lazy: versi kecil dari JPEG yang belum di-decode diambil
+dengan cv2.IMREAD_REDUCED_* (decoder JPEG melewati detail DCT), jadi preview
+tampil tanpa membayar decode + memori resolusi penuh.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from ops.common import proxy_image
+
+JPEG_EXTS = (".jpg", ".jpeg", ".jpe", ".jfif")
+REDUCED_FLAGS = {
+    # faktor -> (flag warna, flag gray)
+    2: (cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+    4: (cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    8: (cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+}
+
+
+def probe_header(path):
+    """
+    ((w, h), bit depth per channel) dari header file tanpa decode piksel; None bila
+    formatnya tidak dikenali PIL. PIL melaporkan PNG/TIFF RGB 16-bit sebagai "RGB",
+    jadi rawmode decoder (mis. "RGB;16B") ikut diperiksa.
+    """
+    try:
+        with Image.open(path) as im:
+            rawmodes = [t.args if isinstance(t.args, str) else t.args[0] for t in (im.tile or [])
+                        if t.args]
+            deep = im.mode.startswith("I") or any(";16" in str(r) for r in rawmodes)
+            return im.size, 16 if deep else 8
+    except Exception:
+        return None
+
+
+def reduction_factor(size, max_side):
+    """Faktor IMREAD_REDUCED terbesar (8/4/2) yang hasilnya masih >= max_side; 1 = decode penuh."""
+    longest = max(size)
+    for f in (8, 4, 2):
+        if longest // f >= max_side:
+            return f
+    return 1
+
+
+class ImageEntry:
+    def __init__(self, path, original=None, size=None, bit_depth=8, on_grow=None):
+        self.path = path
+        self.on_grow = on_grow  # Dipanggil (tanpa lock entry) setelah decode penuh / varian baru
+        self.size = size  # (w, h) dari header, dipakai untuk memilih faktor reduced decode
+        self.bit_depth = bit_depth  # Dari header; 16 = gray_native() perlu decode kedalaman asli
+        self._original = None
+        self._variants = {}
+        self._lock = threading.RLock()  # Decode bisa dipicu dari worker background
+        if original is not None:
+            self._set_original(original)
+
+    def _set_original(self, img):
+        img.setflags(write=False)
+        self._original = img
+        self.size = (img.shape[1], img.shape[0])
+
+    @property
+    def decoded(self):
+        return self._original is not None
+
+    @property
+    def original(self):
+        """Citra BGR resolusi penuh; di-decode saat pertama dibutuhkan."""
+        with self._lock:
+            img = self._original
+            if img is None:
+                img = cv2.imread(self.path)
+                if img is None:
+                    raise IOError(f"Gagal membaca {self.path}")
+                self._set_original(img)
+                grown = True
+            else:
+                grown = False
+        if grown:
+            self._grown()
+        return img
+
+    def _variant(self, key, make):
+        with self._lock:
+            arr = self._variants.get(key)
+            if arr is not None:
+                return arr
+            arr = make()
+            if arr is self._original:
+                return arr
+            arr.setflags(write=False)
+            self._variants[key] = arr
+        self._grown()
+        return arr
+
+    def _grown(self):
+        if self.on_grow is not None:
+            self.on_grow()
+
+    def gray(self):
+        return self._variant("gray", lambda: cv2.cvtColor(self.original, cv2.COLOR_BGR2GRAY))
+
+    def gray_native(self):
+        """
+        Grayscale dengan kedalaman bit asli file (PNG/TIFF 16-bit tetap uint16).
+        File 8-bit (menurut header) langsung memakai gray(), tanpa decode tambahan.
+        """
+        if self.bit_depth <= 8:
+            return self.gray()
+        return self._variant("gray_native", self._read_gray_native)
+
+    def _read_gray_native(self):
+        img = cv2.imread(self.path, cv2.IMREAD_ANYDEPTH | cv2.IMREAD_ANYCOLOR)
+        if img is None:
+            raise IOError(f"Gagal membaca {self.path}")
+        if img.dtype not in (np.uint8, np.uint16):
+            img = cv2.normalize(img, None, 0, 65535, cv2.NORM_MINMAX).astype(np.uint16)
+        if img.ndim == 3:
+            img = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return img
+
+    def get(self, gray=False):
+        return self.gray() if gray else self.original
+
+    def resized(self, max_side, gray=False):
+        """
+        Versi kecil (INTER_AREA) dengan sisi terpanjang <= max_side.
+        Bila citra penuh belum di-decode dan file-nya JPEG, dipakai reduced decode.
+        """
+        return self._variant(("resized", max_side, gray), lambda: self._make_resized(max_side, gray))
+
+    def _make_resized(self, max_side, gray):
+        if not self.decoded and self.path.lower().endswith(JPEG_EXTS) and self.size is not None:
+            f = reduction_factor(self.size, max_side)
+            if f > 1:
+                small = cv2.imread(self.path, REDUCED_FLAGS[f][1 if gray else 0])
+                if small is not None:
+                    return proxy_image(small, max_side)
+        return proxy_image(self.get(gray), max_side)
+
+    @property
+    def nbytes(self):
+        base = self._original.nbytes if self._original is not None else 0
+        return base + sum(a.nbytes for a in self._variants.values())
+
+
+class ImageStore:
+    def __init__(self, max_bytes=1024 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.current = None  # Entry yang terakhir dibuka (dipakai layar lain tanpa decode ulang)
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path):
+        path = os.path.abspath(path)
+        return path, os.stat(path).st_mtime_ns
+
+    def load(self, path):
+        """
+        Entry untuk file path (None bila format tidak dikenali). Decode penuh baru
+        terjadi saat entry.original dipakai, dan hanya sekali per (path, mtime).
+        """
+        key = self.make_key(path)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                self.current = entry
+                return entry
+            self.misses += 1
+
+        # Cukup baca header; decode penuh ditunda sampai resolusi penuh dibutuhkan.
+        # Format yang bisa dibuka PIL tapi tidak oleh cv2 (ico, pcx, tga, ...) ditolak
+        # di sini, bukan baru gagal saat entry.original dipakai.
+        # Format yang tidak dikenali PIL langsung di-decode dengan cv2.
+        header = probe_header(key[0])
+        if header is not None and not cv2.haveImageReader(key[0]):
+            return None
+        on_grow = lambda: self._grown(key)
+        if header is not None:
+            entry = ImageEntry(key[0], size=header[0], bit_depth=header[1], on_grow=on_grow)
+        else:
+            img = cv2.imread(key[0])
+            if img is None:
+                return None
+            entry = ImageEntry(key[0], img, on_grow=on_grow)
+
+        with self._lock:
+            # Versi lama dari file yang sama (mtime berbeda) tidak akan dipakai lagi
+            for old_key in [k for k in self._items if k[0] == key[0]]:
+                del self._items[old_key]
+            self._items[key] = entry
+            self._evict()
+            self.current = entry
+        return entry
+
+    def _grown(self, key):
+        """Entry key baru saja dipakai & bertambah besar: jadikan terbaru, lalu evict sampai muat budget."""
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self._evict()
+
+    def nbytes(self):
+        return sum(e.nbytes for e in self._items.values())
+
+    def _evict(self):
+        # Varian tumbuh setelah dimasukkan, jadi ukuran dihitung ulang saat evict
+        total = self.nbytes()
+        while total > self.max_bytes and len(self._items) > 1:
+            _, old = self._items.popitem(last=False)
+            total -= old.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.current = None
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Store global untuk seluruh aplikasi
+image_store = ImageStore()
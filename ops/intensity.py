@@ -0,0 +1,29 @@
+import cv2
+import numpy as np
+
+
+def negative(gray):
+    return 255 - gray
+
+
+def power_law_lut(gamma, c=1.0):
+    table = ((np.arange(256) / 255.0) ** gamma) * 255 * c
+    return table.astype("uint8")
+
+
+def power_law(gray, gamma, c=1.0):
+    """s = c * r^gamma lewat lookup table."""
+    return cv2.LUT(gray, power_law_lut(gamma, c))
+
+
+def intensity_slicing(gray, a, b, preserve=True):
+    """Highlight rentang [a, b] ke 255; sisanya dipertahankan atau dinolkan."""
+    if b < a:
+        b = a
+    mask = (gray >= a) & (gray <= b)
+    if preserve:
+        out = gray.copy()
+    else:
+        out = np.zeros_like(gray)
+    out[mask] = 255
+    return out
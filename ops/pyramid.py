@@ -0,0 +1,239 @@
+"""
+Piramida tile multi-resolusi untuk viewer citra besar.
+
+Level 0 = citra asli, level k = 1/2^k (area averaging). Tile (default 256 px)
+dihitung lazy dari 2x2 tile level di bawahnya saat pertama dibutuhkan, lalu
+disimpan di LRU dengan batas byte. Render hanya menyentuh tile yang terlihat
+di viewport, dari level terdekat dengan zoom yang diminta.
+
+Level kasar bisa diambil dari overview (mis. reduced decode JPEG), sehingga
+tampilan Fit tidak perlu membaca seluruh level 0. Level 0 sendiri boleh berupa
+fungsi yang baru dipanggil saat detail dibutuhkan, atau memmap file tanpa
+kompresi (map_raw) yang hanya membaca baris yang terlihat.
+"""
+import math
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from PIL import Image
+
+TILE_SIZE = 256
+STRIP_ROWS = 1024  # Baris per strip saat memperkecil level 0 yang di-memmap
+
+
+def map_raw(path):
+    """
+    Memmap (h, w[, c]) read-only dari file yang pikselnya tersimpan tanpa kompresi
+    dalam satu blok (TIFF/BMP uncompressed 8-bit, L/RGB/BGR). Channel mengikuti
+    urutan di file (lihat rgb). Return (array, rgb) atau None bila tidak bisa.
+    """
+    try:
+        with Image.open(path) as im:
+            if len(im.tile) != 1:
+                return None
+            codec, box, offset, args = im.tile[0]
+            w, h = im.size
+    except Exception:
+        return None
+    if codec != "raw" or tuple(box) != (0, 0, w, h) or not isinstance(args, tuple) or len(args) < 3:
+        return None
+    rawmode, stride, orientation = args[:3]
+    channels = {"L": 1, "RGB": 3, "BGR": 3}.get(rawmode)
+    if channels is None:
+        return None
+    if stride and stride != w * channels:
+        return None
+    shape = (h, w) if channels == 1 else (h, w, 3)
+    arr = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+    if orientation < 0:
+        arr = arr[::-1]  # BMP disimpan dari baris bawah
+    return arr, rawmode == "RGB"
+
+
+def area_resize(img, size, rows=STRIP_ROWS):
+    """
+    cv2.resize INTER_AREA ke size=(w, h) per strip baris, jadi citra besar
+    (mis. memmap) tidak pernah dibaca utuh ke memori sekaligus.
+    """
+    h = img.shape[0]
+    out_w, out_h = size
+    if h <= rows:
+        return cv2.resize(np.ascontiguousarray(img), size, interpolation=cv2.INTER_AREA)
+    out = np.empty((out_h, out_w) + img.shape[2:], dtype=img.dtype)
+    rows = max(rows, -(-h // out_h))
+    y_out = 0
+    for y in range(0, h, rows):
+        strip = np.ascontiguousarray(img[y:y + rows])
+        y_end = round((y + strip.shape[0]) * out_h / h)
+        if y_end > y_out:
+            out[y_out:y_end] = cv2.resize(strip, (out_w, y_end - y_out),
+                                          interpolation=cv2.INTER_AREA).reshape(out[y_out:y_end].shape)
+        y_out = y_end
+    return out
+
+
+class TilePyramid:
+    def __init__(self, img, tile=TILE_SIZE, max_bytes=256 * 1024 * 1024, shape=None, overview=None, rgb=False):
+        """
+        img: array level 0 (boleh memmap), atau fungsi tanpa argumen yang mengembalikannya;
+        fungsi baru dipanggil saat tile level 0 pertama kali dibutuhkan, dan shape=(h, w)
+        serta overview wajib diisi. overview: versi kecil citra untuk level kasar.
+        rgb=True: channel level 0 berurutan RGB (memmap), ditukar ke BGR per tile.
+        """
+        self._img = None if callable(img) else img
+        self._load = img if callable(img) else None
+        self.tile = tile
+        self.max_bytes = max_bytes
+        self.rgb = rgb
+        self.nbytes = 0
+        self._tiles = OrderedDict()  # (level, ty, tx) -> array
+        self._lock = threading.Lock()  # Tile dibangun dari worker background dan thread Tk
+        self._load_lock = threading.Lock()
+
+        # Ukuran tiap level sampai seluruh citra muat dalam satu tile
+        h, w = img.shape[:2] if shape is None else shape[:2]
+        self.shapes = [(h, w)]
+        while max(h, w) > tile:
+            h, w = (h + 1) // 2, (w + 1) // 2
+            self.shapes.append((h, w))
+
+        # Overview dipasang di level pertama yang muat di dalamnya (diresize ke ukuran level itu)
+        self.overview = None
+        self.overview_level = 0
+        self.finest = 0  # Level paling detail yang boleh dirender (naik bila level 0 gagal dibaca)
+        if overview is not None:
+            side = max(overview.shape[:2])
+            k = next((i for i, s in enumerate(self.shapes) if max(s) <= side), self.n_levels - 1)
+            lh, lw = self.shapes[k]
+            if overview.shape[:2] != (lh, lw):
+                overview = cv2.resize(overview, (lw, lh), interpolation=cv2.INTER_AREA)
+            self.overview, self.overview_level = overview, k
+        sample = self.overview if self.overview is not None else self._img
+        self.dtype, self.channels = sample.dtype, sample.shape[2:]
+
+    @property
+    def img(self):
+        """Citra level 0; dipanggil dari worker karena bisa memicu decode penuh."""
+        with self._load_lock:
+            if self._img is None:
+                self._img = self._load()
+            return self._img
+
+    def limit_to_overview(self):
+        """Level 0 tidak bisa dibaca (mis. terlalu besar untuk cv2): render maksimal sampai overview."""
+        self.finest = self.overview_level
+
+    @property
+    def n_levels(self):
+        return len(self.shapes)
+
+    def level_for_zoom(self, zoom):
+        """Level paling kasar yang resolusinya masih >= zoom (piksel layar per piksel asli)."""
+        if zoom >= 1:
+            return self.finest
+        return max(min(int(math.floor(math.log2(1 / zoom))), self.n_levels - 1), self.finest)
+
+    def needs_detail(self, zoom):
+        """True bila zoom ini butuh level di bawah overview (tile dari level 0, sebaiknya di worker)."""
+        return self.level_for_zoom(zoom) < self.overview_level
+
+    def level_scale(self, level):
+        """Faktor skala level terhadap citra asli (per sumbu y, x)."""
+        h, w = self.shapes[level]
+        return h / self.shapes[0][0], w / self.shapes[0][1]
+
+    def get_tile(self, level, ty, tx):
+        t = self.tile
+        if self.overview is not None and level == self.overview_level:
+            return self.overview[ty * t:(ty + 1) * t, tx * t:(tx + 1) * t]
+        if level == 0:
+            arr = self.img[ty * t:(ty + 1) * t, tx * t:(tx + 1) * t]
+            return np.ascontiguousarray(arr[..., ::-1] if self.rgb and arr.ndim == 3 else arr)
+
+        key = (level, ty, tx)
+        with self._lock:
+            arr = self._tiles.get(key)
+            if arr is not None:
+                self._tiles.move_to_end(key)
+                return arr
+
+        # Gabungkan 2x2 tile anak dari level di bawahnya lalu perkecil setengah
+        ch, cw = self.shapes[level - 1]
+        n_rows = min(2, -(-ch // t) - 2 * ty)
+        n_cols = min(2, -(-cw // t) - 2 * tx)
+        rows = [np.concatenate([self.get_tile(level - 1, 2 * ty + r, 2 * tx + c) for c in range(n_cols)], axis=1)
+                for r in range(n_rows)]
+        block = np.concatenate(rows, axis=0)
+        bh, bw = block.shape[:2]
+        arr = cv2.resize(block, ((bw + 1) // 2, (bh + 1) // 2), interpolation=cv2.INTER_AREA)
+
+        with self._lock:
+            if arr.nbytes <= self.max_bytes and key not in self._tiles:
+                self._tiles[key] = arr
+                self.nbytes += arr.nbytes
+                while self.nbytes > self.max_bytes and self._tiles:
+                    _, old = self._tiles.popitem(last=False)
+                    self.nbytes -= old.nbytes
+        return arr
+
+    def region(self, level, y0, x0, y1, x1):
+        """Potongan [y0:y1, x0:x1] (koordinat level) yang disusun dari tile yang beririsan saja."""
+        t = self.tile
+        rows = []
+        for ty in range(y0 // t, (y1 - 1) // t + 1):
+            row = [self.get_tile(level, ty, tx) for tx in range(x0 // t, (x1 - 1) // t + 1)]
+            rows.append(np.concatenate(row, axis=1))
+        block = np.concatenate(rows, axis=0)
+        oy, ox = (y0 // t) * t, (x0 // t) * t
+        return block[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+
+    def render(self, center, zoom, view_size, bg=0, min_level=0):
+        """
+        Viewport berukuran view_size=(w, h) dengan pusat center=(x, y) dalam koordinat
+        citra asli dan zoom = piksel layar per piksel asli. Return array dengan
+        jumlah channel sama dengan citra sumber; area di luar citra diisi bg
+        (warna BGR untuk citra gray diambil rata-ratanya).
+        min_level: level paling detail yang dipakai (mis. overview_level untuk render
+        cepat di thread UI; detailnya menyusul dari worker).
+        """
+        vw, vh = view_size
+        if not self.channels and np.ndim(bg):
+            bg = int(round(float(np.mean(bg))))
+        out = np.full((vh, vw) + self.channels, bg, dtype=self.dtype)
+
+        level = max(self.level_for_zoom(zoom), min(min_level, self.n_levels - 1))
+        sy, sx = self.level_scale(level)
+        lh, lw = self.shapes[level]
+
+        # Sudut kiri-atas viewport dalam koordinat citra asli
+        left, top = center[0] - vw / (2 * zoom), center[1] - vh / (2 * zoom)
+
+        # Bagian viewport yang beririsan dengan citra (koordinat level)
+        x0, y0 = max(0, int(math.floor(left * sx))), max(0, int(math.floor(top * sy)))
+        x1 = min(lw, int(math.ceil((left + vw / zoom) * sx)))
+        y1 = min(lh, int(math.ceil((top + vh / zoom) * sy)))
+        if x1 <= x0 or y1 <= y0:
+            return out
+
+        # Posisi potongan itu di layar
+        dx0, dy0 = int(round((x0 / sx - left) * zoom)), int(round((y0 / sy - top) * zoom))
+        dx1, dy1 = int(round((x1 / sx - left) * zoom)), int(round((y1 / sy - top) * zoom))
+        cx0, cy0, cx1, cy1 = max(0, dx0), max(0, dy0), min(vw, dx1), min(vh, dy1)
+        if cx1 <= cx0 or cy1 <= cy0:
+            return out
+
+        src = self.region(level, y0, x0, y1, x1)
+        interp = cv2.INTER_AREA if zoom / sx < 1 else cv2.INTER_NEAREST
+        scaled = cv2.resize(src, (dx1 - dx0, dy1 - dy0), interpolation=interp)
+        out[cy0:cy1, cx0:cx1] = scaled[cy0 - dy0:cy1 - dy0, cx0 - dx0:cx1 - dx0]
+        return out
+
+    def clear(self):
+        with self._lock:
+            self._tiles.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._tiles)
@@ -0,0 +1,122 @@
+"""
+Metrik kualitas untuk averaging: PSNR, SSIM (windowed, vectorized), estimasi
+noise tanpa referensi, dan pelacak konvergensi untuk early stopping.
+"""
+import math
+
+import cv2
+import numpy as np
+
+SSIM_WINDOW = 11
+SSIM_SIGMA = 1.5
+
+# Mask Immerkær (1996): selisih dua Laplacian, respons nol untuk permukaan linear
+NOISE_KERNEL = np.array([[1, -2, 1], [-2, 4, -2], [1, -2, 1]], dtype=np.float32)
+
+
+def psnr(ref, img, peak=255.0):
+    """PSNR (dB) img terhadap ref; inf bila identik."""
+    diff = np.asarray(img, dtype=np.float32) - np.asarray(ref, dtype=np.float32)
+    mse = float(np.mean(diff * diff))
+    return math.inf if mse == 0 else 10 * math.log10(peak * peak / mse)
+
+
+class SsimReference:
+    """
+    SSIM (Wang et al. 2004, window Gaussian win x win) terhadap satu citra
+    referensi. Statistik lokal referensi dihitung sekali, jadi tiap evaluasi
+    hanya butuh 3 GaussianBlur untuk seluruh citra.
+    """
+
+    def __init__(self, ref, peak=255.0, win=SSIM_WINDOW, sigma=SSIM_SIGMA):
+        self.win, self.sigma = win, sigma
+        self.c1, self.c2 = (0.01 * peak) ** 2, (0.03 * peak) ** 2
+        self.x = np.asarray(ref, dtype=np.float32)
+        self.mx = self._blur(self.x)
+        self.mxx = self.mx * self.mx
+        self.vx = self._blur(self.x * self.x) - self.mxx
+
+    def _blur(self, a):
+        return cv2.GaussianBlur(a, (self.win, self.win), self.sigma)
+
+    def __call__(self, img):
+        y = np.asarray(img, dtype=np.float32)
+        my = self._blur(y)
+        myy = my * my
+        mxy = self.mx * my
+        vy = self._blur(y * y)
+        vy -= myy
+        cov = self._blur(self.x * y)
+        cov -= mxy
+
+        # ((2 mxy + c1)(2 cov + c2)) / ((mxx + myy + c1)(vx + vy + c2)), in-place
+        mxy *= 2
+        mxy += self.c1
+        cov *= 2
+        cov += self.c2
+        mxy *= cov
+        myy += self.mxx
+        myy += self.c1
+        vy += self.vx
+        vy += self.c2
+        myy *= vy
+        mxy /= myy
+        return float(mxy.mean())
+
+
+def ssim(ref, img, peak=255.0, win=SSIM_WINDOW, sigma=SSIM_SIGMA):
+    """SSIM rata-rata img terhadap ref (lihat SsimReference untuk evaluasi berulang)."""
+    return SsimReference(ref, peak, win, sigma)(img)
+
+
+def noise_sigma(img):
+    """Estimasi simpangan baku noise Gaussian tanpa referensi (metode Immerkær)."""
+    img = np.asarray(img, dtype=np.float32)
+    if img.ndim == 3:
+        return float(np.mean([noise_sigma(img[..., c]) for c in range(img.shape[2])]))
+    h, w = img.shape
+    resp = cv2.filter2D(img, -1, NOISE_KERNEL)[1:-1, 1:-1]
+    return math.sqrt(math.pi / 2) * float(np.abs(resp).sum()) / (6 * (w - 2) * (h - 2))
+
+
+class ConvergenceTracker:
+    """
+    Kurva kualitas vs K selama averaging. Dengan ref: PSNR + SSIM terhadap citra
+    bersih. Tanpa ref: PSNR estimasi 20 log10(peak / noise_sigma). Bila min_gain
+    diisi, update() return False begitu gain (dB per frame tambahan) turun di
+    bawah min_gain.
+    """
+
+    def __init__(self, ref=None, min_gain=None, peak=255.0):
+        self.ref = ref
+        self.peak = peak
+        self._ssim = SsimReference(ref, peak) if ref is not None else None
+        self.min_gain = min_gain
+        self.curve = []  # (K, psnr_db, ssim atau None)
+        self.stopped_at = None
+
+    def update(self, k, img, check=True):
+        """Tambah titik kurva; check=False hanya mencatat tanpa evaluasi early stop."""
+        if self.ref is not None:
+            p, s = psnr(self.ref, img, self.peak), self._ssim(img)
+        else:
+            p, s = 20 * math.log10(self.peak / max(noise_sigma(img), 1e-6)), None
+        self.curve.append((k, p, s))
+
+        if check and self.min_gain is not None and len(self.curve) >= 2:
+            k0, p0, _ = self.curve[-2]
+            if (p - p0) / (k - k0) < self.min_gain:
+                self.stopped_at = k
+                return False
+        return True
+
+
+def checkpoints(ks, every=8):
+    """Titik evaluasi kurva: semua K, 1, 2, 4, ... di bawah `every`, lalu tiap `every` frame."""
+    limit = max(ks)
+    pts = set(ks) | set(range(every, limit, every))
+    k = 1
+    while k < min(every, limit):
+        pts.add(k)
+        k *= 2
+    return sorted(pts)
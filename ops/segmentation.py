@@ -0,0 +1,47 @@
+import cv2
+import numpy as np
+
+from ops.common import normalize_u8, to_gray
+
+POINT_KERNEL = np.array([[-1, -1, -1],
+                         [-1, 8, -1],
+                         [-1, -1, -1]], dtype=np.float32)
+
+# Mask sesuai PDF Halaman 17
+LINE_KERNELS = {
+    "Horizontal": np.array([[-1, -1, -1],
+                            [2, 2, 2],
+                            [-1, -1, -1]], dtype=np.float32),
+    "+45 Degree": np.array([[-1, -1, 2],
+                            [-1, 2, -1],
+                            [2, -1, -1]], dtype=np.float32),
+    "Vertical": np.array([[-1, 2, -1],
+                          [-1, 2, -1],
+                          [-1, 2, -1]], dtype=np.float32),
+    "-45 Degree": np.array([[2, -1, -1],
+                            [-1, 2, -1],
+                            [-1, -1, 2]], dtype=np.float32),
+}
+
+
+def mask_response(img, kernel):
+    """|img * kernel| dinormalisasi ke uint8."""
+    resp = cv2.filter2D(to_gray(img), cv2.CV_64F, kernel)
+    return normalize_u8(np.abs(resp))
+
+
+def threshold_response(resp_vis, T):
+    _, binary = cv2.threshold(resp_vis, T, 255, cv2.THRESH_BINARY)
+    return binary
+
+
+def point_detection(img, T=200):
+    """Return (respon Laplacian, hasil threshold)."""
+    resp = mask_response(img, POINT_KERNEL)
+    return resp, threshold_response(resp, T)
+
+
+def line_detection(img, mask_name="Horizontal", T=100):
+    """Return (respon mask garis, hasil threshold)."""
+    resp = mask_response(img, LINE_KERNELS.get(mask_name, LINE_KERNELS["-45 Degree"]))
+    return resp, threshold_response(resp, T)
@@ -0,0 +1,80 @@
+import random
+
+import cv2
+import numpy as np
+
+from ops.common import normalize_u8, to_gray
+
+SMOOTHING_SIZES = (3, 5, 9, 15, 35)
+SHARPEN_MODES = ("Laplacian (Center -4)", "Laplacian (Center -8)", "Laplacian (Center +8)", "High-Boost (A=1.2)")
+
+
+def box_smoothing(img, sizes=SMOOTHING_SIZES):
+    """Averaging filter untuk tiap ukuran kernel; return {size: hasil}."""
+    return {k: cv2.blur(img, (k, k)) for k in sizes}
+
+
+def hubble_threshold(img, thresh=65, ksize=15):
+    """Pg 10: blur 15x15 lalu threshold. Return (blurred, thresholded)."""
+    blurred = cv2.blur(to_gray(img), (ksize, ksize))
+    _, binary = cv2.threshold(blurred, thresh, 255, cv2.THRESH_BINARY)
+    return blurred, binary
+
+
+def add_salt_pepper(img, n_min=1000, n_max=10000):
+    """Tambah noise salt & pepper di posisi acak."""
+    row, col = img.shape[:2]
+    noisy = img.copy()
+    n_px = random.randint(n_min, n_max)
+    for _ in range(n_px):
+        y, x = random.randint(0, row - 1), random.randint(0, col - 1)
+        noisy[y][x] = 255
+        y, x = random.randint(0, row - 1), random.randint(0, col - 1)
+        noisy[y][x] = 0
+    return noisy
+
+
+def mean_vs_median(img, ksize=3):
+    """Pg 11: return (mean filter, median filter)."""
+    return cv2.blur(img, (ksize, ksize)), cv2.medianBlur(img, ksize)
+
+
+def sharpen(img, mode):
+    """Pg 11: Laplacian sharpening atau high-boost. Return (hasil, teks kernel)."""
+    if "Laplacian" in mode:
+        if "-4" in mode:
+            k = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]])
+            sharpen_k = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
+        elif "-8" in mode:
+            k = np.array([[1, 1, 1], [1, -8, 1], [1, 1, 1]])
+            sharpen_k = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
+        else:
+            k = np.array([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]])
+            sharpen_k = np.array([[1, 1, 1], [1, -7, 1], [1, 1, 1]])
+        kernel_txt = str(k).replace('[', ' ').replace(']', ' ')
+        return cv2.filter2D(img, -1, sharpen_k), kernel_txt
+
+    if "High-Boost" in mode:
+        gray = to_gray(img)
+        blur = cv2.GaussianBlur(gray, (5, 5), 0)
+        mask = cv2.addWeighted(gray.astype(float), 1.0, blur.astype(float), -1.0, 0)
+        res_float = gray.astype(float) + 1.2 * mask
+        return np.clip(res_float, 0, 255).astype(np.uint8), "Formula: Img + A*(Img - Blur)"
+
+    return None, ""
+
+
+def sobel_gradient(img):
+    """Pg 11-12: Sobel Gx, Gy dan magnitude, sudah dalam bentuk visual uint8."""
+    gray = to_gray(img)
+    gx_64 = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
+    gy_64 = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    mag = cv2.magnitude(gx_64, gy_64)
+
+    # Gx background abu terang, Gy background abu gelap (sesuai tampilan PDF)
+    return {
+        "gx": cv2.convertScaleAbs(gx_64, alpha=1.5, beta=160),
+        "gy": cv2.convertScaleAbs(gy_64, alpha=1.5, beta=128),
+        "mag": normalize_u8(mag),
+        "orig": gray,
+    }
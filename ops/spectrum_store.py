@@ -0,0 +1,76 @@
+"""
+Store spektrum tingkat aplikasi, dipakai bersama oleh DftApp dan FrequencyFilterApp.
+
+Key = hash isi citra sumber + langkah preprocessing (rotasi, resize, padding),
+jadi spektrum yang sudah pernah dihitung layar mana pun bisa dipakai ulang
+walau frame-nya sudah di-destroy. Dibatasi ukuran total (LRU) dan thread-safe
+(get() juga dipanggil dari worker background GUI).
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ops.fft import rfft2, pad_to_optimal
+
+
+def content_hash(img):
+    """Hash isi array (shape + dtype + data)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((img.shape, img.dtype.str)).encode())
+    h.update(np.ascontiguousarray(img).data)
+    return h.hexdigest()
+
+
+class SpectrumStore:
+    def __init__(self, max_bytes=512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, img, prep=(), pad=True, prepare=None):
+        """
+        Half-spectrum (read-only) dari citra sumber `img` setelah preprocessing.
+        prep   : tuple hashable yang mendeskripsikan preprocessing, mis. (("rotate", 30.0),)
+        prepare: fungsi img -> img yang menjalankan preprocessing itu (hanya dipanggil saat miss)
+        Return (spec, fft_shape, content_shape).
+        """
+        key = (content_hash(img), tuple(prep), pad)
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item
+            self.misses += 1
+
+        src = prepare(img) if prepare is not None else img
+        padded = pad_to_optimal(src) if pad else src
+        spec = rfft2(padded)
+        spec.setflags(write=False)
+        item = (spec, padded.shape[:2], src.shape[:2])
+
+        with self._lock:
+            if spec.nbytes <= self.max_bytes and key not in self._items:
+                self._items[key] = item
+                self.nbytes += spec.nbytes
+                while self.nbytes > self.max_bytes and self._items:
+                    _, (old, _, _) = self._items.popitem(last=False)
+                    self.nbytes -= old.nbytes
+        return item
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+# Store global untuk seluruh aplikasi
+spectrum_store = SpectrumStore()
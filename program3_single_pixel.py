@@ -1,13 +1,17 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+from tkinter import messagebox, ttk
 from PIL import Image, ImageTk, ImageDraw
 import numpy as np
-import cv2
-from base_frame import BaseFrame
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 from styles import COLORS
 
+PROXY_SIZE = 350  # Sisi terpanjang proxy saat slider digeser (= ukuran tampilan)
+
 
 class SinglePixelApp(BaseFrame):
+    cache_attrs = ("img_bgr", "img_gray", "img_gray_proxy", "current_result_cv")
+
     def __init__(self, parent):
         super().__init__(parent)
         content = self.create_header("Intensity Transformations",
@@ -42,7 +46,7 @@ class SinglePixelApp(BaseFrame):
         self.lbl_out_title.pack(side="left", anchor="w")
 
         save_btn = tk.Button(res_header, text="💾 Save", font=("Segoe UI", 8), bg="#ddd", bd=0,
-                             command=lambda: self.save_image_cv(self.current_result_cv, "intensity_transform"))
+                             command=lambda: self.save_image_cv(self._full_result(), "intensity_transform"))
         save_btn.pack(side="right", padx=5)
 
         self.lbl_out = tk.Label(frame_bot, bg=COLORS["bg_main"])
@@ -95,9 +99,11 @@ class SinglePixelApp(BaseFrame):
 
             def on_change(v):
                 lbl_val.config(text=f"{float(v):.2f}")
-                self._update_preview()
+                self._update_preview(proxy=True)
 
-            ttk.Scale(f, from_=min_val, to=max_val, variable=var, command=on_change).pack(fill="x")
+            scale = ttk.Scale(f, from_=min_val, to=max_val, variable=var, command=on_change)
+            scale.pack(fill="x")
+            scale.bind("<ButtonRelease-1>", lambda e: self._update_preview())
             return lbl_val
 
         self.lbl_gamma_val = create_float_slider(self.tab_power, "Gamma (\u03B3)", self.gamma_var, 0.1, 5.0)
@@ -112,7 +118,9 @@ class SinglePixelApp(BaseFrame):
             f = tk.Frame(parent)
             f.pack(fill="x", pady=5)
             tk.Label(f, text=label, fg="#4B5563").pack(anchor="w")
-            ttk.Scale(f, from_=0, to=255, variable=var, command=lambda _: self._update_preview()).pack(fill="x")
+            scale = ttk.Scale(f, from_=0, to=255, variable=var, command=lambda _: self._update_preview(proxy=True))
+            scale.pack(fill="x")
+            scale.bind("<ButtonRelease-1>", lambda e: self._update_preview())
 
         create_int_slider(self.tab_slice, "Range Min (A)", self.slice_a)
         create_int_slider(self.tab_slice, "Range Max (B)", self.slice_b)
@@ -131,9 +139,9 @@ class SinglePixelApp(BaseFrame):
 
         self.img_bgr = None
         self.img_gray = None
-        self.tk_ori = None
-        self.tk_out = None
+        self.img_gray_proxy = None  # Salinan kecil img_gray untuk preview selama slider digeser
         self.current_result_cv = None  # Simpan hasil untuk Save
+        self.result_is_proxy = False  # current_result_cv masih hasil proxy (belum full-res)
         self._draw_transfer_plot()
 
     def set_gamma(self, val):
@@ -144,54 +152,77 @@ class SinglePixelApp(BaseFrame):
     def _on_tab_change(self, event):
         self._update_preview()
 
-    def _to_tk(self, img):
-        pil = Image.fromarray(img)
-        pil.thumbnail((350, 200), Image.LANCZOS)
-        return ImageTk.PhotoImage(pil)
+    def _show(self, img, label):
+        ImageSurface.of(label).show(img, fit_size(img.shape, 350, 200, enlarge=False))
 
     def _ensure_gray(self):
         return self.img_gray is not None
 
-    def _update_preview(self):
+    def _update_preview(self, proxy=False):
         self._draw_transfer_plot()
         if not self._ensure_gray(): return
+        func, args, title_text = self._current_op(self.img_gray_proxy if proxy else self.img_gray)
+
+        show = lambda res: self._show_result(res, title_text, proxy)
+        if func is None:
+            self.jobs.cancel("preview")
+            self._show_result(self.img_gray, title_text)
+        else:
+            # Gamma/slicing dihitung di background, hanya nilai slider terakhir yang ditampilkan.
+            # proxy=True (slider sedang digeser): cukup salinan seukuran tampilan.
+            self.jobs.submit("preview", func, *args, on_done=show)
+
+    def _current_op(self, src):
+        """(fungsi ops, argumen, judul) sesuai tab & parameter aktif; fungsi None = tanpa transformasi."""
         tab_idx = self.notebook.index(self.notebook.select())
 
         # Default title
         title_text = "Result Image"
+        func, args = None, ()
 
         if tab_idx == 0:
             if self.neg_var.get():
-                self.current_result_cv = 255 - self.img_gray
+                func, args = ops.negative, (src,)
                 title_text = "Result: Negative Image"
             else:
-                self.current_result_cv = self.img_gray
                 title_text = "Original (Grayscale)"
         elif tab_idx == 1:
             gamma = self.gamma_var.get()
             c = self.const_var.get()
-            table = np.array([((i / 255.0) ** gamma) * 255 * c for i in range(256)]).astype("uint8")
-            self.current_result_cv = cv2.LUT(self.img_gray, table)
+            func, args = ops.power_law, (src, gamma, c)
             title_text = f"Result: Power-Law (Gamma={gamma:.2f})"
         elif tab_idx == 2:
             a, b = self.slice_a.get(), self.slice_b.get()
             if b < a: b = a
-            img = self.img_gray.copy()
-            mask = (img >= a) & (img <= b)
-            if self.slice_preserve.get():
-                img[mask] = 255
+            preserve = self.slice_preserve.get()
+            func, args = ops.intensity_slicing, (src, a, b, preserve)
+            if preserve:
                 title_text = f"Result: Slicing Preserve ({a}-{b})"
             else:
-                out = np.zeros_like(img);
-                out[mask] = 255;
-                img = out
                 title_text = f"Result: Slicing Binary ({a}-{b})"
-            self.current_result_cv = img
+        return func, args, title_text
 
-        self.tk_out = self._to_tk(self.current_result_cv)
-        self.lbl_out.config(image=self.tk_out)
+    def _show_result(self, res, title_text, proxy=False):
+        self.current_result_cv = res
+        self.result_is_proxy = proxy
+        self._show(res, self.lbl_out)
         self.lbl_out_title.config(text=title_text)
 
+    def _full_result(self):
+        """Hasil full-res untuk Save; dihitung sinkron bila yang tampil masih proxy (atau sudah dilepas)."""
+        if not self._ensure_gray(): return None
+        if self.result_is_proxy or self.current_result_cv is None:
+            self.jobs.cancel("preview")
+            func, args, title_text = self._current_op(self.img_gray)
+            self._show_result(self.img_gray if func is None else func(*args), title_text)
+        return self.current_result_cv
+
+    def on_release(self):
+        self.jobs.cancel("preview")
+        self.result_is_proxy = False
+        ImageSurface.of(self.lbl_ori).clear(text=self.RELEASED_TEXT)
+        ImageSurface.of(self.lbl_out).clear()
+
     def _draw_transfer_plot(self):
         W, H = 250, 140
         img = Image.new("RGB", (W, H), "white")
@@ -233,14 +264,17 @@ class SinglePixelApp(BaseFrame):
         self.plot_label.config(image=self.tk_plot, height=H)
 
     def open_image(self):
-        path = filedialog.askopenfilename()
-        if not path: return
-        raw = cv2.imread(path)
-        if raw is None: return
-        self.img_bgr = raw
-        self.img_gray = cv2.cvtColor(raw, cv2.COLOR_BGR2GRAY)
-        self.tk_ori = self._to_tk(cv2.cvtColor(raw, cv2.COLOR_BGR2RGB))
-        self.lbl_ori.config(image=self.tk_ori)
+        entry = self.ask_image_entry()
+        if entry is None: return
+        # Gray & proxy diambil dari image_store (dihitung sekali per file, dibagi antar layar)
+        try:
+            img_bgr, img_gray = entry.original, entry.gray()
+            img_gray_proxy = entry.resized(PROXY_SIZE, gray=True)
+        except IOError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.img_bgr, self.img_gray, self.img_gray_proxy = img_bgr, img_gray, img_gray_proxy
+        self._show(self.img_bgr, self.lbl_ori)
         self._update_preview()
 
     def reset_view(self):
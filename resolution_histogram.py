@@ -1,9 +1,8 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+from tkinter import ttk, messagebox
 import cv2
-import numpy as np
-from PIL import Image, ImageTk
-from base_frame import BaseFrame
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 from styles import COLORS
 
 
@@ -11,6 +10,8 @@ from styles import COLORS
 # KELAS 1: RESOLUSI & KUANTISASI (Sesuai PDF Halaman 1-2)
 # ==============================================================================
 class ResolutionApp(BaseFrame):
+    cache_attrs = ("original_img", "processed_img")
+
     def __init__(self, parent):
         super().__init__(parent)
         content = self.create_header("Spatial Resolution & Quantization (Pg 1-2)",
@@ -64,6 +65,11 @@ class ResolutionApp(BaseFrame):
         self.lbl_res = self._create_card(self.split_view, 1, "Result", save=True)
 
         self.original_img = None
+        self.processed_img = None
+
+    def on_release(self):
+        ImageSurface.of(self.lbl_src).clear(text=self.RELEASED_TEXT)
+        ImageSurface.of(self.lbl_res).clear()
 
     def _create_card(self, parent, col, title, save=False):
         f = ttk.Frame(parent, style="Card.TFrame")
@@ -78,9 +84,9 @@ class ResolutionApp(BaseFrame):
         return l
 
     def open_image(self):
-        path = filedialog.askopenfilename()
-        if path:
-            self.original_img = cv2.imread(path)
+        img = self.ask_image()
+        if img is not None:
+            self.original_img = img
             self.reset_image()
 
     def reset_image(self):
@@ -96,56 +102,30 @@ class ResolutionApp(BaseFrame):
             return
 
         # Resolusi tetap sesuai PDF untuk Comparison
-        resolutions = [256, 128, 64, 32]
-        processed = []
-        h, w = self.original_img.shape[:2]
-        for r in resolutions:
-            tmp = cv2.resize(self.original_img, (r, r))
-            res = cv2.resize(tmp, (w, h), interpolation=cv2.INTER_NEAREST)
-            # Tambah text label
-            cv2.putText(res, f"{r}x{r}", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 0, 255), 2)
-            processed.append(res)
-
-        top = np.hstack((processed[0], processed[1]))
-        bot = np.hstack((processed[2], processed[3]))
-        grid = np.vstack((top, bot))
+        grid = ops.resolution_comparison(self.original_img, (256, 128, 64, 32))
         self.processed_img = grid
         self.display_image(grid, self.lbl_res)
 
     def on_param_change(self, e=None):
         if self.original_img is None: return
-        img = self.original_img.copy()
-        h, w = img.shape[:2]
-
-        # 1. Res
-        res = int(self.res_var.get())
-        tmp = cv2.resize(img, (res, res))
-        img = cv2.resize(tmp, (w, h), interpolation=cv2.INTER_NEAREST)
-
-        # 2. Quant
-        levels = int(self.quant_var.get())
-        if levels < 256:
-            div = 256 // levels
-            img = (img // div) * div
-            img = img.astype(np.uint8)
+        # 1. Res, 2. Quant
+        img = ops.degrade_resolution(self.original_img, int(self.res_var.get()))
+        img = ops.quantize(img, int(self.quant_var.get()))
 
         self.processed_img = img
         self.display_image(img, self.lbl_res)
 
     def display_image(self, img, lbl):
         if img is None: return
-        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        pil = Image.fromarray(img_rgb)
-        pil.thumbnail((400, 400), Image.LANCZOS)
-        tk_img = ImageTk.PhotoImage(pil)
-        lbl.config(image=tk_img);
-        lbl.image = tk_img
+        ImageSurface.of(lbl).show(img, fit_size(img.shape, 400, 400, enlarge=False))
 
 
 # ==============================================================================
 # KELAS 2: HISTOGRAM PROCESSING (Sesuai PDF Halaman 5-7)
 # ==============================================================================
 class HistogramApp(BaseFrame):
+    cache_attrs = ("src_img", "ref_img", "res_img")
+
     def __init__(self, parent):
         super().__init__(parent)
         content = self.create_header("Histogram Processing (Pg 5-7)",
@@ -189,60 +169,46 @@ class HistogramApp(BaseFrame):
         self.ref_img = None
         self.res_img = None
 
+    def on_release(self):
+        ImageSurface.of(self.lbl_src).clear(text=self.RELEASED_TEXT)
+        ImageSurface.of(self.lbl_res).clear(text="Result")
+        self.cv_hist.delete("all")
+
     def load_src(self):
-        p = filedialog.askopenfilename()
-        if p:
-            self.src_img = cv2.cvtColor(cv2.imread(p), cv2.COLOR_BGR2GRAY)
+        img = self.ask_image(gray=True)
+        if img is not None:
+            self.src_img = img
             self.res_img = self.src_img.copy()
             self.show(self.src_img, self.lbl_src)
             self.show(self.res_img, self.lbl_res)
             self.plot_hist()
 
     def load_ref(self):
-        p = filedialog.askopenfilename()
-        if p:
-            self.ref_img = cv2.cvtColor(cv2.imread(p), cv2.COLOR_BGR2GRAY)
+        img = self.ask_image(gray=True)
+        if img is not None:
+            self.ref_img = img
             messagebox.showinfo("Info", "Reference loaded.")
 
     def do_global_he(self):
         if self.src_img is None: return
-        self.res_img = cv2.equalizeHist(self.src_img)
+        self.res_img = ops.equalize(self.src_img)
         self.show(self.res_img, self.lbl_res)
         self.plot_hist()
 
     def do_local_he(self):
         if self.src_img is None: return
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        self.res_img = clahe.apply(self.src_img)
+        self.res_img = ops.clahe(self.src_img, 2.0, (8, 8))
         self.show(self.res_img, self.lbl_res)
         self.plot_hist()
 
     def do_match(self):
         if self.src_img is None or self.ref_img is None: return
-        # Simple Matching Logic
-        src_hist, _ = np.histogram(self.src_img.flatten(), 256, [0, 256])
-        ref_hist, _ = np.histogram(self.ref_img.flatten(), 256, [0, 256])
-
-        src_cdf = src_hist.cumsum()
-        src_cdf = src_cdf / src_cdf.max()
-        ref_cdf = ref_hist.cumsum()
-        ref_cdf = ref_cdf / ref_cdf.max()
-
-        lut = np.zeros(256, dtype=np.uint8)
-        for g in range(256):
-            idx = np.abs(ref_cdf - src_cdf[g]).argmin()
-            lut[g] = idx
-
-        self.res_img = cv2.LUT(self.src_img, lut)
+        self.res_img = ops.match_histogram(self.src_img, self.ref_img)
         self.show(self.res_img, self.lbl_res)
         self.plot_hist()
 
     def show(self, img, lbl):
-        pil = Image.fromarray(img)
-        pil.thumbnail((300, 300))
-        tk_img = ImageTk.PhotoImage(pil)
-        lbl.config(image=tk_img, text="");
-        lbl.image = tk_img
+        ImageSurface.of(lbl).show(img, fit_size(img.shape, 300, 300, enlarge=False))
 
     def plot_hist(self):
         self.cv_hist.delete("all")
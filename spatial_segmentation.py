@@ -1,13 +1,13 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
-import cv2
-import numpy as np
-from PIL import Image, ImageTk
-import random
-from base_frame import BaseFrame
+from tkinter import ttk, messagebox
+from base_frame import BaseFrame, ImageSurface, fit_size
+import ops
 
 
 class SpatialSegmentationApp(BaseFrame):
+    cache_attrs = ("smooth_res", "hubble_res", "grad_res_cache", "current_smooth_view", "current_hubble_res",
+                   "current_med_res", "current_sharp_res", "current_grad_res")
+
     def __init__(self, parent):
         super().__init__(parent)
         content = self.create_header("Spatial Filters (Pg 10-12)",
@@ -19,10 +19,16 @@ class SpatialSegmentationApp(BaseFrame):
         # --- Variables ---
         self.smooth_src = None
         self.smooth_res = {}
+        self.smooth_key = 'f'
+        self.current_smooth_view = None
         self.hubble_src = None
         self.hubble_res = {}
+        self.current_hubble_res = None
         self.median_src = None
+        self.current_med_res = None
         self.sharp_src = None
+        self.current_sharp_res = None
+        self.current_grad_res = None
 
         # Gradient Variables
         self.grad_src = None
@@ -30,25 +36,13 @@ class SpatialSegmentationApp(BaseFrame):
         self.grad_view_mode = tk.StringVar(value="Pg11")
 
         # --- TABS ---
-        self.tab_smooth = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_smooth, text="Pg 10: Smoothing")
-        self.setup_smoothing_tab()
-
-        self.tab_hubble = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_hubble, text="Pg 10: Hubble")
-        self.setup_hubble_tab()
-
-        self.tab_median = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_median, text="Pg 11: Median")
-        self.setup_median_tab()
+        self.tab_smooth = self.add_lazy_tab(self.notebook, "Pg 10: Smoothing", self.setup_smoothing_tab, padding=10)
+        self.tab_hubble = self.add_lazy_tab(self.notebook, "Pg 10: Hubble", self.setup_hubble_tab, padding=10)
+        self.tab_median = self.add_lazy_tab(self.notebook, "Pg 11: Median", self.setup_median_tab, padding=10)
+        self.tab_sharp = self.add_lazy_tab(self.notebook, "Pg 11: Sharpening", self.setup_sharpening_tab, padding=10)
+        self.tab_grad = self.add_lazy_tab(self.notebook, "Pg 11-12: Gradient", self.setup_gradient_tab, padding=10)
 
-        self.tab_sharp = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_sharp, text="Pg 11: Sharpening")
-        self.setup_sharpening_tab()
-
-        self.tab_grad = ttk.Frame(self.notebook, padding=10)
-        self.notebook.add(self.tab_grad, text="Pg 11-12: Gradient")
-        self.setup_gradient_tab()
+        self.build_selected_tab(self.notebook)
 
     # =========================================================================
     # TAB 1: SMOOTHING
@@ -80,11 +74,11 @@ class SpatialSegmentationApp(BaseFrame):
             btn.pack(side="left", expand=True, fill="x", padx=2)
             self.smooth_btns[key] = btn
 
-        ttk.Button(btn_bar, text="💾 Save View", command=lambda: self.save_view(self.current_smooth_view, "smoothing"),
+        ttk.Button(btn_bar, text="💾 Save View", command=self.save_smooth_view,
                    style="Soft.TButton").pack(side="right", padx=10)
 
     def load_smooth_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.smooth_src = img
             self.display_image_large(img, self.lbl_smooth_main)
@@ -98,15 +92,18 @@ class SpatialSegmentationApp(BaseFrame):
         self.smooth_res['a'] = src
         sizes = [3, 5, 9, 15, 35]
         keys = ['b', 'c', 'd', 'e', 'f']
+        blurred = ops.box_smoothing(src, sizes)
         for k_size, key in zip(sizes, keys):
-            res = cv2.blur(src, (k_size, k_size))
-            self.smooth_res[key] = res
+            self.smooth_res[key] = blurred[k_size]
         for k in self.smooth_btns: self.smooth_btns[k].config(state="normal")
         self.show_smooth('f')
         self.lbl_smooth_status.config(text="Selesai.")
 
     def show_smooth(self, key):
+        if key not in self.smooth_res and self.smooth_src is not None:
+            self.run_smoothing_all()  # Hasil sudah dilepas (release_memory): hitung ulang
         if key in self.smooth_res:
+            self.smooth_key = key
             self.display_image_large(self.smooth_res[key], self.lbl_smooth_main)
             self.current_smooth_view = self.smooth_res[key]
 
@@ -136,26 +133,17 @@ class SpatialSegmentationApp(BaseFrame):
         self.lbl_hubble_c = self.create_img_frame(grid, 2, "Thresholded (c)", save_btn=True)
 
     def load_hubble(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.hubble_src = img
             self.display_image_fit(img, self.lbl_hubble_a)
-            self.lbl_hubble_b.config(image="")
-            self.lbl_hubble_c.config(image="")
+            ImageSurface.of(self.lbl_hubble_b).clear()
+            ImageSurface.of(self.lbl_hubble_c).clear()
 
     def run_hubble(self):
         if self.hubble_src is None: return
-        img_a = self.hubble_src
-        if len(img_a.shape) == 3:
-            img_gray = cv2.cvtColor(img_a, cv2.COLOR_BGR2GRAY)
-        else:
-            img_gray = img_a.copy()
-
-        img_b = cv2.blur(img_gray, (15, 15))
+        img_b, img_c = ops.hubble_threshold(self.hubble_src, self.hubble_thresh.get())
         self.display_image_fit(img_b, self.lbl_hubble_b)
-
-        thresh_val = self.hubble_thresh.get()
-        _, img_c = cv2.threshold(img_b, thresh_val, 255, cv2.THRESH_BINARY)
         self.display_image_fit(img_c, self.lbl_hubble_c)
         self.current_hubble_res = img_c
 
@@ -179,30 +167,21 @@ class SpatialSegmentationApp(BaseFrame):
         self.lbl_med_c = self.create_img_frame(grid, 2, "(c) Median Filter 3x3", save_btn=True)
 
     def load_median_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.median_src = img
             self.display_image_fit(img, self.lbl_med_a)
 
     def add_noise_median(self):
         if self.median_src is None: return
-        row, col = self.median_src.shape[:2]
-        noisy = self.median_src.copy()
-        n_px = random.randint(1000, 10000)
-        for i in range(n_px):
-            y, x = random.randint(0, row - 1), random.randint(0, col - 1)
-            noisy[y][x] = 255
-            y, x = random.randint(0, row - 1), random.randint(0, col - 1)
-            noisy[y][x] = 0
+        noisy = ops.add_salt_pepper(self.median_src)
         self.median_src = noisy
         self.display_image_fit(noisy, self.lbl_med_a)
 
     def run_median_compare(self):
         if self.median_src is None: return
-        img = self.median_src
-        res_mean = cv2.blur(img, (3, 3))
+        res_mean, res_median = ops.mean_vs_median(self.median_src, 3)
         self.display_image_fit(res_mean, self.lbl_med_b)
-        res_median = cv2.medianBlur(img, 3)
         self.display_image_fit(res_median, self.lbl_med_c)
         self.current_med_res = res_median
 
@@ -231,7 +210,7 @@ class SpatialSegmentationApp(BaseFrame):
         self.lbl_kernel_vis.pack(fill="x", pady=10)
 
     def load_sharp_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.sharp_src = img
             self.display_image_fit(img, self.lbl_sharp_src)
@@ -239,32 +218,7 @@ class SpatialSegmentationApp(BaseFrame):
     def run_sharpening(self):
         if self.sharp_src is None: return
         mode = self.sharp_var.get()
-        img = self.sharp_src
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img.copy()
-
-        res = None;
-        kernel_txt = ""
-        if "Laplacian" in mode:
-            if "-4" in mode:
-                k = np.array([[0, 1, 0], [1, -4, 1], [0, 1, 0]])
-                sharpen_k = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]])
-            elif "-8" in mode:
-                k = np.array([[1, 1, 1], [1, -8, 1], [1, 1, 1]])
-                sharpen_k = np.array([[-1, -1, -1], [-1, 9, -1], [-1, -1, -1]])
-            else:
-                k = np.array([[-1, -1, -1], [-1, 8, -1], [-1, -1, -1]])
-                sharpen_k = np.array([[1, 1, 1], [1, -7, 1], [1, 1, 1]])
-            kernel_txt = str(k).replace('[', ' ').replace(']', ' ')
-            res = cv2.filter2D(img, -1, sharpen_k)
-        elif "High-Boost" in mode:
-            kernel_txt = "Formula: Img + A*(Img - Blur)"
-            blur = cv2.GaussianBlur(gray, (5, 5), 0)
-            mask = cv2.addWeighted(gray.astype(float), 1.0, blur.astype(float), -1.0, 0)
-            res_float = gray.astype(float) + 1.2 * mask
-            res = np.clip(res_float, 0, 255).astype(np.uint8)
+        res, kernel_txt = ops.sharpen(self.sharp_src, mode)
 
         self.lbl_kernel_vis.config(text=f"Active Kernel ({mode}):\n{kernel_txt}")
         self.display_image_fit(res, self.lbl_sharp_res)
@@ -350,7 +304,7 @@ class SpatialSegmentationApp(BaseFrame):
             self.display_image_grid(self.grad_src, self.lbl_grad_src)
 
     def load_grad_src(self):
-        img = self._load_img()
+        img = self.ask_image()
         if img is not None:
             self.grad_src = img
             self.grad_res_cache = {}
@@ -359,38 +313,9 @@ class SpatialSegmentationApp(BaseFrame):
 
     def run_gradient(self):
         if self.grad_src is None: return
-        img = self.grad_src
-        if len(img.shape) == 3:
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = img.copy()
-
-        # Hitung Gradient Sobel (CV_64F)
-        gx_64 = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-        gy_64 = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
-
-        # Hitung Magnitude
-        mag = cv2.magnitude(gx_64, gy_64)
-
-        # --- PERBAIKAN VISUALISASI (REQUEST USER) ---
-        # User request: "Yang kiri (Gx) di cerahin gray nya"
-        # Gx (Kiri): Beta = 200 (Background Abu-abu Terang)
-        # Gy (Kanan): Beta = 55 (Background Abu-abu Gelap)
-        # Alpha=1.5 agar kontras garis tepi tetap kuat
-
-        vis_gx = cv2.convertScaleAbs(gx_64, alpha=1.5, beta=160)
-        vis_gy = cv2.convertScaleAbs(gy_64, alpha=1.5, beta=128)
-
-        # Magnitude tetap normalisasi 0-255 (hitam ke putih)
-        vis_mag = cv2.normalize(mag, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
-
-        # Simpan
-        self.grad_res_cache = {
-            "gx": vis_gx,
-            "gy": vis_gy,
-            "mag": vis_mag,
-            "orig": gray
-        }
+        # Sobel CV_64F -> Gx (bg terang), Gy (bg gelap), Magnitude (0-255)
+        self.grad_res_cache = ops.sobel_gradient(self.grad_src)
+        vis_mag = self.grad_res_cache["mag"]
         self.current_grad_res = vis_mag
         self.refresh_grad_display()
 
@@ -432,29 +357,22 @@ class SpatialSegmentationApp(BaseFrame):
         return lbl
 
     def save_smart(self, title):
-        target = None;
-        name = "result"
-        if "Sharpened" in title and hasattr(self, 'current_sharp_res'):
-            target = self.current_sharp_res;
-            name = "sharpening"
-        elif "Thresholded" in title and hasattr(self, 'current_hubble_res'):
-            target = self.current_hubble_res;
-            name = "hubble_threshold"
-        elif "Median" in title and hasattr(self, 'current_med_res'):
-            target = self.current_med_res;
-            name = "median_filter"
-        elif "Magnitude" in title and hasattr(self, 'current_grad_res'):
-            target = self.current_grad_res;
-            name = "gradient_magnitude"
-        if target is not None: self.save_image_cv(target, name)
-
-    def save_view(self, img, prefix):
-        if img is not None: self.save_image_cv(img, prefix)
-
-    def _load_img(self):
-        path = filedialog.askopenfilename(filetypes=[("Image Files", "*.png;*.jpg;*.jpeg;*.bmp;*.tif;*.tiff")])
-        if not path: return None
-        return cv2.imread(path)
+        # (kata di judul, atribut hasil, nama file, fungsi run bila hasil sudah dilepas)
+        targets = [("Result", "current_sharp_res", "sharpening", self.run_sharpening),
+                   ("Thresholded", "current_hubble_res", "hubble_threshold", self.run_hubble),
+                   ("Median", "current_med_res", "median_filter", self.run_median_compare),
+                   ("Magnitude", "current_grad_res", "gradient_magnitude", self.run_gradient)]
+        for word, attr, name, run in targets:
+            if word in title:
+                if getattr(self, attr) is None:
+                    run()
+                self.save_image_cv(getattr(self, attr), name)
+                return
+
+    def save_smooth_view(self):
+        if self.current_smooth_view is None and self.smooth_src is not None:
+            self.show_smooth(self.smooth_key)
+        self.save_image_cv(self.current_smooth_view, "smoothing")
 
     def display_image_large(self, cv_img, label_widget):
         self._display(cv_img, label_widget, 500)
@@ -468,16 +386,6 @@ class SpatialSegmentationApp(BaseFrame):
     def _display(self, cv_img, label, max_h):
         if cv_img is None: return
         try:
-            h, w = cv_img.shape[:2];
-            scale = max_h / h;
-            nw, nh = int(w * scale), int(h * scale)
-            if len(cv_img.shape) == 2:
-                img = cv2.cvtColor(cv_img, cv2.COLOR_GRAY2RGB)
-            else:
-                img = cv2.cvtColor(cv_img, cv2.COLOR_BGR2RGB)
-            pil = Image.fromarray(img).resize((nw, nh), Image.LANCZOS)
-            tk_img = ImageTk.PhotoImage(pil)
-            label.config(image=tk_img);
-            label.image = tk_img
+            ImageSurface.of(label).show(cv_img, fit_size(cv_img.shape, max_h=max_h))
         except Exception as e:
             print(e)
\ No newline at end of file